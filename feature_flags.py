@@ -1,2 +1,8 @@
 SHOW_CURL_PAGE = False
-SHOW_AUTOMATIONS_PAGE = False
\ No newline at end of file
+SHOW_AUTOMATIONS_PAGE = False
+# Save call edits to an append-only journal instead of rewriting grpc_calls.json each time
+USE_SAVED_CALLS_JOURNAL = False
+# Seconds to keep responses for when response caching is ticked, by method name pattern (e.g. "Get*" or "pkg.Service.*")
+RESPONSE_CACHE_TTLS = {"Get*": 30, "List*": 30}
+# Seconds before descriptors fetched with server reflection are fetched again
+REFLECTION_CACHE_TTL = 3600
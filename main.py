@@ -1,7 +1,13 @@
+import argparse
+import time
+_startup_began = time.perf_counter()
+
 from ui.grpcurl_page import GrpcUrlView, ProtosetParser, GrpcCallPresenter
-from ui.curl_page import CurlView
 from ui.environments_page import EnvironVarView, EnvironmentRepo, EnvironmentPresenter
-from ui.automations_page import AutomationsView
+from ui.history_store import CallHistoryStore
+from ui.response_cache import ResponseCache
+from ui.reflection_cache import ReflectionCache
+from ui.phase_timer import PhaseTimer
 from tkinter import ttk
 import tkinter as tk
 import feature_flags as flag
@@ -9,6 +15,10 @@ import feature_flags as flag
 class MainView(tk.Tk):
     """
     Main application window that holds a Notebook with separate pages.
+
+    Only the grpcurl and environment pages are built up front. Other pages are added as
+    empty tabs and built the first time they are selected, and pages whose feature flag
+    is off are never built at all.
     """
     def __init__(self):
         super().__init__()
@@ -17,38 +27,121 @@ class MainView(tk.Tk):
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True)
         self.notebook_padding = 8
+        self._lazy_tabs = {}  # tab widget name -> build(parent)
 
         self.grpcurl_page = GrpcUrlView(self.notebook)
-        self.curl_page = CurlView(self.notebook)
-        self.automations_page = AutomationsView(self.notebook)
         self.environment_page = EnvironVarView(self.notebook)
 
         self.notebook.add(self.grpcurl_page, text="grpcurl", padding=self.notebook_padding)
-        if flag.SHOW_CURL_PAGE:
-            self.notebook.add(self.curl_page, text="curl", padding=self.notebook_padding)
-        if flag.SHOW_AUTOMATIONS_PAGE:
-            self.notebook.add(self.automations_page, text="Automations", padding=self.notebook_padding)
+        self.curl_tab = self._add_lazy_tab("curl") if flag.SHOW_CURL_PAGE else None
+        self.automations_tab = self._add_lazy_tab("Automations") if flag.SHOW_AUTOMATIONS_PAGE else None
         self.notebook.add(self.environment_page, text="Environment variables", padding=self.notebook_padding)
+        self.history_tab = self._add_lazy_tab("History")
+
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self._on_tab_changed())
+
+    def _add_lazy_tab(self, text):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text=text, padding=self.notebook_padding)
+        return tab
+
+    def set_tab_builder(self, tab, build):
+        """Call build(tab) the first time tab is selected. build should pack its page into tab."""
+        if tab is not None:
+            self._lazy_tabs[str(tab)] = build
 
-        self.model = EnvironmentRepo("data/environments.json")
-        self.grpcurl_page.set_environment_options(self.model.get_all_environment_names())
+    def _on_tab_changed(self):
+        build = self._lazy_tabs.pop(self.notebook.select(), None)
+        if build:
+            build(self.nametowidget(self.notebook.select()))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="API Caller with gRPCurl and curl")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each phase of startup took")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    protoset_parser = ProtosetParser()
-    main_view = MainView()
-    
-    # First, create the gRPC presenter.
-    grpc_presenter = GrpcCallPresenter(
-        main_view.grpcurl_page,
-        protoset_parser,
-        main_view.model
-    )
-    
-    # Then, create the Environment presenter and pass the gRPC presenter's refresh method as callback.
-    env_presenter = EnvironmentPresenter(
-        main_view.environment_page,
-        main_view.model,
-        on_change_callback=grpc_presenter.refresh_environment_options
-    )
-    
+    args = parse_args()
+    timer = PhaseTimer()
+    timer.add("imports", time.perf_counter() - _startup_began)
+
+    with timer.phase("main window"):
+        main_view = MainView()
+    # Paint the window before reading any data files.
+    with timer.phase("first paint"):
+        main_view.update()
+
+    with timer.phase("environments"):
+        env_model = EnvironmentRepo("data/environments.json")
+    with timer.phase("history store"):
+        history_store = CallHistoryStore("call_history.db")
+
+    # First, create the gRPC presenter. It loads the saved calls in the background.
+    with timer.phase("grpcurl presenter"):
+        grpc_presenter = GrpcCallPresenter(
+            main_view.grpcurl_page,
+            ProtosetParser(),
+            env_model,
+            saved_calls_journal=flag.USE_SAVED_CALLS_JOURNAL,
+            history_store=history_store,
+            response_cache=ResponseCache(flag.RESPONSE_CACHE_TTLS),
+            reflection_cache=ReflectionCache("reflection_cache", flag.REFLECTION_CACHE_TTL)
+        )
+
+    # Pages built on first selection register their presenters here.
+    presenters = {}
+
+    def build_curl_page(tab):
+        from ui.curl_page import CurlView
+        CurlView(tab).pack(fill=tk.BOTH, expand=True)
+
+    def build_automations_page(tab):
+        # The Automations page runs pipelines of the same saved calls.
+        from ui.automations_page import AutomationsView, AutomationsPresenter
+        view = AutomationsView(tab)
+        view.pack(fill=tk.BOTH, expand=True)
+        presenters["automations"] = AutomationsPresenter(view, grpc_presenter.saved_calls_manager, env_model)
+
+    def build_history_page(tab):
+        from ui.history_page import HistoryView, HistoryPresenter
+        view = HistoryView(tab)
+        view.pack(fill=tk.BOTH, expand=True)
+        presenters["history"] = HistoryPresenter(view, history_store)
+
+    main_view.set_tab_builder(main_view.curl_tab, build_curl_page)
+    main_view.set_tab_builder(main_view.automations_tab, build_automations_page)
+    main_view.set_tab_builder(main_view.history_tab, build_history_page)
+
+    def refresh_environment_options(env_names):
+        grpc_presenter.refresh_environment_options(env_names)
+        if "automations" in presenters:
+            presenters["automations"].refresh_environment_options(env_names)
+
+    # Then, create the Environment presenter and pass the refresh callback.
+    with timer.phase("environment presenter"):
+        env_presenter = EnvironmentPresenter(
+            main_view.environment_page,
+            env_model,
+            on_change_callback=refresh_environment_options
+        )
+
+    if args.profile_startup:
+        def report_startup():
+            if grpc_presenter.saved_calls_load_time is None:
+                main_view.after(20, report_startup)
+                return
+            print(timer.format("Startup phases"), end="")
+            print(f"  saved calls loaded in the background in {grpc_presenter.saved_calls_load_time * 1000:.1f} ms", flush=True)
+        main_view.after_idle(report_startup)
+
+    # Kill any grpcurl processes still running when the window is closed.
+    def on_close():
+        grpc_presenter.shutdown()
+        if "automations" in presenters:
+            presenters["automations"].shutdown()
+        main_view.destroy()
+        history_store.close()
+    main_view.protocol("WM_DELETE_WINDOW", on_close)
+
     main_view.mainloop()
@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+from automations_page import PipelineRunner, PipelineStep, StepResult, order_steps  # noqa: E402
+
+
+def step(name, *depends_on, body=""):
+    return PipelineStep(name, {"method": f"a.Svc.{name}", "server": "localhost:50051", "body": body}, depends_on)
+
+
+class FakeCaller:
+    """Answers with responses[method], failing methods that have no response."""
+    def __init__(self, responses):
+        self.responses = responses
+        self.bodies = {}
+        self._lock = threading.Lock()
+
+    def execute_call(self, plaintext, cookie, bearer_token, protoset, server, method, body, handle=None):
+        with self._lock:
+            self.bodies[method] = body
+        if method not in self.responses:
+            return 1, "", "ERROR:\n  Code: Internal\n", []
+        return 0, json.dumps(self.responses[method]), "", []
+
+
+class OrderStepsTest(unittest.TestCase):
+    def test_dependencies_come_first(self):
+        steps = [step("d", "b", "c"), step("c", "a"), step("b", "a"), step("a")]
+        names = [s.name for s in order_steps(steps)]
+        self.assertEqual(names[0], "a")
+        self.assertEqual(names[-1], "d")
+        self.assertEqual(sorted(names), ["a", "b", "c", "d"])
+
+    def test_cycles_and_unknown_steps_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            order_steps([step("a"), step("b", "a", "c"), step("c", "b")])
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            order_steps([step("a", "a")])
+        with self.assertRaisesRegex(ValueError, "unknown step 'z'"):
+            order_steps([step("a", "z")])
+
+
+class PipelineRunnerTest(unittest.TestCase):
+    def test_critical_path_is_the_longest_chain(self):
+        steps = [step("a"), step("b", "a"), step("c", "a"), step("d", "b", "c")]
+        runner = PipelineRunner(FakeCaller({}), steps, {}, True)
+        durations = {"a": 1.0, "b": 3.0, "c": 1.0, "d": 0.5}
+        results = {name: StepResult(name, "ok", duration=duration) for name, duration in durations.items()}
+        path, path_time = runner._critical_path({s.name: s for s in steps}, results)
+        self.assertEqual(path, ["a", "b", "d"])
+        self.assertEqual(path_time, 4.5)
+        self.assertEqual(PipelineRunner(FakeCaller({}), [], {}, True)._critical_path({}, {}), ([], 0.0))
+
+    def test_outputs_flow_to_dependents_and_failures_skip_them(self):
+        caller = FakeCaller({"a.Svc.login": {"token": "t1", "user": {"id": 1}}, "a.Svc.use": {}})
+        steps = [
+            step("login"),
+            step("use", "login", body='{"token": "{{login_token}}"}'),
+            step("broken"),
+            step("after_broken", "broken"),
+        ]
+        result = PipelineRunner(caller, steps, {}, True).run()
+        self.assertEqual(caller.bodies["a.Svc.use"], '{"token": "t1"}')
+        self.assertEqual({name: r.status for name, r in result.results.items()},
+                         {"login": "ok", "use": "ok", "broken": "failed", "after_broken": "skipped"})
+        self.assertNotIn("a.Svc.after_broken", caller.bodies)
+        self.assertFalse(result.succeeded)
+
+    def test_killed_pipeline_runs_nothing_more(self):
+        runner = PipelineRunner(FakeCaller({"a.Svc.a": {}}), [step("a"), step("b", "a")], {}, True)
+        runner.kill()
+        result = runner.run()
+        self.assertEqual({name: r.status for name, r in result.results.items()}, {"a": "cancelled", "b": "cancelled"})
+        self.assertEqual(runner.poll(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
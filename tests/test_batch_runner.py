@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import unittest
+
+UI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui")
+sys.path.insert(0, UI_DIR)
+
+from batch_runner import run_call, select_calls  # noqa: E402
+
+
+class FakeCaller:
+    def __init__(self):
+        self.calls = []
+
+    def execute_call(self, plaintext, cookie, bearer_token, protoset, server, method, body):
+        self.calls.append((plaintext, cookie, bearer_token, protoset, server, method, body))
+        return 0, "{}\n", "", ["grpcurl", server, method]
+
+
+class BatchRunnerTest(unittest.TestCase):
+    def test_imports_without_tkinter(self):
+        # CI images often have no Tk at all; a None entry makes any tkinter import fail.
+        script = "import sys; sys.modules['tkinter'] = None; import batch_runner"
+        result = subprocess.run([sys.executable, "-c", script], cwd=UI_DIR, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_select_calls_by_method_glob_or_index(self):
+        saved_calls = [{"method": "a.Svc.GetThing"}, {"method": "a.Svc.ListThings"}, {"method": "b.Other.GetThing"}]
+        self.assertEqual([index for index, _ in select_calls(saved_calls)], [0, 1, 2])
+        self.assertEqual([index for index, _ in select_calls(saved_calls, methods=["*.GetThing"])], [0, 2])
+        self.assertEqual([index for index, _ in select_calls(saved_calls, methods=["a.*"], indices=[2])], [0, 1, 2])
+
+    def test_run_call_substitutes_the_environment(self):
+        caller = FakeCaller()
+        call_info = {"protoset": "demo.protoset", "server": "{{HOST}}", "method": "a.Svc.GetThing", "body": '{"id": "{{ID}}"}'}
+        record = run_call(caller, 3, call_info, {"HOST": "localhost:50051", "ID": "7"}, True)
+        self.assertTrue(record["ok"])
+        self.assertEqual(record["index"], 3)
+        self.assertEqual(caller.calls, [(True, "", "", "demo.protoset", "localhost:50051", "a.Svc.GetThing", '{"id": "7"}')])
+
+    def test_run_call_refuses_unsubstituted_variables(self):
+        caller = FakeCaller()
+        record = run_call(caller, 0, {"protoset": "p", "server": "{{HOST}}", "method": "a.Svc.Get"}, {}, False)
+        self.assertFalse(record["ok"])
+        self.assertIn("server", record["error"])
+        self.assertEqual(caller.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+from environment_repo import EnvironmentRepo, compile_template, resolve_call_details, resolve_nested_variables  # noqa: E402
+
+
+class CompileTemplateTest(unittest.TestCase):
+    def test_splits_literals_and_references(self):
+        template = compile_template("https://{{ host }}:{{port}}/v1")
+        self.assertEqual(template.segments, ["https://", ("host", "{{ host }}"), ":", ("port", "{{port}}"), "/v1"])
+        self.assertEqual(template.variables, {"host", "port"})
+        self.assertIs(compile_template("https://{{ host }}:{{port}}/v1"), template)
+
+    def test_render_reports_whether_every_reference_was_filled(self):
+        template = compile_template("{{host}}:{{port}}")
+        self.assertEqual(template.render({"host": "h", "port": "1"}), ("h:1", True))
+        self.assertEqual(template.render({"host": "h"}), ("h:{{port}}", False))
+        self.assertEqual(template.render({"host": "{{other}}", "port": "1"}), ("{{other}}:1", False))
+        self.assertEqual(compile_template("{{not a name}}").render({}), ("{{not a name}}", False))
+        self.assertEqual(compile_template("no references").render({}), ("no references", True))
+
+    def test_resolve_call_details_lists_the_unsubstituted_fields(self):
+        details, body, unsubstituted = resolve_call_details(
+            {"server": "{{host}}:443", "method": "a.Svc.Get", "cookie": "{{missing}}"}, '{"id": "{{id}}"}',
+            {"host": "h", "id": "7"})
+        self.assertEqual(details, {"server": "h:443", "method": "a.Svc.Get", "cookie": "{{missing}}"})
+        self.assertEqual(body, '{"id": "7"}')
+        self.assertEqual(unsubstituted, ["cookie"])
+
+
+class ResolveNestedVariablesTest(unittest.TestCase):
+    def test_expands_chains_of_references(self):
+        resolved = resolve_nested_variables({"url": "{{host}}:{{port}}", "host": "{{region}}.example.com",
+                                             "region": "eu", "port": "443"})
+        self.assertEqual(resolved["url"], "eu.example.com:443")
+        self.assertEqual(resolved["host"], "eu.example.com")
+
+    def test_leaves_undefined_references_and_cycles(self):
+        resolved = resolve_nested_variables({"a": "{{b}}", "b": "{{a}}", "c": "{{nowhere}}", "d": "{{d}}"})
+        self.assertEqual(resolved["c"], "{{nowhere}}")
+        self.assertEqual(resolved["d"], "{{d}}")
+        self.assertIn("{{", resolved["a"])
+        self.assertIn("{{", resolved["b"])
+
+
+class EnvironmentRepoTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.filename = os.path.join(self.directory, "environments.json")
+        self.write({"dev": {"host": "dev"}, "prod": {"host": "prod"}})
+
+    def write(self, data, mtime_ns=None):
+        # Set the mtime explicitly, since coarse filesystem timestamps may not change between writes.
+        with open(self.filename, "w") as f:
+            json.dump(data, f)
+        stamp = mtime_ns or os.stat(self.filename).st_mtime_ns + 1_000_000_000
+        os.utime(self.filename, ns=(stamp, stamp))
+
+    def test_reloads_only_changed_environments(self):
+        repo = EnvironmentRepo(self.filename)
+        self.assertEqual(repo.check_for_changes(), [])
+        self.assertEqual(repo.get_resolved_environment("dev"), {"host": "dev"})
+
+        self.write({"dev": {"host": "dev2"}, "prod": {"host": "prod"}, "qa": {"host": "qa"}})
+        self.assertEqual(sorted(repo.check_for_changes()), ["dev", "qa"])
+        self.assertEqual(repo.get_resolved_environment("dev"), {"host": "dev2"})
+        self.assertEqual(repo.check_for_changes(), [])
+
+        self.write({"dev": {"host": "dev2"}})
+        self.assertEqual(sorted(repo.check_for_changes()), ["prod", "qa"])
+        self.assertEqual(repo.get_all_environment_names(), ["dev"])
+
+    def test_picks_up_another_instance_and_keeps_its_edits(self):
+        repo, other = EnvironmentRepo(self.filename), EnvironmentRepo(self.filename)
+        other.save_environment("qa", {"host": "qa"})
+        repo.save_environment("dev", {"host": "dev3"})
+        self.assertEqual(EnvironmentRepo(self.filename).data,
+                         {"dev": {"host": "dev3"}, "prod": {"host": "prod"}, "qa": {"host": "qa"}})
+
+    def test_half_written_or_missing_file(self):
+        repo = EnvironmentRepo(self.filename)
+        with open(self.filename, "w") as f:
+            f.write('{"dev": ')
+        self.assertEqual(repo.check_for_changes(), [])
+        self.assertEqual(repo.get_environment("dev"), {"host": "dev"})
+        os.remove(self.filename)
+        self.assertEqual(sorted(repo.check_for_changes()), ["dev", "prod"])
+        self.assertEqual(repo.data, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+import fanout  # noqa: E402
+from fanout import FanOutRunner, RateLimiter  # noqa: E402
+
+TYPE_INT32 = 5
+LABEL_OPTIONAL = 1
+FIELDS = [(SimpleNamespace(name="id", type=TYPE_INT32, label=LABEL_OPTIONAL, type_name=""), [])]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeCaller:
+    """Echoes the request body back, recording the body of every call."""
+    def __init__(self):
+        self.bodies = []
+
+    def execute_call(self, *args, handle=None):
+        body = args[-1]
+        self.bodies.append(json.loads(body))
+        return 0, body, "", []
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        for name in ("monotonic", "sleep"):
+            patcher = mock.patch.object(fanout.time, name, getattr(self.clock, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_lets_a_burst_through_then_waits_for_tokens(self):
+        limiter = RateLimiter(rate=2, burst=2)
+        start = self.clock.now
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertEqual(self.clock.now, start)
+        self.assertTrue(limiter.acquire())
+        self.assertAlmostEqual(self.clock.now - start, 0.5)
+
+    def test_stops_waiting_when_asked(self):
+        limiter = RateLimiter(rate=0.1)
+        self.assertTrue(limiter.acquire())
+        start = self.clock.now
+        self.assertFalse(limiter.acquire(should_stop=lambda: True))
+        # Checks should_stop at least every 100 ms rather than waiting out the 10 s.
+        self.assertAlmostEqual(self.clock.now - start, 0.1)
+
+
+class FanOutRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.input_path = os.path.join(self.directory, "rows.csv")
+        self.output_path = os.path.join(self.directory, "results.jsonl")
+        with open(self.input_path, "w") as f:
+            f.write("id,ignored\n" + "".join(f"{i},x\n" for i in range(5)))
+
+    def runner(self, caller, **kwargs):
+        return FanOutRunner(caller, (True, "", "", "demo.protoset", "localhost:50051", "a.Svc.Get"), FIELDS,
+                            self.input_path, self.output_path, **kwargs)
+
+    def write_output(self, rows):
+        with open(self.output_path, "w") as f:
+            for row in rows:
+                f.write(json.dumps({"row": row, "ok": True}) + "\n")
+            f.write('{"row": 4, "o')  # a line cut short when the last run was killed
+
+    def checkpoint(self):
+        with open(self.output_path + ".checkpoint") as f:
+            return json.load(f)
+
+    def results(self):
+        with open(self.output_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_calls_every_row_and_checkpoints_the_watermark(self):
+        caller = FakeCaller()
+        runner = self.runner(caller, workers=2, checkpoint_every=2)
+        self.assertEqual(runner.run().split(" in ")[0], "5 rows called (0 failed)")
+        self.assertEqual(sorted(body["id"] for body in caller.bodies), [0, 1, 2, 3, 4])
+        self.assertEqual(sorted(record["row"] for record in self.results()), [0, 1, 2, 3, 4])
+        self.assertEqual(self.checkpoint(), {"input": os.path.abspath(self.input_path), "watermark": 5})
+        self.assertEqual(runner.poll(), 0)
+
+    def test_resume_skips_rows_below_the_watermark_and_rows_already_in_the_output(self):
+        with open(self.output_path + ".checkpoint", "w") as f:
+            json.dump({"input": os.path.abspath(self.input_path), "watermark": 1}, f)
+        # Row 0 is below the watermark; rows 1 and 3 finished after the last checkpoint.
+        self.write_output([1, 3])
+        caller = FakeCaller()
+        runner = self.runner(caller, workers=1)
+        runner._load_progress()
+        self.assertEqual(runner._watermark, 2)
+        self.assertEqual(runner._completed, {3})
+
+        runner = self.runner(caller, workers=1)
+        runner.run()
+        self.assertEqual([body["id"] for body in caller.bodies], [2, 4])
+        self.assertEqual(runner.skipped, 3)
+        self.assertEqual(self.checkpoint()["watermark"], 5)
+
+    def test_without_resume_starts_over(self):
+        with open(self.output_path + ".checkpoint", "w") as f:
+            json.dump({"input": "elsewhere.csv", "watermark": 3}, f)
+        self.write_output([0, 1, 2])
+        caller = FakeCaller()
+        self.runner(caller, resume=False).run()
+        self.assertEqual(len(caller.bodies), 5)
+        self.assertEqual(len(self.results()), 5)
+
+    def test_refuses_to_resume_a_checkpoint_for_another_input(self):
+        with open(self.output_path + ".checkpoint", "w") as f:
+            json.dump({"input": os.path.abspath("elsewhere.csv"), "watermark": 3}, f)
+        with self.assertRaises(ValueError):
+            self.runner(FakeCaller())
+
+
+if __name__ == "__main__":
+    unittest.main()
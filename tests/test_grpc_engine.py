@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from concurrent import futures
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+try:
+    import grpc
+except ImportError:
+    grpc = None
+
+
+def write_demo_protoset(path):
+    """A protoset with demo.Svc: GetThing (unary) and ListThings (server streaming), both Req -> Resp."""
+    from google.protobuf import descriptor_pb2
+    fds = descriptor_pb2.FileDescriptorSet()
+    file_desc = fds.file.add(name="demo.proto", package="demo", syntax="proto3")
+    for message_name in ("Req", "Resp"):
+        message = file_desc.message_type.add(name=message_name)
+        message.field.add(name="id", number=1, type=descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+                          label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL)
+        message.field.add(name="count", number=2, type=descriptor_pb2.FieldDescriptorProto.TYPE_INT32,
+                          label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL)
+    service = file_desc.service.add(name="Svc")
+    service.method.add(name="GetThing", input_type=".demo.Req", output_type=".demo.Resp")
+    service.method.add(name="ListThings", input_type=".demo.Req", output_type=".demo.Resp", server_streaming=True)
+    with open(path, "wb") as f:
+        f.write(fds.SerializeToString())
+
+
+@unittest.skipIf(grpc is None, "grpcio is not installed")
+class InProcessGrpcCallerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from grpc_engine import InProcessGrpcCaller
+        from protoset_parser import ProtosetParser
+
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.protoset = os.path.join(cls.temp_dir.name, "demo.protoset")
+        write_demo_protoset(cls.protoset)
+        parser = ProtosetParser()
+        index = parser.get_index(cls.protoset)
+        request_class = index.get_message_class("demo.Req")
+        response_class = index.get_message_class("demo.Resp")
+
+        def get_thing(request, context):
+            if request.id == "missing":
+                context.abort(grpc.StatusCode.NOT_FOUND, "no such thing")
+            return response_class(id=request.id, count=request.count + 1)
+
+        def list_things(request, context):
+            for i in range(request.count):
+                yield response_class(id=request.id, count=i)
+
+        serialize = lambda message: message.SerializeToString()
+        cls.server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        cls.server.add_generic_rpc_handlers([grpc.method_handlers_generic_handler("demo.Svc", {
+            "GetThing": grpc.unary_unary_rpc_method_handler(get_thing, request_class.FromString, serialize),
+            "ListThings": grpc.unary_stream_rpc_method_handler(list_things, request_class.FromString, serialize),
+        })])
+        port = cls.server.add_insecure_port("127.0.0.1:0")
+        cls.server.start()
+        cls.address = f"127.0.0.1:{port}"
+        cls.caller = InProcessGrpcCaller(parser, timeout=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.caller.close()
+        cls.server.stop(None)
+        cls.temp_dir.cleanup()
+
+    def call(self, method, body):
+        return self.caller.execute_call(True, "", "", self.protoset, self.address, method, body)
+
+    def test_unary_call(self):
+        return_code, stdout, stderr, command = self.call("demo.Svc.GetThing", '{"id": "a", "count": 2}')
+        self.assertEqual((return_code, stderr), (0, ""))
+        self.assertEqual(json.loads(stdout), {"id": "a", "count": 3})
+        self.assertEqual(command[-2:], [self.address, "demo.Svc.GetThing"])
+
+    def test_server_streaming_call(self):
+        messages = []
+        return_code, stderr, _ = self.caller.stream_call(
+            True, "", "", self.protoset, self.address, "demo.Svc.ListThings", '{"id": "b", "count": 3}', messages.append)
+        self.assertEqual((return_code, stderr), (0, ""))
+        self.assertEqual([json.loads(message) for message in messages],
+                         [{"id": "b"}, {"id": "b", "count": 1}, {"id": "b", "count": 2}])
+
+    def test_rpc_error_exits_like_grpcurl(self):
+        from grpc_engine import GRPCURL_STATUS_EXIT_BASE
+        return_code, stdout, stderr, _ = self.call("demo.Svc.GetThing", '{"id": "missing"}')
+        self.assertEqual(return_code, GRPCURL_STATUS_EXIT_BASE + grpc.StatusCode.NOT_FOUND.value[0])
+        self.assertEqual(stdout, "")
+        self.assertEqual(stderr, "ERROR:\n  Code: NotFound\n  Message: no such thing\n")
+
+    def test_unknown_method(self):
+        return_code, _, stderr, _ = self.call("demo.Svc.Nope", "")
+        self.assertEqual(return_code, 1)
+        self.assertIn("symbol not found", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+from history_store import CallHistoryStore, redact_command  # noqa: E402
+
+
+class RedactCommandTest(unittest.TestCase):
+    def test_masks_cookie_and_bearer_values(self):
+        self.assertEqual(
+            redact_command("grpcurl -H Cookie:s=abc123 -H authorization: Bearer tok.en -d {} host:443 a.Svc.Get"),
+            "grpcurl -H Cookie:s=*** -H authorization: Bearer *** -d {} host:443 a.Svc.Get")
+
+    def test_masks_the_in_process_engine_headers(self):
+        self.assertEqual(redact_command("(in-process) -H cookie: s=zz -H authorization: Bearer q host:443 a.Svc.Get"),
+                         "(in-process) -H cookie: s=*** -H authorization: Bearer *** host:443 a.Svc.Get")
+
+    def test_leaves_other_commands_alone(self):
+        command = "grpcurl -plaintext -d {\"cookie\": 1} host:443 a.Svc.Get"
+        self.assertEqual(redact_command(command), command)
+        self.assertIsNone(redact_command(None))
+
+
+class CallHistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def store(self, **kwargs):
+        kwargs.setdefault("evict_every", 1000)
+        store = CallHistoryStore(os.path.join(self.directory, "call_history.db"), **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def record(self, store, stdout="{}", started_at=None, command="grpcurl host:443 a.Svc.Get"):
+        return store.record("a.Svc.Get", "host:443", "demo.protoset", command, "", stdout, "", 0,
+                            time.time() if started_at is None else started_at, 0.01)
+
+    def ids(self, store):
+        return [row["id"] for row in store.query(limit=1000)]
+
+    def test_stores_the_command_redacted(self):
+        store = self.store()
+        call_id = self.record(store, command="grpcurl -H Cookie:s=secret host:443 a.Svc.Get")
+        self.assertEqual(store.get(call_id)["command"], "grpcurl -H Cookie:s=*** host:443 a.Svc.Get")
+
+    def test_evicts_the_oldest_rows_beyond_max_rows(self):
+        store = self.store(max_rows=3)
+        ids = [self.record(store) for _ in range(5)]
+        store.evict()
+        self.assertEqual(self.ids(store), ids[:1:-1])
+
+    def test_evicts_rows_older_than_max_age(self):
+        store = self.store(max_age_days=1)
+        self.record(store, started_at=time.time() - 2 * 86400)
+        recent = self.record(store)
+        store.evict()
+        self.assertEqual(self.ids(store), [recent])
+
+    def test_evicts_the_oldest_rows_until_under_max_bytes(self):
+        store = self.store(max_bytes=1024 * 1024)
+        ids = [self.record(store, stdout="x" * 100000) for _ in range(30)]
+        store.evict(batch=5)
+        kept = self.ids(store)
+        self.assertLess(store._used_bytes(), 1024 * 1024)
+        self.assertTrue(kept)
+        # Whatever is left is the newest calls.
+        self.assertEqual(kept, ids[::-1][:len(kept)])
+
+    def test_evicts_automatically_every_evict_every_records(self):
+        store = self.store(max_rows=2, evict_every=3)
+        ids = [self.record(store) for _ in range(3)]
+        self.assertEqual(self.ids(store), ids[:0:-1])
+
+    def test_truncates_huge_output(self):
+        store = self.store(max_output_chars=10)
+        call_id = self.record(store, stdout="0123456789abcdef")
+        self.assertEqual(store.get(call_id)["stdout"], "0123456789\n[6 more characters not stored]\n")
+
+    def test_pages_newest_first(self):
+        store = self.store()
+        ids = [self.record(store) for _ in range(5)]
+        first = store.query(limit=2)
+        self.assertEqual([row["id"] for row in first], [ids[4], ids[3]])
+        older = store.query(before_id=first[-1]["id"], limit=2)
+        self.assertEqual([row["id"] for row in older], [ids[2], ids[1]])
+        newer = store.query(after_id=older[0]["id"], limit=2)
+        self.assertEqual([row["id"] for row in newer], [ids[4], ids[3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+from load_test import LoadTestReport, LoadTestRunner, status_of  # noqa: E402
+
+
+class FakeCaller:
+    """Answers every call at once, failing the ones for which fail(n) is true."""
+    def __init__(self, fail=lambda n: False):
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def execute_call(self, *args, handle=None):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if self.fail(n):
+            return 1, "", "ERROR:\n  Code: NotFound\n  Message: no such thing\n", []
+        return 0, "{}", "", []
+
+
+class HangingCaller:
+    """Never answers until its call is cancelled, like a server that doesn't reply."""
+    def __init__(self):
+        self.started = threading.Semaphore(0)
+
+    def execute_call(self, *args, handle=None):
+        self.started.release()
+        while not handle.cancelled:
+            time.sleep(0.01)
+        return None, "", "cancelled", []
+
+
+class LoadTestReportTest(unittest.TestCase):
+    def test_percentiles_use_the_nearest_rank(self):
+        report = LoadTestReport([0.01 * i for i in range(10, 0, -1)], Counter(OK=10), 2.0, 1)
+        self.assertEqual(report.percentile(0), 0.01)
+        self.assertEqual(report.percentile(50), 0.05)
+        self.assertEqual(report.percentile(90), 0.09)
+        self.assertEqual(report.percentile(99), 0.1)
+        self.assertEqual(report.percentile(100), 0.1)
+        self.assertEqual(report.throughput, 5.0)
+        self.assertEqual(LoadTestReport([], Counter(), 0.0, 1).percentile(50), 0.0)
+
+    def test_histogram_buckets_cover_the_latency_range(self):
+        report = LoadTestReport(list(range(10)), Counter(OK=10), 1.0, 1)
+        self.assertEqual(report.histogram(buckets=3), [(3.0, 3), (6.0, 3), (9.0, 4)])
+        # All latencies the same still makes a histogram, with everything in the first bucket.
+        counts = [count for _, count in LoadTestReport([0.5] * 4, Counter(OK=4), 1.0, 1).histogram(buckets=2)]
+        self.assertEqual(counts, [4, 0])
+        self.assertEqual(LoadTestReport([], Counter(), 1.0, 1).histogram(), [])
+
+    def test_status_names_follow_grpcurl(self):
+        self.assertEqual(status_of(0, ""), "OK")
+        self.assertEqual(status_of(1, "ERROR:\n  Code: Unavailable\n"), "Unavailable")
+        self.assertEqual(status_of(2, "boom"), "exit 2")
+        self.assertEqual(status_of(None, ""), "failed to start")
+
+
+class LoadTestRunnerTest(unittest.TestCase):
+    def test_runs_the_requested_number_of_calls(self):
+        caller = FakeCaller(fail=lambda n: n % 4 == 0)
+        runner = LoadTestRunner(caller, (), concurrency=3, iterations=20)
+        report = runner.run()
+        self.assertEqual(caller.calls, 20)
+        self.assertEqual(report.total, 20)
+        self.assertEqual(report.statuses, Counter(OK=15, NotFound=5))
+        self.assertEqual(runner.poll(), 0)
+
+    def test_kill_cancels_the_calls_in_flight_and_stops_the_run(self):
+        caller = HangingCaller()
+        runner = LoadTestRunner(caller, (), concurrency=2, duration=60)
+        self.assertIsNone(runner.poll())
+        reports = []
+        thread = threading.Thread(target=lambda: reports.append(runner.run()))
+        thread.start()
+        for _ in range(2):
+            self.assertTrue(caller.started.acquire(timeout=5))
+        runner.kill()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        # Cancelled calls aren't counted in the report.
+        self.assertEqual(reports[0].total, 0)
+        self.assertEqual(runner.poll(), 0)
+
+    def test_needs_a_number_of_runs_or_a_duration(self):
+        with self.assertRaises(ValueError):
+            LoadTestRunner(FakeCaller(), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
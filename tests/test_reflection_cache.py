@@ -0,0 +1,132 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent import futures
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+from reflection_cache import ReflectionCache, ReflectionError  # noqa: E402
+from test_grpc_engine import write_demo_protoset  # noqa: E402
+
+try:
+    import grpc
+    from grpc_reflection.v1alpha import reflection
+except ImportError:
+    grpc = reflection = None
+
+
+class FakeRunner:
+    """Stands in for grpcurl: answers `list` with services and writes -protoset-out for `describe`."""
+    def __init__(self, services=("demo.Greeter",), list_code=0, describe_code=0):
+        self.services = services
+        self.list_code = list_code
+        self.describe_code = describe_code
+        self.commands = []
+
+    def __call__(self, command):
+        self.commands.append(command)
+        if command[-1] == "list":
+            services = "\n".join(("grpc.reflection.v1alpha.ServerReflection",) + tuple(self.services))
+            return self.list_code, services + "\n", "" if self.list_code == 0 else "connection refused"
+        if self.describe_code != 0:
+            return self.describe_code, "", "describe failed"
+        out_path = command[command.index("-protoset-out") + 1]
+        with open(out_path, "wb") as f:
+            f.write(f"descriptors {len(self.commands)}".encode("utf-8"))
+        return 0, "", ""
+
+
+class ReflectionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_fetches_once_and_reuses_the_cached_protoset(self):
+        runner = FakeRunner()
+        cache = ReflectionCache(self.cache_dir, ttl=3600, runner=runner)
+
+        path = cache.get_protoset("localhost:50051", True, ["authorization: Bearer token"])
+        self.assertEqual(cache.get_protoset("localhost:50051", True), path)
+
+        self.assertEqual(len(runner.commands), 2)
+        list_command, describe_command = runner.commands
+        self.assertEqual(list_command, ["grpcurl", "-plaintext", "-H", "authorization: Bearer token", "localhost:50051", "list"])
+        # The reflection service itself isn't described.
+        self.assertEqual(describe_command[-2:], ["describe", "demo.Greeter"])
+        self.assertEqual(cache.get_cached("localhost:50051", True), path)
+        self.assertIsNone(cache.get_cached("localhost:50051", False))
+
+    def test_refresh_and_expiry_fetch_again(self):
+        runner = FakeRunner()
+        cache = ReflectionCache(self.cache_dir, ttl=3600, runner=runner)
+        path = cache.get_protoset("localhost:50051", True)
+
+        cache.get_protoset("localhost:50051", True, refresh=True)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"descriptors 4")
+
+        cache.ttl = -1
+        self.assertIsNone(cache.get_cached("localhost:50051", True))
+        cache.get_protoset("localhost:50051", True)
+        self.assertEqual(len(runner.commands), 6)
+
+    def test_failures_raise_and_leave_no_cache(self):
+        for runner in (FakeRunner(list_code=1), FakeRunner(describe_code=1), FakeRunner(services=())):
+            cache = ReflectionCache(self.cache_dir, runner=runner)
+            with self.assertRaises(ReflectionError):
+                cache.get_protoset("localhost:50051", True)
+            self.assertIsNone(cache.get_cached("localhost:50051", True))
+        self.assertEqual([name for name in os.listdir(self.cache_dir) if name.endswith(".tmp")], [])
+
+    def test_needs_a_server(self):
+        with self.assertRaises(ReflectionError):
+            ReflectionCache(self.cache_dir, runner=FakeRunner()).get_protoset("", True)
+
+
+def start_reflection_server(protoset_path):
+    """A local server that only answers reflection, describing the services in protoset_path."""
+    from google.protobuf import descriptor_pb2, descriptor_pool
+    fds = descriptor_pb2.FileDescriptorSet()
+    with open(protoset_path, "rb") as f:
+        fds.ParseFromString(f.read())
+    pool = descriptor_pool.DescriptorPool()
+    service_names = [reflection.SERVICE_NAME]
+    for file_desc in fds.file:
+        pool.Add(file_desc)
+        service_names.extend(f"{file_desc.package}.{service.name}" for service in file_desc.service)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    reflection.enable_server_reflection(service_names, server, pool=pool)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    return server, f"127.0.0.1:{port}"
+
+
+@unittest.skipIf(reflection is None, "grpcio-reflection is not installed")
+@unittest.skipIf(shutil.which("grpcurl") is None, "grpcurl is not installed")
+class ReflectionServerTest(unittest.TestCase):
+    """Runs the real grpcurl commands against a reflection-enabled server."""
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        protoset_path = os.path.join(self.directory, "demo.protoset")
+        write_demo_protoset(protoset_path)
+        self.server, self.address = start_reflection_server(protoset_path)
+        self.addCleanup(self.server.stop, None)
+
+    def test_fetched_protoset_loads_with_the_server_methods(self):
+        from protoset_parser import ProtosetParser
+        from protoset_sidecar import SidecarCache
+
+        cache = ReflectionCache(os.path.join(self.directory, "reflection_cache"))
+        path = cache.get_protoset(self.address, True)
+
+        parser = ProtosetParser(sidecar_cache=SidecarCache(os.path.join(self.directory, "index_cache")))
+        self.assertEqual(sorted(parser.get_call_names(path)), ["demo.Svc.GetThing", "demo.Svc.ListThings"])
+        self.assertEqual([field.name for field, _ in parser.get_method_request_fields(path, "demo.Svc.GetThing")],
+                         ["id", "count"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+import response_cache  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+RESULT = (0, "{}\n", "", ["grpcurl"])
+
+
+def key(method="a.Svc.GetThing", protoset_version=1, engine="grpcurl", protoset="demo.protoset"):
+    return ResponseCache.make_key(True, "", "", protoset, "localhost:50051", method, "{}", protoset_version, engine)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_ttl_rules_match_bare_or_full_method_names(self):
+        cache = ResponseCache({"climate.ClimatePublic.*": 5, "Get*": 30, "*": 60})
+        self.assertEqual(cache.ttl_for("climate.ClimatePublic.ListDevices"), 5)
+        self.assertEqual(cache.ttl_for("billing.Invoices.GetInvoice"), 30)
+        # Bare patterns only look at the method name, not the package or service.
+        self.assertEqual(cache.ttl_for("Getters.Svc.DeleteThing"), 60)
+        self.assertIsNone(ResponseCache({"Get*": 30}).ttl_for("a.Svc.DeleteThing"))
+
+    def test_entries_expire_after_their_ttl(self):
+        cache = ResponseCache({"Get*": 30})
+        with mock.patch.object(response_cache.time, "monotonic", return_value=100.0):
+            self.assertTrue(cache.put(key(), RESULT))
+        with mock.patch.object(response_cache.time, "monotonic", return_value=129.0):
+            self.assertEqual(cache.get(key()), (RESULT, 29.0))
+        with mock.patch.object(response_cache.time, "monotonic", return_value=130.0):
+            self.assertIsNone(cache.get(key()))
+
+    def test_uncacheable_methods_are_not_stored(self):
+        cache = ResponseCache({"Get*": 30})
+        self.assertFalse(cache.put(key("a.Svc.DeleteThing"), RESULT))
+        self.assertIsNone(cache.get(key("a.Svc.DeleteThing")))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ResponseCache({"Get*": 30}, max_entries=2)
+        first, second, third = key("a.Svc.GetOne"), key("a.Svc.GetTwo"), key("a.Svc.GetThree")
+        cache.put(first, RESULT)
+        cache.put(second, RESULT)
+        cache.get(first)  # now second is the least recently used
+        cache.put(third, RESULT)
+        self.assertIsNotNone(cache.get(first))
+        self.assertIsNone(cache.get(second))
+        self.assertIsNotNone(cache.get(third))
+
+    def test_key_includes_protoset_and_engine(self):
+        cache = ResponseCache({"Get*": 30})
+        cache.put(key(), RESULT)
+        self.assertIsNotNone(cache.get(key()))
+        self.assertIsNone(cache.get(key(protoset_version=2)))
+        self.assertIsNone(cache.get(key(protoset="other.protoset")))
+        self.assertIsNone(cache.get(key(engine="in-process")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+from saved_call_index import SavedCallIndex  # noqa: E402
+
+
+class SavedCallIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SavedCallIndex()
+        self.index.rebuild([
+            {"method": "climate.ClimatePublic.GetClimateDevices", "server": "climate:443", "body": '{"site": "oslo"}'},
+            {"method": "billing.Invoices.ListInvoices", "server": "billing:443"},
+        ])
+
+    def test_search_prefix_matches_every_word(self):
+        self.assertEqual(self.index.search("clim get"), [0])
+        self.assertEqual(self.index.search("climate devices"), [0])
+        self.assertEqual(self.index.search("oslo"), [0])
+        self.assertEqual(self.index.search(""), [0, 1])
+        self.assertEqual(self.index.search("clim invoices"), [])
+
+    def test_matches_agrees_with_search(self):
+        for query in ("clim get", "inv", "", "oslo billing", "nothing"):
+            for call_index in (0, 1):
+                self.assertEqual(self.index.matches(call_index, query), call_index in self.index.search(query), query)
+        self.assertFalse(self.index.matches(5, ""))
+
+    def test_add_and_update_change_what_matches(self):
+        self.index.add(2, {"method": "billing.Invoices.GetInvoice"})
+        self.assertEqual(self.index.search("invoice"), [1, 2])
+        self.index.update(2, {"method": "climate.ClimatePublic.GetSite"})
+        self.assertFalse(self.index.matches(2, "invoice"))
+        self.assertTrue(self.index.matches(2, "clim site"))
+        self.assertEqual(self.index.search("invoice"), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui"))
+
+from saved_calls import SavedGrpcManager  # noqa: E402
+
+
+def call(method, server="localhost:50051"):
+    return {"method": method, "server": server, "protoset": "demo.protoset", "body": ""}
+
+
+class SavedGrpcManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.history_file = os.path.join(self.directory, "grpc_calls.json")
+
+    def manager(self, journal=True, compact_after=500):
+        manager = SavedGrpcManager(self.history_file, journal=journal, compact_after=compact_after)
+        self.addCleanup(lambda: manager._owner_lock and manager._owner_lock.close())
+        return manager
+
+    def write_history(self, calls):
+        with open(self.history_file, "w") as f:
+            json.dump(calls, f)
+
+    def write_journal(self, path, records):
+        with open(path, "a") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    def methods(self, saved_calls):
+        return [call_info["method"] for call_info in saved_calls]
+
+    def contents(self):
+        contents = {}
+        for name in os.listdir(self.directory):
+            with open(os.path.join(self.directory, name)) as f:
+                contents[name] = f.read()
+        return contents
+
+    def test_replays_the_journal_over_the_history(self):
+        self.write_history([call("a.Svc.One"), call("a.Svc.Two")])
+        manager = self.manager()
+        self.write_journal(manager.journal_file, [
+            {"op": "update", "id": "h1", "call": call("a.Svc.Two", "other:1")},
+            {"op": "append", "id": "x", "call": call("a.Svc.Three")},
+            {"op": "update", "id": "x", "call": call("a.Svc.Three", "other:2")},
+        ])
+        with open(manager.journal_file, "a") as f:
+            f.write('{"op": "append", "id": "cut sh')  # a write cut short by a crash
+
+        saved_calls = manager.read_saved_calls()
+        self.assertEqual(self.methods(saved_calls), ["a.Svc.One", "a.Svc.Two", "a.Svc.Three"])
+        self.assertEqual([call_info["server"] for call_info in saved_calls], ["localhost:50051", "other:1", "other:2"])
+
+    def test_legacy_positional_records_after_a_gap_are_kept(self):
+        self.write_history([call("a.Svc.One")])
+        manager = self.manager()
+        self.write_journal(manager.journal_file, [
+            {"index": 0, "call": call("a.Svc.One", "other:1")},
+            {"index": 5, "call": call("a.Svc.Lost")},
+            {"index": 6, "call": call("a.Svc.AlsoLost")},
+        ])
+        saved_calls = manager.read_saved_calls()
+        self.assertEqual(self.methods(saved_calls), ["a.Svc.One", "a.Svc.Lost", "a.Svc.AlsoLost"])
+        self.assertEqual(saved_calls[0]["server"], "other:1")
+
+    def test_two_instances_appending_keep_both_calls(self):
+        self.write_history([call("a.Svc.One")])
+        owner, other = self.manager(), self.manager()
+        owner.load_saved_calls()
+        other.load_saved_calls()
+        self.assertTrue(owner.owns_journal())
+        self.assertFalse(other.owns_journal())
+
+        owner.append_call(call("a.Svc.FromOwner"))
+        other.append_call(call("a.Svc.FromOther"))
+        other.update_call(0, call("a.Svc.One", "edited:1"))
+
+        saved_calls = self.manager().read_saved_calls()
+        self.assertEqual(self.methods(saved_calls), ["a.Svc.One", "a.Svc.FromOwner", "a.Svc.FromOther"])
+        self.assertEqual(saved_calls[0]["server"], "edited:1")
+
+    def test_non_owner_never_changes_any_file(self):
+        self.write_history([call("a.Svc.One")])
+        owner = self.manager()
+        owner.load_saved_calls()
+        owner.append_call(call("a.Svc.Two"))
+        before = self.contents()
+
+        other = self.manager()
+        self.assertEqual(self.methods(other.load_saved_calls()), ["a.Svc.One", "a.Svc.Two"])
+        self.assertEqual(self.contents(), before)
+
+    def test_owner_compacts_the_journal_on_load(self):
+        self.write_history([call("a.Svc.One")])
+        writer = self.manager()
+        writer.load_saved_calls()
+        writer.append_call(call("a.Svc.Two"))
+        writer._owner_lock.close()
+
+        owner = self.manager()
+        self.assertEqual(self.methods(owner.load_saved_calls()), ["a.Svc.One", "a.Svc.Two"])
+        self.assertFalse(os.path.exists(owner.journal_file))
+        self.assertFalse(os.path.exists(owner.compacting_file))
+        with open(self.history_file) as f:
+            history = json.load(f)
+        self.assertEqual(self.methods(history), ["a.Svc.One", "a.Svc.Two"])
+        self.assertEqual(history[0]["id"], "h0")
+
+    def test_compaction_after_enough_records(self):
+        manager = self.manager(compact_after=3)
+        manager.load_saved_calls()
+        for i in range(3):
+            manager.append_call(call(f"a.Svc.M{i}"))
+        deadline = time.time() + 5
+        while (manager._compacting or os.path.exists(manager.compacting_file)) and time.time() < deadline:
+            time.sleep(0.01)
+        with open(self.history_file) as f:
+            self.assertEqual(self.methods(json.load(f)), ["a.Svc.M0", "a.Svc.M1", "a.Svc.M2"])
+        self.assertFalse(os.path.exists(manager.journal_file))
+
+    def test_rotation_keeps_a_failed_compaction_and_a_crashed_rotation(self):
+        manager = self.manager()
+        self.write_journal(manager.compacting_file, [{"op": "append", "id": "a", "call": call("a.Svc.Compacting")}])
+        self.write_journal(manager.rotating_file, [{"op": "append", "id": "b", "call": call("a.Svc.Rotating")}])
+        self.write_journal(manager.journal_file, [{"op": "append", "id": "c", "call": call("a.Svc.Journal")}])
+
+        self.assertEqual(self.methods(manager.read_saved_calls()), ["a.Svc.Compacting", "a.Svc.Rotating", "a.Svc.Journal"])
+        manager._rotate_journal()
+        self.assertFalse(os.path.exists(manager.rotating_file))
+        self.assertFalse(os.path.exists(manager.journal_file))
+        with open(manager.compacting_file) as f:
+            self.assertEqual([json.loads(line)["id"] for line in f], ["a", "b", "c"])
+
+    def test_compaction_failure_is_logged_and_nothing_is_lost(self):
+        with open(self.history_file, "w") as f:
+            f.write("not json")
+        manager = self.manager()
+        self.write_journal(manager.journal_file, [{"op": "append", "id": "a", "call": call("a.Svc.One")}])
+        with self.assertLogs("saved_calls", level="ERROR"):
+            manager.load_saved_calls()
+        self.assertTrue(os.path.exists(manager.compacting_file))
+        with open(self.history_file) as f:
+            self.assertEqual(f.read(), "not json")
+
+    def test_reader_sees_every_call_while_the_owner_compacts(self):
+        self.write_history([call("a.Svc.One")])
+        owner = self.manager()
+        owner.load_saved_calls()
+        owner.append_call(call("a.Svc.Two"))
+        with owner._lock:
+            owner._rotate_journal()
+            owner._compacting = True
+        owner.append_call(call("a.Svc.Three"))
+
+        reader = self.manager()
+        read_history = reader._read_history
+        compaction = threading.Thread(target=owner._compact)
+
+        def read_history_while_compacting():
+            calls = read_history()
+            # The compaction has to wait for the reader before it can swap files.
+            compaction.start()
+            time.sleep(0.2)
+            return calls
+
+        reader._read_history = read_history_while_compacting
+        self.assertEqual(self.methods(reader.read_saved_calls()), ["a.Svc.One", "a.Svc.Two", "a.Svc.Three"])
+        compaction.join()
+        self.assertEqual(self.methods(self.manager().read_saved_calls()), ["a.Svc.One", "a.Svc.Two", "a.Svc.Three"])
+
+    def test_without_the_journal_the_file_format_is_unchanged(self):
+        self.write_history([call("a.Svc.One")])
+        manager = self.manager(journal=False)
+        manager.load_saved_calls()
+        manager.append_call(call("a.Svc.Two"))
+        manager.update_call(0, call("a.Svc.One", "edited:1"))
+        with open(self.history_file) as f:
+            self.assertEqual(json.load(f), [call("a.Svc.One", "edited:1"), call("a.Svc.Two")])
+        self.assertFalse(os.path.exists(manager.journal_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
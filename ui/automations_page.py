@@ -1,11 +1,524 @@
+import json
+import queue
+import time
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from tkinter import ttk
+from grpc_caller import GrpcCaller, CallHandle, CancellableRun
+from environment_repo import resolve_call_details, EnvironmentRepo
+from saved_calls import CALL_DETAIL_KEYS
+
+
+class PipelineStep:
+    """A saved call placed in a pipeline, with the names of the steps it must wait for."""
+    def __init__(self, name, call_info, depends_on=None):
+        self.name = name
+        self.call_info = call_info
+        self.depends_on = list(depends_on or [])
+
+
+class StepResult:
+    def __init__(self, name, status, start=0.0, duration=0.0, return_code=None, stdout="", stderr="", command=None):
+        self.name = name
+        self.status = status  # "ok", "failed", "skipped" or "cancelled"
+        self.start = start  # seconds since the pipeline started
+        self.duration = duration
+        self.return_code = return_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.command = command or []
+
+
+class PipelineResult:
+    def __init__(self, results, wall_time, critical_path, critical_path_time):
+        self.results = results  # step name -> StepResult
+        self.wall_time = wall_time
+        self.critical_path = critical_path  # step names, first to last
+        self.critical_path_time = critical_path_time
+
+    @property
+    def succeeded(self):
+        return all(result.status == "ok" for result in self.results.values())
+
+
+def order_steps(steps):
+    """
+    Return the steps in dependency order (Kahn's algorithm).
+    Raises ValueError on unknown dependencies or cycles.
+    """
+    by_name = {step.name: step for step in steps}
+    waiting = {}
+    dependents = {step.name: [] for step in steps}
+    for step in steps:
+        for dependency in step.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{dependency}'.")
+            dependents[dependency].append(step.name)
+        waiting[step.name] = len(set(step.depends_on))
+    ready = [step.name for step in steps if not waiting[step.name]]
+    ordered = []
+    while ready:
+        name = ready.pop(0)
+        ordered.append(by_name[name])
+        for dependent in dependents[name]:
+            waiting[dependent] -= 1
+            if not waiting[dependent]:
+                ready.append(dependent)
+    if len(ordered) != len(steps):
+        raise ValueError("The pipeline has a dependency cycle.")
+    return ordered
+
+
+def step_outputs(name, stdout):
+    """
+    Variables a step exposes to the steps that depend on it: every top-level scalar
+    field of its JSON response, available as {{<step name>_<field>}}.
+    """
+    try:
+        response = json.loads(stdout)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    if not isinstance(response, dict):
+        return {}
+    return {
+        f"{name}_{key}": value if isinstance(value, str) else json.dumps(value)
+        for key, value in response.items()
+        if not isinstance(value, (dict, list))
+    }
+
+
+class PipelineRunner(CancellableRun):
+    """
+    Runs a DAG of saved calls on a worker pool. Steps start as soon as every step they
+    depend on has succeeded; a failed step causes its dependents to be skipped.
+
+    on_step_update(StepResult) is called from worker threads whenever a step starts
+    (status "running") or finishes. Like LoadTestRunner, the runner can be attached
+    to a CallHandle so cancelling the handle stops the pipeline.
+    """
+    def __init__(self, caller, steps, env_vars, plaintext, max_workers=8, on_step_update=None):
+        super().__init__()
+        self.caller = caller
+        self.steps = order_steps(steps)
+        self.env_vars = env_vars
+        self.plaintext = plaintext
+        self.max_workers = max(1, max_workers)
+        self.on_step_update = on_step_update or (lambda result: None)
+
+    def run(self):
+        by_name = {step.name: step for step in self.steps}
+        results = {}
+        outputs = {}
+        pending = {step.name: set(step.depends_on) for step in self.steps}
+        running = {}
+        started_at = time.perf_counter()
+
+        def launch_ready():
+            for name in [name for name, waiting_on in pending.items() if not waiting_on - results.keys()]:
+                del pending[name]
+                failed = [dep for dep in by_name[name].depends_on if results[dep].status != "ok"]
+                if failed or self._cancelled:
+                    status = "cancelled" if self._cancelled else "skipped"
+                    results[name] = StepResult(name, status, stderr=f"Not run: {', '.join(failed)} did not succeed.\n" if failed else "")
+                    self.on_step_update(results[name])
+                    # Skipping can unblock (and skip) further dependents straight away.
+                    launch_ready()
+                    return
+                step_vars = dict(self.env_vars)
+                for ancestor in self._ancestors(by_name, name):
+                    step_vars.update(outputs.get(ancestor, {}))
+                running[executor.submit(self._run_step, by_name[name], step_vars, started_at)] = name
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline") as executor:
+            launch_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    if results[name].status == "ok":
+                        outputs[name] = step_outputs(name, results[name].stdout)
+                launch_ready()
+        self._done = True
+
+        critical_path, critical_path_time = self._critical_path(by_name, results)
+        return PipelineResult(results, time.perf_counter() - started_at, critical_path, critical_path_time)
+
+    def _run_step(self, step, step_vars, started_at):
+        start = time.perf_counter() - started_at
+        self.on_step_update(StepResult(step.name, "running", start=start))
+        details = {key: step.call_info.get(key, "") for key in CALL_DETAIL_KEYS}
+        details, body, unsubstituted = resolve_call_details(details, step.call_info.get("body", ""), step_vars)
+        if unsubstituted:
+            result = StepResult(step.name, "failed", start=start, stderr=(
+                "Unsubstituted environment variables found in fields: " + ", ".join(unsubstituted) + "\n"))
+            self.on_step_update(result)
+            return result
+
+        with self._lock:
+            handle = self._add_handle()
+        return_code, stdout, stderr, command = self.caller.execute_call(
+            self.plaintext,
+            details["cookie"],
+            details["bearer_token"],
+            details["protoset"],
+            details["server"],
+            details["method"],
+            body,
+            handle=handle
+        )
+        with self._lock:
+            self._remove_handle(handle)
+        if handle.cancelled:
+            status = "cancelled"
+        else:
+            status = "ok" if return_code == 0 else "failed"
+        result = StepResult(step.name, status, start, time.perf_counter() - started_at - start,
+                            return_code, stdout, stderr, command)
+        self.on_step_update(result)
+        return result
+
+    @staticmethod
+    def _ancestors(by_name, name):
+        seen = set()
+        stack = list(by_name[name].depends_on)
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(by_name[current].depends_on)
+        return seen
+
+    def _critical_path(self, by_name, results):
+        # Longest chain of step durations through the DAG; steps are already in dependency order.
+        finish = {}
+        previous = {}
+        for step in self.steps:
+            best = max(step.depends_on, key=lambda dep: finish[dep], default=None)
+            finish[step.name] = results[step.name].duration + (finish[best] if best else 0.0)
+            previous[step.name] = best
+        if not finish:
+            return [], 0.0
+        last = max(finish, key=finish.get)
+        path = []
+        while last:
+            path.append(last)
+            last = previous[last]
+        path.reverse()
+        return path, finish[path[-1]]
+
 
 class AutomationsView(ttk.Frame):
     """
-    A simple placeholder view that displays:
-    "No functionality implemented yet."
+    Builds pipelines of saved calls. Steps without dependencies on each other run in
+    parallel; each row shows the step's status, start offset and duration.
     """
     def __init__(self, parent):
         super().__init__(parent)
-        label = ttk.Label(self, text="No functionality implemented yet.", font=("Arial", 14))
-        label.pack(expand=True)
\ No newline at end of file
+        self._setup_ui()
+
+    def _setup_ui(self):
+        # Left side: saved calls that can be added as steps.
+        saved_frame = ttk.Frame(self)
+        saved_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 8))
+        ttk.Label(saved_frame, text="Saved Calls").pack(anchor=tk.W)
+        self.saved_call_list_box = tk.Listbox(saved_frame, width=40, selectmode=tk.EXTENDED)
+        self.saved_call_list_box.pack(fill=tk.BOTH, expand=True)
+        saved_buttons = ttk.Frame(saved_frame)
+        saved_buttons.pack(fill=tk.X, pady=5)
+        self.add_step_button = ttk.Button(saved_buttons, text="Add Step")
+        self.add_step_button.pack(side=tk.LEFT)
+        self.reload_button = ttk.Button(saved_buttons, text="Reload")
+        self.reload_button.pack(side=tk.LEFT, padx=(5, 0))
+
+        # Right side: the pipeline.
+        pipeline_frame = ttk.Frame(self)
+        pipeline_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        settings_frame = ttk.Frame(pipeline_frame)
+        settings_frame.pack(fill=tk.X)
+        ttk.Label(settings_frame, text="Environment").pack(side=tk.LEFT)
+        self.environment_var = tk.StringVar()
+        self.environment_drop_down = ttk.Combobox(settings_frame, textvariable=self.environment_var, width=24, state='readonly')
+        self.environment_drop_down.pack(side=tk.LEFT, padx=5)
+        self.plaintext_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Use -plaintext", variable=self.plaintext_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(settings_frame, text="Workers:").pack(side=tk.LEFT)
+        self.workers_var = tk.StringVar(value="8")
+        ttk.Entry(settings_frame, textvariable=self.workers_var, width=4).pack(side=tk.LEFT, padx=5)
+
+        columns = ("method", "depends_on", "status", "start", "duration")
+        self.steps_tree = ttk.Treeview(pipeline_frame, columns=columns, height=12)
+        self.steps_tree.heading("#0", text="Step")
+        self.steps_tree.column("#0", width=70, stretch=False)
+        for column, heading, width in (
+            ("method", "Method", 240),
+            ("depends_on", "Depends On", 100),
+            ("status", "Status", 70),
+            ("start", "Start (ms)", 70),
+            ("duration", "Duration (ms)", 90)
+        ):
+            self.steps_tree.heading(column, text=heading)
+            self.steps_tree.column(column, width=width, stretch=column == "method")
+        self.steps_tree.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        edit_frame = ttk.Frame(pipeline_frame)
+        edit_frame.pack(fill=tk.X)
+        ttk.Label(edit_frame, text="Depends on (step names, comma separated):").pack(side=tk.LEFT)
+        self.depends_on_var = tk.StringVar()
+        ttk.Entry(edit_frame, textvariable=self.depends_on_var, width=20).pack(side=tk.LEFT, padx=5)
+        self.set_depends_button = ttk.Button(edit_frame, text="Set")
+        self.set_depends_button.pack(side=tk.LEFT)
+        self.chain_button = ttk.Button(edit_frame, text="Run In Order")
+        self.chain_button.pack(side=tk.LEFT, padx=(5, 0))
+        self.remove_step_button = ttk.Button(edit_frame, text="Remove Step")
+        self.remove_step_button.pack(side=tk.LEFT, padx=(5, 0))
+
+        run_frame = ttk.Frame(pipeline_frame)
+        run_frame.pack(fill=tk.X, pady=5)
+        self.run_button = ttk.Button(run_frame, text="Run Pipeline")
+        self.run_button.pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(run_frame, text="Cancel", state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=(5, 0))
+        self.summary_label = ttk.Label(run_frame, text="")
+        self.summary_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        ttk.Label(pipeline_frame, text="Step output:").pack(anchor=tk.W)
+        self.output_text = tk.Text(pipeline_frame, wrap=tk.WORD, height=10)
+        self.output_text.pack(fill=tk.BOTH, expand=True)
+
+        self.steps_tree.bind("<<TreeviewSelect>>", lambda e: self._on_step_select())
+
+    def set_on_add_step(self, handler):
+        self.add_step_button.config(command=handler)
+
+    def set_on_reload(self, handler):
+        self.reload_button.config(command=handler)
+
+    def set_on_set_depends(self, handler):
+        self.set_depends_button.config(command=handler)
+
+    def set_on_chain(self, handler):
+        self.chain_button.config(command=handler)
+
+    def set_on_remove_step(self, handler):
+        self.remove_step_button.config(command=handler)
+
+    def set_on_run(self, handler):
+        self.run_button.config(command=handler)
+
+    def set_on_cancel(self, handler):
+        self.cancel_button.config(command=handler)
+
+    def set_on_step_select(self, handler):
+        self._external_step_select = handler
+
+    def _on_step_select(self):
+        if hasattr(self, "_external_step_select") and callable(self._external_step_select):
+            self._external_step_select(self.get_selected_step())
+
+    def set_environment_options(self, options):
+        current = self.environment_var.get()
+        self.environment_drop_down['values'] = options
+        if current not in options:
+            self.environment_var.set(options[0] if options else "")
+
+    def get_selected_environment(self):
+        return self.environment_var.get()
+
+    def get_workers(self):
+        return self.workers_var.get().strip()
+
+    def update_saved_calls_list(self, saved_calls, get_display_text):
+        self.saved_call_list_box.delete(0, tk.END)
+        for call_info in saved_calls:
+            self.saved_call_list_box.insert(tk.END, get_display_text(call_info))
+
+    def get_selected_saved_calls(self):
+        return list(self.saved_call_list_box.curselection())
+
+    def get_selected_step(self):
+        selection = self.steps_tree.selection()
+        return selection[0] if selection else None
+
+    def get_depends_on(self):
+        return [name.strip() for name in self.depends_on_var.get().split(",") if name.strip()]
+
+    def show_steps(self, steps):
+        self.steps_tree.delete(*self.steps_tree.get_children())
+        for step in steps:
+            self.steps_tree.insert("", tk.END, iid=step.name, text=step.name, values=(
+                step.call_info.get("method", ""), ", ".join(step.depends_on), "", "", ""))
+
+    def show_step_result(self, result):
+        if not self.steps_tree.exists(result.name):
+            return
+        values = list(self.steps_tree.item(result.name, "values"))
+        values[2] = result.status
+        values[3] = f"{result.start * 1000:.0f}" if result.status != "skipped" else ""
+        values[4] = f"{result.duration * 1000:.0f}" if result.status not in ("running", "skipped") else ""
+        self.steps_tree.item(result.name, values=values)
+
+    def set_running(self, running):
+        self.run_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def set_summary(self, text):
+        self.summary_label.config(text=text)
+
+    def display_output(self, text):
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert(tk.END, text)
+
+
+class AutomationsPresenter:
+    """Mediates between the AutomationsView, the saved calls and the pipeline runner."""
+    def __init__(self, view: AutomationsView, saved_calls_manager, env_model: EnvironmentRepo, caller=None):
+        self.view = view
+        self.saved_calls_manager = saved_calls_manager
+        self.env_model = env_model
+        self.caller = caller or GrpcCaller()
+        self.steps = []
+        self.results = {}
+        self.next_step_number = 1
+        self.handle = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="automations")
+        self.updates = queue.Queue()
+
+        self.view.set_on_add_step(self.handle_add_step)
+        self.view.set_on_reload(self.handle_reload)
+        self.view.set_on_set_depends(self.handle_set_depends)
+        self.view.set_on_chain(self.handle_chain)
+        self.view.set_on_remove_step(self.handle_remove_step)
+        self.view.set_on_run(self.handle_run)
+        self.view.set_on_cancel(self.handle_cancel)
+        self.view.set_on_step_select(self.handle_step_select)
+
+        self.handle_reload()
+        self.refresh_environment_options(self.env_model.get_all_environment_names())
+
+    def refresh_environment_options(self, env_names):
+        self.view.set_environment_options(env_names)
+
+    def handle_reload(self):
+        self.view.update_saved_calls_list(self.saved_calls_manager.saved_calls, self.saved_calls_manager.get_display_text)
+
+    def handle_add_step(self):
+        saved_calls = self.saved_calls_manager.saved_calls
+        for index in self.view.get_selected_saved_calls():
+            self.steps.append(PipelineStep(f"step{self.next_step_number}", dict(saved_calls[index])))
+            self.next_step_number += 1
+        self.view.show_steps(self.steps)
+
+    def _find_step(self, name):
+        return next((step for step in self.steps if step.name == name), None)
+
+    def handle_set_depends(self):
+        step = self._find_step(self.view.get_selected_step())
+        if not step:
+            self.view.set_summary("Select a step first.")
+            return
+        depends_on = self.view.get_depends_on()
+        previous = step.depends_on
+        step.depends_on = depends_on
+        try:
+            order_steps(self.steps)
+        except ValueError as e:
+            step.depends_on = previous
+            self.view.set_summary(str(e))
+            return
+        self.view.show_steps(self.steps)
+
+    def handle_chain(self):
+        # Make every step wait for the one before it.
+        for previous, step in zip(self.steps, self.steps[1:]):
+            step.depends_on = [previous.name]
+        if self.steps:
+            self.steps[0].depends_on = []
+        self.view.show_steps(self.steps)
+
+    def handle_remove_step(self):
+        name = self.view.get_selected_step()
+        if not name:
+            return
+        self.steps = [step for step in self.steps if step.name != name]
+        for step in self.steps:
+            step.depends_on = [dep for dep in step.depends_on if dep != name]
+        self.view.show_steps(self.steps)
+
+    def handle_run(self):
+        if not self.steps or self.handle:
+            return
+        selected_env = self.view.get_selected_environment()
+        env_vars = self.env_model.get_resolved_environment(selected_env) if selected_env else {}
+        try:
+            workers = int(self.view.get_workers() or 1)
+            runner = PipelineRunner(self.caller, self.steps, env_vars, self.view.plaintext_var.get(),
+                                    max_workers=workers, on_step_update=self.updates.put)
+        except ValueError as e:
+            self.view.set_summary(str(e))
+            return
+
+        self.results = {}
+        self.view.show_steps(self.steps)
+        self.view.set_summary("Running...")
+        self.view.set_running(True)
+        self.handle = CallHandle()
+        self.handle.attach(runner)
+        self.executor.submit(self._run_pipeline, runner)
+        self.view.after(50, self._poll_updates)
+
+    def _run_pipeline(self, runner):
+        # Runs on a worker thread: never touch the view from here.
+        try:
+            self.updates.put(runner.run())
+        except Exception as e:
+            self.updates.put(e)
+
+    def _poll_updates(self):
+        finished = None
+        while True:
+            try:
+                update = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(update, StepResult):
+                self.results[update.name] = update
+                self.view.show_step_result(update)
+            else:
+                finished = update
+        if finished is None:
+            self.view.after(50, self._poll_updates)
+            return
+
+        self.handle = None
+        self.view.set_running(False)
+        if isinstance(finished, Exception):
+            self.view.set_summary(f"Error: {finished}")
+            return
+        failed = sum(1 for result in finished.results.values() if result.status != "ok")
+        self.view.set_summary(
+            f"{len(finished.results) - failed}/{len(finished.results)} steps succeeded in {finished.wall_time * 1000:.0f} ms. "
+            f"Critical path {finished.critical_path_time * 1000:.0f} ms: {' -> '.join(finished.critical_path)}"
+        )
+
+    def handle_cancel(self):
+        if self.handle:
+            self.handle.cancel()
+
+    def handle_step_select(self, name):
+        result = self.results.get(name)
+        if not result:
+            self.view.display_output("")
+            return
+        output = f"Executing command: {' '.join(result.command)}\n\n" if result.command else ""
+        output += f"Status: {result.status} (return code {result.return_code})\n"
+        if result.stdout.strip():
+            output += f"stdout:\n{result.stdout}\n"
+        if result.stderr.strip():
+            output += f"stderr:\n{result.stderr}\n"
+        self.view.display_output(output)
+
+    def shutdown(self):
+        self.handle_cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,120 @@
+import argparse
+import fnmatch
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from grpc_caller import GrpcCaller
+from saved_calls import CALL_DETAIL_KEYS, SavedGrpcManager
+from protoset_parser import ProtosetParser
+from environment_repo import resolve_call_details, EnvironmentRepo
+
+
+def select_calls(saved_calls, methods=None, indices=None):
+    """Return [(index, call_info)] for the calls matching any method pattern or index, or all calls if neither is given."""
+    selected = []
+    for index, call_info in enumerate(saved_calls):
+        if methods or indices:
+            method_matches = any(fnmatch.fnmatchcase(call_info.get("method", ""), pattern) for pattern in methods or ())
+            if not method_matches and index not in (indices or ()):
+                continue
+        selected.append((index, call_info))
+    return selected
+
+
+def run_call(caller, index, call_info, env_vars, plaintext, protoset_parser=None):
+    """
+    Substitute and execute one saved call. Returns the result record printed for it.
+    protoset_parser is needed to call methods of protoset workspaces.
+    """
+    details = {key: call_info.get(key, "") for key in CALL_DETAIL_KEYS}
+    details, body, unsubstituted = resolve_call_details(details, call_info.get("body", ""), env_vars)
+    record = {"index": index, "method": details["method"], "server": details["server"]}
+    if unsubstituted:
+        return {**record, "ok": False, "error": f"Unsubstituted environment variables in: {', '.join(unsubstituted)}"}
+    if not details["protoset"] or not details["server"] or not details["method"]:
+        return {**record, "ok": False, "error": "Missing required fields (Protoset, Server, or Call Name)."}
+    if protoset_parser:
+        protoset = protoset_parser.route_protoset(details["protoset"], details["method"])
+        if not protoset:
+            return {**record, "ok": False, "error": f"No protoset in {details['protoset']} defines {details['method']}."}
+        details["protoset"] = protoset
+
+    started = time.perf_counter()
+    return_code, stdout, stderr, command = caller.execute_call(
+        plaintext,
+        details["cookie"],
+        details["bearer_token"],
+        details["protoset"],
+        details["server"],
+        details["method"],
+        body
+    )
+    return {
+        **record,
+        "ok": return_code == 0,
+        "return_code": return_code,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "stdout": stdout,
+        "stderr": stderr
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run saved gRPC calls and print one JSON result per line.")
+    parser.add_argument("--calls", default="grpc_calls.json", help="saved calls file (default: grpc_calls.json)")
+    parser.add_argument("--environments", default="data/environments.json",
+                        help="environments file (default: data/environments.json)")
+    parser.add_argument("--env", help="environment whose variables are substituted into the calls")
+    parser.add_argument("--method", action="append", help="only run calls whose method matches this glob; repeatable")
+    parser.add_argument("--index", action="append", type=int, help="only run the saved call at this index; repeatable")
+    parser.add_argument("--plaintext", action="store_true", help="call the servers with -plaintext")
+    parser.add_argument("--workers", type=int, default=4, help="number of calls to run at once (default: 4)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.workers < 1:
+        print("--workers must be at least 1", file=sys.stderr)
+        return 2
+
+    # Read-only: the app may be running and owns compaction of the journal.
+    saved_calls = SavedGrpcManager(args.calls).read_saved_calls()
+    env_vars = {}
+    if args.env:
+        env_model = EnvironmentRepo(args.environments)
+        if args.env not in env_model.get_all_environment_names():
+            print(f"Unknown environment: {args.env}", file=sys.stderr)
+            return 2
+        env_vars = env_model.get_resolved_environment(args.env)
+
+    calls = select_calls(saved_calls, args.method, args.index)
+    if not calls:
+        print("No saved calls matched.", file=sys.stderr)
+        return 1
+
+    caller = GrpcCaller()
+    protoset_parser = ProtosetParser()
+    failures = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(run_call, caller, index, call_info, env_vars, args.plaintext, protoset_parser): (index, call_info)
+            for index, call_info in calls
+        }
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                index, call_info = futures[future]
+                record = {"index": index, "method": call_info.get("method", ""), "ok": False, "error": str(e)}
+            failures += not record["ok"]
+            print(json.dumps(record), flush=True)
+
+    print(f"{len(calls) - failures}/{len(calls)} calls succeeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+import json
+import tkinter as tk
+from abc import ABC, abstractmethod
+from tkinter import ttk
+
+# FieldDescriptorProto type and label numbers. They are spelled out here so building a
+# form doesn't need protobuf imported.
+_INT_TYPES = {3, 4, 5, 6, 7, 13, 15, 16, 17, 18}
+_FLOAT_TYPES = {1, 2}
+_TYPE_BOOL = 8
+_TYPE_MESSAGE = 11
+_TYPE_GROUP = 10
+LABEL_REPEATED = 3  # also used by fanout.py
+
+# Well-known types have their own JSON form (e.g. a Timestamp is a string), so they are
+# edited as one value instead of field by field.
+_WELL_KNOWN_PREFIX = "google.protobuf."
+
+
+def convert_value(field, text):
+    """Convert the text of an input widget to the JSON value for field. Unparseable text is sent as is."""
+    try:
+        if field.type in _INT_TYPES:
+            return int(text)
+        if field.type in _FLOAT_TYPES:
+            return float(text)
+    except ValueError:
+        return text
+    if field.type == _TYPE_BOOL:
+        return text.lower() == "true"
+    if field.type in (_TYPE_MESSAGE, _TYPE_GROUP):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return text
+    return text
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _is_message(field):
+    return field.type in (_TYPE_MESSAGE, _TYPE_GROUP) and not field.type_name.lstrip(".").startswith(_WELL_KNOWN_PREFIX)
+
+
+class _ScalarInput:
+    """A single Entry, or a Combobox for enums and bools."""
+    def __init__(self, parent, field, enum_values):
+        self.field = field
+        if enum_values or field.type == _TYPE_BOOL:
+            self.widget = ttk.Combobox(parent, values=enum_values or ["true", "false"], width=48, state="readonly")
+        else:
+            self.widget = ttk.Entry(parent, width=50)
+
+    def get_value(self):
+        text = self.widget.get().strip()
+        return convert_value(self.field, text) if text else None
+
+    def set_value(self, value):
+        text = "" if value is None else _format_value(value)
+        if isinstance(self.widget, ttk.Combobox):
+            self.widget.set(text)
+        else:
+            self.widget.delete(0, tk.END)
+            self.widget.insert(0, text)
+
+
+class _Section(ABC):
+    """
+    A collapsible part of the form. Its widgets are only built the first time it is
+    expanded. Until then get_value() and set_value() work on a plain pending value.
+    Subclasses build the widgets, and collect and apply the value through them.
+    """
+    def __init__(self, parent, title, form):
+        self.form = form
+        self.frame = ttk.Frame(parent)
+        self.title = title
+        self._expanded = False
+        self._built = False
+        self._pending = None
+        self.toggle_button = ttk.Button(self.frame, text=f"+ {title}", width=0, command=self.toggle)
+        self.toggle_button.pack(anchor=tk.W)
+        self.content = ttk.Frame(self.frame)
+
+    def toggle(self):
+        if not self._built:
+            self._built = True
+            self.build()
+            if self._pending is not None:
+                self.apply(self._pending)
+                self._pending = None
+        self._expanded = not self._expanded
+        if self._expanded:
+            self.content.pack(fill=tk.X, padx=(20, 0))
+        else:
+            self.content.pack_forget()
+        self.toggle_button.config(text=f"{'-' if self._expanded else '+'} {self.title}")
+
+    def get_value(self):
+        return self.collect() if self._built else self._pending
+
+    def set_value(self, value):
+        if self._built:
+            self.apply(value)
+        else:
+            self._pending = value
+
+    @abstractmethod
+    def build(self):
+        """Create the section's widgets in self.content."""
+
+    @abstractmethod
+    def collect(self):
+        """The value entered in the built widgets."""
+
+    @abstractmethod
+    def apply(self, value):
+        """Show value in the built widgets."""
+
+
+class _FieldList:
+    """The fields of one message, laid out as label/input rows, page_size fields at a time."""
+    def __init__(self, parent, fields_with_enums, form):
+        self.form = form
+        self.frame = ttk.Frame(parent)
+        self.fields = list(fields_with_enums)
+        self.inputs = {}   # field name -> _ScalarInput, _MessageSection or _RepeatedSection
+        self.pending = {}  # values for fields not shown yet
+        self._shown = 0
+        self.more_button = None
+        self.show_more()
+
+    def show_more(self):
+        if self.more_button:
+            self.more_button.destroy()
+            self.more_button = None
+        end = min(self._shown + self.form.page_size, len(self.fields))
+        for row in range(self._shown, end):
+            field, enum_values = self.fields[row]
+            self.inputs[field.name] = self._build_row(row, field, enum_values)
+            if field.name in self.pending:
+                self.inputs[field.name].set_value(self.pending.pop(field.name))
+        self._shown = end
+        if end < len(self.fields):
+            self.more_button = ttk.Button(self.frame, text=f"Show {len(self.fields) - end} more fields", command=self.show_more)
+            self.more_button.grid(row=end, column=0, columnspan=2, sticky=tk.W, pady=2)
+
+    def _build_row(self, row, field, enum_values):
+        if field.label == LABEL_REPEATED:
+            section = _RepeatedSection(self.frame, field, enum_values, self.form)
+            section.frame.grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=2)
+            return section
+        if _is_message(field):
+            section = _MessageSection(self.frame, field, self.form)
+            section.frame.grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=2)
+            return section
+        ttk.Label(self.frame, text=f"{field.name}:").grid(row=row, column=0, sticky=tk.W, padx=(0, 5), pady=2)
+        scalar = _ScalarInput(self.frame, field, enum_values)
+        scalar.widget.grid(row=row, column=1, sticky=tk.W, pady=2)
+        return scalar
+
+    def get_value(self):
+        body = {}
+        for name, field_input in self.inputs.items():
+            value = field_input.get_value()
+            if value not in (None, "", [], {}):
+                body[name] = value
+        for name, value in self.pending.items():
+            if value not in (None, "", [], {}):
+                body[name] = value
+        return body
+
+    def set_value(self, body):
+        # Fields missing from body are cleared.
+        for name, field_input in self.inputs.items():
+            field_input.set_value(body.get(name))
+        known = {field.name for field, _ in self.fields}
+        self.pending = {name: value for name, value in body.items() if name in known and name not in self.inputs}
+
+
+class _MessageSection(_Section):
+    """A nested message field."""
+    def __init__(self, parent, field, form):
+        super().__init__(parent, f"{field.name} ({field.type_name.lstrip('.').rsplit('.', 1)[-1]})", form)
+        self.field = field
+        self.fields = None
+
+    def build(self):
+        self.fields = _FieldList(self.content, self.form.get_message_fields(self.field.type_name), self.form)
+        self.fields.frame.pack(fill=tk.X)
+
+    def collect(self):
+        return self.fields.get_value()
+
+    def apply(self, value):
+        self.fields.set_value(value if isinstance(value, dict) else {})
+
+
+class _RepeatedSection(_Section):
+    """
+    A repeated field as a list of items with Add and Remove buttons. Map fields are
+    shown as a list of key/value items and sent as a JSON object. Only page_size
+    items are built at a time; the rest are kept as values until "Show more".
+    """
+    def __init__(self, parent, field, enum_values, form):
+        super().__init__(parent, f"{field.name} [...]", form)
+        self.field = field
+        self.enum_values = enum_values
+        self.items = []          # [(row frame, item input)] in order
+        self.hidden_values = []  # items after the shown ones, not built yet
+        self.is_map = False
+
+    def build(self):
+        if _is_message(self.field):
+            # protoc generates a nested FooEntry message with key and value for each map field.
+            names = [entry_field.name for entry_field, _ in self.form.get_message_fields(self.field.type_name)]
+            self.is_map = self.field.type_name.endswith("Entry") and names == ["key", "value"]
+        self.items_frame = ttk.Frame(self.content)
+        self.items_frame.pack(fill=tk.X)
+        self.more_button = ttk.Button(self.content, command=self.show_more_items)
+        ttk.Button(self.content, text="Add", command=self.add_item).pack(side=tk.BOTTOM, anchor=tk.W, pady=2)
+
+    def show_more_items(self):
+        shown, self.hidden_values = self.hidden_values[:self.form.page_size], self.hidden_values[self.form.page_size:]
+        for value in shown:
+            self.add_item(value)
+        self._update_more_button()
+
+    def _update_more_button(self):
+        if self.hidden_values:
+            self.more_button.config(text=f"Show {len(self.hidden_values)} more items")
+            self.more_button.pack(anchor=tk.W, pady=2)
+        else:
+            self.more_button.pack_forget()
+
+    def add_item(self, value=None):
+        row = ttk.Frame(self.items_frame)
+        row.pack(fill=tk.X, pady=1)
+        if _is_message(self.field):
+            item = _MessageSection(row, self.field, self.form)
+            item.title = f"[{len(self.items)}] {item.title}"
+            item.toggle_button.config(text=f"+ {item.title}")
+            item.frame.pack(side=tk.LEFT, anchor=tk.N)
+        else:
+            item = _ScalarInput(row, self.field, self.enum_values)
+            item.widget.pack(side=tk.LEFT)
+        remove = ttk.Label(row, text="x", foreground="red", cursor="hand2")
+        remove.pack(side=tk.LEFT, anchor=tk.N, padx=(5, 0))
+        entry = (row, item)
+        remove.bind("<Button-1>", lambda e: self.remove_item(entry))
+        self.items.append(entry)
+        if value is not None:
+            item.set_value(value)
+
+    def remove_item(self, entry):
+        self.items.remove(entry)
+        entry[0].destroy()
+
+    def collect(self):
+        values = [item.get_value() for _, item in self.items] + self.hidden_values
+        values = [value for value in values if value not in (None, "", {})]
+        if self.is_map:
+            return {value.get("key"): value.get("value") for value in values if isinstance(value, dict) and "key" in value}
+        return values
+
+    def apply(self, value):
+        for row, _ in self.items:
+            row.destroy()
+        self.items = []
+        if self.is_map and isinstance(value, dict):
+            value = [{"key": key, "value": item} for key, item in value.items()]
+        self.hidden_values = list(value) if isinstance(value, list) else []
+        self.show_more_items()
+
+
+class BodyForm(ttk.Frame):
+    """
+    Request body form built from a method's input message fields.
+
+    Nested messages are collapsible sections, and repeated fields are lists with Add
+    and Remove buttons. Sections are only built when first expanded, using
+    get_message_fields(type_name) to look up a nested message's fields, and at most
+    page_size fields of a message are shown until "Show more" is clicked. So however
+    large the schema is, the number of widgets stays small.
+    """
+    def __init__(self, parent, fields_with_enums, get_message_fields, page_size=50):
+        super().__init__(parent)
+        self.get_message_fields = get_message_fields
+        self.page_size = page_size
+        self.fields = _FieldList(self, fields_with_enums, self)
+        self.fields.frame.pack(fill=tk.X)
+
+    def get_body(self):
+        """The entered values as a dict ready for json.dumps, leaving out empty fields."""
+        return self.fields.get_value()
+
+    def set_body(self, body):
+        self.fields.set_value(body or {})
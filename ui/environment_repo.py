@@ -0,0 +1,273 @@
+import functools
+import json
+import os
+import re
+
+
+class EnvironmentRepo:
+    """
+    Environments stored in a single JSON file.
+
+    Writes go to a temporary file that is renamed over the original, so a crash never
+    leaves a half-written file. Each environment's JSON is cached and only environments
+    changed since the last write are re-serialized. check_for_changes() picks up edits
+    made by another app instance or a text editor, using the file's mtime and size, and
+    reloads only the environments that actually changed.
+    """
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.data = {}
+        self._resolved = {}  # env name -> variables with nested references expanded
+        self._fragments = {}  # env name -> serialized JSON for that environment
+        self._dirty = set()  # env names changed in memory but not yet written
+        self._file_stamp = None  # (mtime_ns, size) of the file as last read or written
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.filename):
+            with open(self.filename, "r") as f:
+                try:
+                    self.data = json.load(f)
+                except json.JSONDecodeError:
+                    self.data = {}
+        else:
+            self.data = {}
+        self._resolved = {}
+        self._fragments = {}
+        self._dirty = set()
+        self._file_stamp = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def check_for_changes(self):
+        """
+        Reload environments changed on disk since the last load or write.
+        Returns the names of the environments that were added, changed or removed.
+        """
+        stamp = self._stat()
+        if stamp == self._file_stamp:
+            return []
+        if stamp is None:
+            on_disk = {}
+        else:
+            try:
+                with open(self.filename, "r") as f:
+                    on_disk = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                return []  # probably caught mid-write; try again on the next check
+            if not isinstance(on_disk, dict):
+                return []
+        self._file_stamp = stamp
+
+        changed = []
+        for env_name in set(self.data) | set(on_disk):
+            if env_name in self._dirty:
+                continue  # unsaved local edits win
+            if self.data.get(env_name) != on_disk.get(env_name):
+                changed.append(env_name)
+                if env_name in on_disk:
+                    self.data[env_name] = on_disk[env_name]
+                else:
+                    del self.data[env_name]
+                self._resolved.pop(env_name, None)
+                self._fragments.pop(env_name, None)
+        return changed
+
+    def _write(self):
+        # Merge in anything written by someone else first so we don't overwrite it.
+        self.check_for_changes()
+        for env_name in self._dirty:
+            self._fragments.pop(env_name, None)
+        parts = []
+        for env_name, variables in self.data.items():
+            fragment = self._fragments.get(env_name)
+            if fragment is None:
+                # Same layout json.dump(self.data, indent=4) would produce.
+                fragment = json.dumps(env_name) + ": " + json.dumps(variables, indent=4).replace("\n", "\n    ")
+                self._fragments[env_name] = fragment
+            parts.append("    " + fragment)
+        text = "{\n" + ",\n".join(parts) + "\n}" if parts else "{}"
+
+        temp_file = self.filename + ".tmp"
+        with open(temp_file, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.filename)
+        self._file_stamp = self._stat()
+        self._dirty = set()
+
+    def save_environment(self, env_name, variables):
+        # Save (or update) the environment in the model.
+        self.data[env_name] = variables
+        self._resolved.pop(env_name, None)
+        self._dirty.add(env_name)
+        self._write()
+
+    def delete_environment(self, env_name):
+        # Remove the entire environment entry from the JSON if it exists.
+        if env_name in self.data:
+            del self.data[env_name]
+            self._resolved.pop(env_name, None)
+            self._fragments.pop(env_name, None)
+            self._dirty.add(env_name)
+            self._write()
+
+    def get_environment(self, env_name):
+        return self.data.get(env_name, {})
+
+    def get_resolved_environment(self, env_name):
+        # Cached until the environment is saved, deleted or reloaded.
+        resolved = self._resolved.get(env_name)
+        if resolved is None:
+            resolved = resolve_nested_variables(self.get_environment(env_name))
+            self._resolved[env_name] = resolved
+        return resolved
+
+    def get_all_environment_names(self):
+        return list(self.data.keys())
+
+
+_VARIABLE_PATTERN = re.compile(r"{{\s*(\w+)\s*}}")
+
+
+class CompiledTemplate:
+    """
+    A string split once into literal segments and {{variable}} references, so it can
+    be rendered many times without re-running the regex.
+    """
+    __slots__ = ("segments", "variables", "malformed")
+
+    def __init__(self, text: str):
+        # Segments alternate literal text and (name, original reference) tuples.
+        self.segments = []
+        position = 0
+        for match in _VARIABLE_PATTERN.finditer(text):
+            if match.start() > position:
+                self.segments.append(text[position:match.start()])
+            self.segments.append((match.group(1), match.group(0)))
+            position = match.end()
+        if position < len(text):
+            self.segments.append(text[position:])
+        self.variables = frozenset(segment[0] for segment in self.segments if isinstance(segment, tuple))
+        # Braces left in the literal text are references that can never be substituted.
+        self.malformed = any(
+            isinstance(segment, str) and ("{{" in segment or "}}" in segment) for segment in self.segments
+        )
+
+    def render(self, env_vars: dict):
+        """
+        Return (text, complete): the substituted text, and whether every reference was
+        defined and no braces are left in the result.
+        """
+        parts = []
+        complete = not self.malformed
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            value = env_vars.get(segment[0])
+            if value is None:
+                parts.append(segment[1])
+                complete = False
+            else:
+                parts.append(value)
+                if "{{" in value or "}}" in value:
+                    complete = False
+        return "".join(parts), complete
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_template(text: str) -> CompiledTemplate:
+    return CompiledTemplate(text)
+
+
+class CallTemplate:
+    """The compiled templates of every field of a call, with the variables they use known up front."""
+    def __init__(self, details: tuple, body: str):
+        self.fields = [(key, compile_template(value)) for key, value in details]
+        self.body = compile_template(body) if body else None
+        self.variables = frozenset().union(
+            *(template.variables for _, template in self.fields),
+            self.body.variables if self.body else frozenset()
+        )
+
+    def render(self, env_vars: dict):
+        """Substitute every field in a single pass. Returns (details, body, unsubstituted fields)."""
+        details = {}
+        unsubstituted = []
+        for key, template in self.fields:
+            details[key], complete = template.render(env_vars)
+            if not complete:
+                unsubstituted.append(key)
+        body = ""
+        if self.body:
+            body, complete = self.body.render(env_vars)
+            if not complete:
+                unsubstituted.append("body")
+        return details, body, unsubstituted
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_call(details: tuple, body: str) -> CallTemplate:
+    """Compile a call's (key, value) detail pairs and body once; repeat runs reuse the result."""
+    return CallTemplate(details, body)
+
+
+def substitute_env_vars(text: str, env_vars: dict):
+    """
+    Substitute bracketed variable references in the form {{variable}}
+    using the provided env_vars dictionary.
+
+    :param text: The input string that may contain bracketed variables.
+    :param env_vars: A dictionary mapping variable names to values.
+    :return: The string with all substitutions applied.
+    """
+    if not text:
+        return text
+    return compile_template(text).render(env_vars)[0]
+
+
+def resolve_nested_variables(env_vars: dict):
+    """
+    Expand variables whose values refer to other variables, e.g. url = "{{host}}:{{port}}".
+    References to undefined variables, and cycles, are left as they are.
+
+    :param env_vars: A dictionary mapping variable names to values.
+    :return: A new dictionary with every resolvable reference expanded.
+    """
+    resolved = {}
+
+    def resolve(name, resolving):
+        if name in resolved:
+            return resolved[name]
+        template = compile_template(env_vars[name])
+        values = {}
+        for variable in template.variables:
+            if variable in env_vars and variable not in resolving:
+                values[variable] = resolve(variable, resolving | {variable})
+        value = template.render(values)[0]
+        resolved[name] = value
+        return value
+
+    for name in env_vars:
+        resolve(name, frozenset([name]))
+    return resolved
+
+
+def resolve_call_details(details: dict, body: str, env_vars: dict):
+    """
+    Substitute environment variables into every call detail and the body.
+
+    :param details: Mapping of call field names to their (possibly templated) values.
+    :param body: The JSON request body, or an empty string.
+    :param env_vars: A dictionary mapping variable names to values.
+    :return: (details, body, unsubstituted) where unsubstituted lists the fields that
+             still contain {{ or }} after substitution.
+    """
+    return compile_call(tuple(details.items()), body or "").render(env_vars)
@@ -1,8 +1,6 @@
-import json
-import os
 import tkinter as tk
-import re
 from tkinter import ttk
+from environment_repo import EnvironmentRepo
 
 # View: Displays the UI and exposes methods for data access and update.
 class EnvironVarView(ttk.Frame):
@@ -183,52 +181,26 @@ class EnvironVarView(ttk.Frame):
         # Clear after 5 seconds
         self.status_label.after(5000, lambda: self.status_label.config(text=""))
 
-# Model: Handles JSON file operations.
-class EnvironmentRepo:
-    def __init__(self, filename: str):
-        self.filename = filename
-        self.data = {}
-        self.load()
-
-    def load(self):
-        if os.path.exists(self.filename):
-            with open(self.filename, "r") as f:
-                try:
-                    self.data = json.load(f)
-                except json.JSONDecodeError:
-                    self.data = {}
-        else:
-            self.data = {}
-
-    def save_environment(self, env_name, variables):
-        # Save (or update) the environment in the model.
-        self.data[env_name] = variables
-        with open(self.filename, "w") as f:
-            json.dump(self.data, f, indent=4)
-
-    def delete_environment(self, env_name):
-        # Remove the entire environment entry from the JSON if it exists.
-        if env_name in self.data:
-            del self.data[env_name]
-            with open(self.filename, "w") as f:
-                json.dump(self.data, f, indent=4)
-
-    def get_environment(self, env_name):
-        return self.data.get(env_name, {})
-
-    def get_all_environment_names(self):
-        return list(self.data.keys())
-
 # Presenter: Mediates between the View and Model.
 class EnvironmentPresenter:
-    def __init__(self, view: EnvironVarView, model: EnvironmentRepo, on_change_callback=None):
+    def __init__(self, view: EnvironVarView, model: EnvironmentRepo, on_change_callback=None, poll_interval_ms=2000):
         self.view = view
         self.model = model
         self.on_change_callback = on_change_callback
+        self.poll_interval_ms = poll_interval_ms
         self.view.set_presenter(self)
         self.view.set_save_callback(self.on_save)
         self.view.set_edit_callback(self.on_edit)
         self.update_environment_list()
+        # Pick up edits made to the environments file outside this window.
+        self.view.after(self.poll_interval_ms, self.check_for_external_changes)
+
+    def check_for_external_changes(self):
+        changed = self.model.check_for_changes()
+        if changed:
+            self.update_environment_list()
+            self.view.set_status(f"Reloaded from disk: {', '.join(sorted(changed))}")
+        self.view.after(self.poll_interval_ms, self.check_for_external_changes)
 
     def update_environment_list(self):
         env_names = self.model.get_all_environment_names()
@@ -281,24 +253,6 @@ class _MockParent(tk.Tk):
         self.model = EnvironmentRepo(filename="data/environments.json")
         self.presenter = EnvironmentPresenter(self.environment_view, self.model)
 
-def substitute_env_vars(text: str, env_vars: dict):
-    """
-    Substitute bracketed variable references in the form {{variable}}
-    using the provided env_vars dictionary.
-
-    :param text: The input string that may contain bracketed variables.
-    :param env_vars: A dictionary mapping variable names to values.
-    :return: The string with all substitutions applied.
-    """
-    if not text:
-        return text
-    pattern = re.compile(r"{{\s*(\w+)\s*}}")
-    def replace(match: str):
-        var_name = match.group(1)
-        return env_vars.get(var_name, match.group(0))
-    return pattern.sub(replace, text)
-
-
 if __name__ == "__main__":
     mock_parent = _MockParent()
     mock_parent.mainloop()
@@ -0,0 +1,384 @@
+import csv
+import json
+import os
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog
+from body_form import LABEL_REPEATED, convert_value
+from grpc_caller import CancellableRun
+
+
+def read_rows(path):
+    """
+    Yield (row number, row) for each row of a CSV file with a header line, or of a JSONL
+    file (.jsonl, .ndjson), reading one row at a time. CSV rows are dicts of strings.
+    JSONL rows are the raw lines, parsed later by row_to_body() so a bad line only
+    fails its own row.
+    """
+    # utf-8-sig skips the byte order mark Excel and some editors write.
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, "r", encoding="utf-8-sig") as f:
+            row_number = 0
+            for line in f:
+                if line.strip():
+                    yield row_number, line
+                    row_number += 1
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row_number, row in enumerate(csv.DictReader(f)):
+                yield row_number, row
+
+
+def _resolve_column(path, fields_with_enums, get_message_fields):
+    """The field a (possibly dotted) column names, or None if the method has no such field."""
+    fields = fields_with_enums
+    for depth, name in enumerate(path):
+        field = next((field for field, _ in fields if field.name == name), None)
+        if field is None or depth == len(path) - 1:
+            return field
+        if field.label == LABEL_REPEATED or not field.type_name:
+            return None  # only singular message fields can be filled column by column
+        fields = get_message_fields(field.type_name)
+    return None
+
+
+def row_to_body(row, fields_with_enums, get_message_fields=None):
+    """
+    Map a row onto the request body. Columns named after the method's top-level fields
+    are used, and dotted columns (e.g. address.city) fill nested messages, whose fields
+    get_message_fields(type_name) looks up. Empty cells and other columns are ignored.
+    Text is converted to the field's JSON type, and repeated fields take a JSON array.
+    Raises ValueError for a row that can't be mapped.
+    """
+    if isinstance(row, str):
+        row = json.loads(row)
+        if not isinstance(row, dict):
+            raise ValueError("A JSONL row must be a JSON object.")
+    get_message_fields = get_message_fields or (lambda type_name: [])
+    body = {}
+    for column, value in row.items():
+        if column is None or value is None or value == "":
+            continue
+        path = column.strip().split(".")
+        field = _resolve_column(path, fields_with_enums, get_message_fields)
+        if field is None:
+            continue
+        if isinstance(value, str):
+            if field.label == LABEL_REPEATED:
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    value = [value]
+            else:
+                value = convert_value(field, value)
+        target = body
+        for depth, key in enumerate(path[:-1]):
+            target = target.setdefault(key, {})
+            if not isinstance(target, dict):
+                raise ValueError(f"Column {column} conflicts with column {'.'.join(path[:depth + 1])}.")
+        if isinstance(target.get(path[-1]), dict) and not isinstance(value, dict):
+            raise ValueError(f"Column {column} conflicts with the columns under it.")
+        target[path[-1]] = value
+    return body
+
+
+class RateLimiter:
+    """Token bucket that lets through rate calls per second on average, in bursts of at most burst."""
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, should_stop=None):
+        """Wait for a token. Returns False if should_stop() became true while waiting."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            # Wake up at least every 100 ms so cancellation isn't held up.
+            time.sleep(min(wait, 0.1))
+            if should_stop and should_stop():
+                return False
+
+
+class FanOutRunner(CancellableRun):
+    """
+    Calls one method once per row of a CSV or JSONL file, with at most `workers` calls
+    in flight and, if rate is set, at most rate calls per second.
+
+    Rows are read as they are needed and each result is appended to output_path as one
+    JSON line as soon as it arrives, so memory stays flat however large the input is.
+    A checkpoint next to the output records the row number below which every row is
+    done. With resume, rows below it and rows recorded in the output after it are
+    skipped, so an interrupted run carries on where it stopped. Cancelled calls are
+    not recorded and run again on resume.
+
+    The runner can be attached to a CallHandle: cancelling the handle stops new calls
+    and kills the ones in flight.
+    """
+    def __init__(self, caller, call_args, fields_with_enums, input_path, output_path,
+                 workers=4, rate=None, resume=True, checkpoint_every=100, get_message_fields=None):
+        if not input_path or not output_path:
+            raise ValueError("A fan-out needs an input file and an output file.")
+        if os.path.abspath(input_path) == os.path.abspath(output_path):
+            raise ValueError("The output file must be different from the input file.")
+        if rate is not None and rate <= 0:
+            raise ValueError("The rate must be more than 0 calls per second.")
+        super().__init__()
+        self.caller = caller
+        self.call_args = call_args  # (plaintext, cookie, bearer_token, protoset, server, method)
+        self.fields_with_enums = fields_with_enums
+        self.get_message_fields = get_message_fields
+        self.input_path = input_path
+        self.output_path = output_path
+        self.checkpoint_path = output_path + ".checkpoint"
+        self.workers = max(1, workers)
+        self.rate_limiter = RateLimiter(rate) if rate else None
+        self.resume = resume
+        self.checkpoint_every = checkpoint_every
+        self._checkpoint_lock = threading.Lock()
+        self._rows = None
+        self._output = None
+        self._watermark = 0     # every row below this is done
+        self._completed = set()  # done rows at or above the watermark
+        self._since_checkpoint = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self._started = 0.0
+        if resume:
+            self._check_checkpoint_input()
+
+    def _check_checkpoint_input(self):
+        """Refuse to resume from a checkpoint written for a different input file."""
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                checkpoint_input = json.load(f).get("input")
+        except (OSError, json.JSONDecodeError, AttributeError):
+            return
+        if checkpoint_input and checkpoint_input != os.path.abspath(self.input_path):
+            raise ValueError(
+                f"{self.output_path} holds results for {checkpoint_input}. "
+                "Choose another output file, or untick Resume to start over."
+            )
+
+    def run(self):
+        """Process every row and return a one-line summary."""
+        self._started = time.perf_counter()
+        if self.resume:
+            self._load_progress()
+        else:
+            for path in (self.output_path, self.checkpoint_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        self._rows = read_rows(self.input_path)
+        try:
+            with open(self.output_path, "a", encoding="utf-8") as self._output:
+                threads = [threading.Thread(target=self._worker, name=f"fan-out-{i}") for i in range(self.workers)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            self._rows.close()
+            self._write_checkpoint()
+            self._done = True
+        return self.format_progress()
+
+    def _load_progress(self):
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, "r") as f:
+                    self._watermark = int(json.load(f).get("watermark", 0))
+            except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
+                self._watermark = 0
+        if os.path.exists(self.output_path):
+            with open(self.output_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row_number = json.loads(line)["row"]
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue  # e.g. a line cut short when the last run was killed
+                    if row_number >= self._watermark:
+                        self._completed.add(row_number)
+        self._advance_watermark()
+
+    def _advance_watermark(self):
+        while self._watermark in self._completed:
+            self._completed.discard(self._watermark)
+            self._watermark += 1
+
+    def _write_checkpoint(self):
+        # Workers can finish a checkpoint's worth of rows at the same time. One write at a
+        # time keeps them off each other's temporary file and the watermark from going back.
+        with self._checkpoint_lock:
+            with self._lock:
+                checkpoint = {"input": os.path.abspath(self.input_path), "watermark": self._watermark}
+                self._since_checkpoint = 0
+            temp_file = self.checkpoint_path + ".tmp"
+            with open(temp_file, "w") as f:
+                json.dump(checkpoint, f)
+            os.replace(temp_file, self.checkpoint_path)
+
+    def _next_row(self):
+        with self._lock:
+            while not self._cancelled:
+                try:
+                    row_number, row = next(self._rows)
+                except StopIteration:
+                    return None
+                if row_number < self._watermark or row_number in self._completed:
+                    self.skipped += 1
+                    continue
+                return row_number, row, self._add_handle()
+            return None
+
+    def _worker(self):
+        while True:
+            if self.rate_limiter and not self.rate_limiter.acquire(lambda: self._cancelled):
+                return
+            job = self._next_row()
+            if job is None:
+                return
+            row_number, row, handle = job
+            try:
+                record = self._call(row_number, row, handle)
+            except Exception as e:
+                # A failing row must not take the worker down with it.
+                record = {"row": row_number, "ok": False, "error": f"{type(e).__name__}: {e}"}
+            with self._lock:
+                self._remove_handle(handle)
+                if handle.cancelled:
+                    continue
+                self._output.write(json.dumps(record) + "\n")
+                self._output.flush()
+                if record["ok"]:
+                    self.succeeded += 1
+                else:
+                    self.failed += 1
+                self._completed.add(row_number)
+                self._advance_watermark()
+                self._since_checkpoint += 1
+                checkpoint_due = self._since_checkpoint >= self.checkpoint_every
+            if checkpoint_due:
+                self._write_checkpoint()
+
+    def _call(self, row_number, row, handle):
+        try:
+            body = row_to_body(row, self.fields_with_enums, self.get_message_fields)
+        except Exception as e:
+            return {"row": row_number, "ok": False, "error": f"Invalid row: {e}"}
+        body_text = json.dumps(body) if body else ""
+        started = time.perf_counter()
+        return_code, stdout, stderr, _ = self.caller.execute_call(*self.call_args, body_text, handle=handle)
+        return {
+            "row": row_number,
+            "ok": return_code == 0,
+            "return_code": return_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "body": body,
+            "stdout": stdout,
+            "stderr": stderr
+        }
+
+    def format_progress(self):
+        with self._lock:
+            done = self.succeeded + self.failed
+            failed, skipped = self.failed, self.skipped
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        text = f"{done} rows called ({failed} failed)"
+        if skipped:
+            text += f", {skipped} already done"
+        if elapsed:
+            text += f" in {elapsed:.1f}s ({done / elapsed:.1f} rows/s)"
+        return text
+
+
+class FanOutDialog(tk.Toplevel):
+    """Settings and progress for calling the selected method once per row of a file."""
+    def __init__(self, parent, title):
+        super().__init__(parent)
+        self.title("Fan Out")
+        self.input_var = tk.StringVar()
+        self.output_var = tk.StringVar()
+        self.workers_var = tk.StringVar(value="4")
+        self.rate_var = tk.StringVar()
+        self.resume_var = tk.BooleanVar(value=True)
+
+        frame = ttk.Frame(self, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(frame, text=title).grid(row=0, column=0, columnspan=3, sticky=tk.W, pady=(0, 8))
+        ttk.Label(frame, text="Input (CSV or JSONL):").grid(row=1, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=self.input_var, width=50).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        ttk.Button(frame, text="Browse...", command=self._browse_input).grid(row=1, column=2, sticky=tk.W)
+        ttk.Label(frame, text="Output (JSONL):").grid(row=2, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=self.output_var, width=50).grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
+        ttk.Button(frame, text="Browse...", command=self._browse_output).grid(row=2, column=2, sticky=tk.W)
+        ttk.Label(frame, text="Concurrency:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=self.workers_var, width=8).grid(row=3, column=1, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(frame, text="Max calls per second:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=self.rate_var, width=8).grid(row=4, column=1, sticky=tk.W, padx=5, pady=2)
+        ttk.Checkbutton(frame, text="Resume from the last completed row", variable=self.resume_var).grid(
+            row=5, column=1, sticky=tk.W, pady=2)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=(8, 0))
+        self.start_button = ttk.Button(button_frame, text="Start")
+        self.start_button.pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.progress_label = ttk.Label(frame, text="Columns are matched to the request's field names.")
+        self.progress_label.grid(row=7, column=0, columnspan=3, sticky=tk.W, pady=(8, 0))
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _browse_input(self):
+        path = filedialog.askopenfilename(parent=self, filetypes=[("CSV or JSONL", "*.csv *.jsonl *.ndjson"), ("All files", "*")])
+        if path:
+            self.input_var.set(path)
+            if not self.output_var.get():
+                self.output_var.set(os.path.splitext(path)[0] + ".results.jsonl")
+
+    def _browse_output(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".jsonl", confirmoverwrite=False)
+        if path:
+            self.output_var.set(path)
+
+    def set_on_start(self, handler):
+        self.start_button.config(command=handler)
+
+    def set_on_cancel(self, handler):
+        self._external_cancel = handler
+        self.cancel_button.config(command=handler)
+
+    def _on_close(self):
+        # Closing the dialog stops a run in progress.
+        if self.cancel_button.instate(["!disabled"]) and hasattr(self, "_external_cancel"):
+            self._external_cancel()
+        self.destroy()
+
+    def get_settings(self):
+        return {
+            "input": self.input_var.get().strip(),
+            "output": self.output_var.get().strip(),
+            "workers": self.workers_var.get().strip(),
+            "rate": self.rate_var.get().strip(),
+            "resume": self.resume_var.get()
+        }
+
+    def set_running(self, running):
+        if self.winfo_exists():
+            self.start_button.config(state=tk.DISABLED if running else tk.NORMAL)
+            self.cancel_button.config(state=tk.NORMAL if running else tk.DISABLED)
+
+    def set_progress(self, text):
+        if self.winfo_exists():
+            self.progress_label.config(text=text)
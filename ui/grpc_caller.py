@@ -0,0 +1,149 @@
+import subprocess
+import threading
+import time
+
+
+class CallHandle:
+    """
+    Tracks the grpcurl child process of an in-flight call so it can be cancelled
+    from another thread. Cancelling before the process starts stops it from starting.
+    """
+    def __init__(self):
+        self.process = None
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def attach(self, process):
+        with self._lock:
+            self.process = process
+            if self.cancelled:
+                process.kill()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self.process and self.process.poll() is None:
+                self.process.kill()
+
+
+class CancellableRun:
+    """
+    Base for runners that make many calls at once, such as a load test. A runner can be
+    attached to a CallHandle in place of a process: poll() reports whether run() has
+    finished and kill() stops new calls and cancels the ones in flight.
+
+    Subclasses hold self._lock while they start and finish calls, get each call's
+    handle from _add_handle(), pass it to _remove_handle() once the call returns, and
+    set self._done at the end of run().
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handles = set()
+        self._cancelled = False
+        self._done = False
+
+    def _add_handle(self):
+        # Called with self._lock held. A call started after kill() is cancelled straight away.
+        handle = CallHandle()
+        if self._cancelled:
+            handle.cancel()
+        self._handles.add(handle)
+        return handle
+
+    def _remove_handle(self, handle):
+        # Called with self._lock held.
+        self._handles.discard(handle)
+
+    def poll(self):
+        return 0 if self._done else None
+
+    def kill(self):
+        with self._lock:
+            self._cancelled = True
+            handles = list(self._handles)
+        for handle in handles:
+            handle.cancel()
+
+
+class GrpcCaller:
+    """Handles construction and execution of the grpcurl command."""
+    def build_command(self, plaintext, cookie, bearer_token, protoset, server, method, body):
+        command = ["grpcurl"]
+        if plaintext:
+            command.append("-plaintext")
+        if cookie:
+            command.extend(["-H", f"Cookie:s={cookie}"])
+        elif bearer_token:
+            command.extend(["-H", f"authorization: Bearer {bearer_token}"])
+        command.extend(["--protoset", protoset])
+        if body:
+            command.extend(["-d", body])
+        command.append(server)
+        command.append(method)
+        return command
+
+    def execute_call(self, plaintext, cookie, bearer_token, protoset, server, call_name, body, handle: CallHandle = None, timer=None):
+        """
+        Run grpcurl and return (return code, stdout, stderr, command). If a PhaseTimer is
+        given, the time to spawn grpcurl and the time it then ran are recorded in it.
+        """
+        command = self.build_command(plaintext, cookie, bearer_token, protoset, server, call_name, body)
+        if handle and handle.cancelled:
+            return None, "", "Call cancelled.", command
+        try:
+            started = time.perf_counter()
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            spawned = time.perf_counter()
+            if timer:
+                timer.add("spawn grpcurl", spawned - started)
+            if handle:
+                handle.attach(process)
+            stdout, stderr = process.communicate()
+            if timer:
+                # grpcurl loads the protoset, connects and runs the RPC in this time.
+                timer.add("grpcurl (protoset, connect, RPC)", time.perf_counter() - spawned)
+            return process.returncode, stdout, stderr, command
+        except Exception as e:
+            return None, "", f"Error while running grpcurl: {e}", command
+
+    def stream_call(self, plaintext, cookie, bearer_token, protoset, server, call_name, body, on_message, handle: CallHandle = None):
+        """
+        Run a call and hand each response message to on_message(text) as soon as grpcurl
+        prints it, instead of buffering the whole stream. grpcurl prints every message as
+        an indented JSON object whose closing brace is the only character on its line.
+        Returns (return code, stderr, command).
+        """
+        command = self.build_command(plaintext, cookie, bearer_token, protoset, server, call_name, body)
+        if handle and handle.cancelled:
+            return None, "Call cancelled.", command
+        try:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            if handle:
+                handle.attach(process)
+            # Drain stderr on its own thread so a chatty stderr can't block stdout.
+            stderr_chunks = []
+            stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+            stderr_reader.start()
+            lines = []
+            for line in process.stdout:
+                lines.append(line)
+                if line.rstrip("\r\n") == "}":
+                    on_message("".join(lines))
+                    lines = []
+            if any(line.strip() for line in lines):
+                on_message("".join(lines))
+            process.wait()
+            stderr_reader.join()
+            return process.returncode, "".join(stderr_chunks), command
+        except Exception as e:
+            return None, f"Error while running grpcurl: {e}", command
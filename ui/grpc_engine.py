@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from google.protobuf import json_format
+
+try:
+    import grpc
+except ImportError:  # grpcio is only needed for the in-process engine
+    grpc = None
+
+from grpc_caller import CallHandle
+
+# grpcurl exits with 64 + the gRPC status code when the RPC itself fails.
+GRPCURL_STATUS_EXIT_BASE = 64
+
+
+class ChannelPool:
+    """Caches one gRPC channel per (server, plaintext, auth) so connections and TLS sessions are reused."""
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def get(self, server, plaintext, auth=()):
+        key = (server, plaintext, auth)
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                if plaintext:
+                    channel = grpc.insecure_channel(server)
+                else:
+                    channel = grpc.secure_channel(server, grpc.ssl_channel_credentials())
+                self._channels[key] = channel
+            return channel
+
+    def close_all(self):
+        with self._lock:
+            for channel in self._channels.values():
+                channel.close()
+            self._channels.clear()
+
+
+class _RpcProcess:
+    """Lets a CallHandle cancel an in-flight RPC the same way it kills a grpcurl process."""
+    def __init__(self, rpc):
+        self.rpc = rpc
+
+    def poll(self):
+        return 0 if self.rpc.done() else None
+
+    def kill(self):
+        self.rpc.cancel()
+
+
+class InProcessGrpcCaller:
+    """
+    Drop-in alternative to GrpcCaller that invokes methods directly over pooled gRPC
+    channels instead of spawning grpcurl. Request and response messages are built from
+    the descriptor set already loaded by the ProtosetParser. Return values mirror
+    GrpcCaller, including grpcurl's exit codes and error format, so callers can't tell
+    the two apart.
+    """
+    def __init__(self, protoset_parser, channel_pool: ChannelPool = None, timeout=None):
+        if grpc is None:
+            raise RuntimeError("The in-process engine requires the grpcio package (pip3 install grpcio).")
+        self.protoset_parser = protoset_parser
+        self.channel_pool = channel_pool or ChannelPool()
+        self.timeout = timeout
+
+    def build_metadata(self, cookie, bearer_token):
+        # Same headers GrpcCaller.build_command passes to grpcurl with -H.
+        if cookie:
+            return (("cookie", f"s={cookie}"),)
+        if bearer_token:
+            return (("authorization", f"Bearer {bearer_token}"),)
+        return ()
+
+    def build_command(self, plaintext, cookie, bearer_token, protoset, server, method, body):
+        """A grpcurl-like description of the call, used only for display."""
+        command = ["(in-process)"]
+        if plaintext:
+            command.append("-plaintext")
+        for key, value in self.build_metadata(cookie, bearer_token):
+            command.extend(["-H", f"{key}: {value}"])
+        command.extend(["--protoset", protoset])
+        if body:
+            command.extend(["-d", body])
+        command.append(server)
+        command.append(method)
+        return command
+
+    def execute_call(self, plaintext, cookie, bearer_token, protoset, server, call_name, body, handle: CallHandle = None, timer=None):
+        """Like GrpcCaller.execute_call. If a PhaseTimer is given, records protoset load/encoding and RPC time in it."""
+        command = self.build_command(plaintext, cookie, bearer_token, protoset, server, call_name, body)
+        messages = []
+        return_code, stderr = self._invoke(plaintext, cookie, bearer_token, protoset, server, call_name, body, messages.append, handle, timer)
+        return return_code, "".join(messages), stderr, command
+
+    def stream_call(self, plaintext, cookie, bearer_token, protoset, server, call_name, body, on_message, handle: CallHandle = None):
+        command = self.build_command(plaintext, cookie, bearer_token, protoset, server, call_name, body)
+        return_code, stderr = self._invoke(plaintext, cookie, bearer_token, protoset, server, call_name, body, on_message, handle)
+        return return_code, stderr, command
+
+    def _invoke(self, plaintext, cookie, bearer_token, protoset, server, call_name, body, on_message, handle, timer=None):
+        if handle and handle.cancelled:
+            return None, "Call cancelled."
+        started = time.perf_counter()
+        try:
+            index = self.protoset_parser.get_index(protoset)
+            method_info = index.get_method(call_name)
+            if method_info is None:
+                return 1, f"Failed to invoke: symbol not found: {call_name}\n"
+            method = method_info[0]
+            request_class = index.get_message_class(method.input_type)
+            response_class = index.get_message_class(method.output_type)
+            requests = [json_format.Parse(text, request_class()) for text in self._split_body(body)]
+        except Exception as e:
+            return 1, f"Error invoking method \"{call_name}\": {e}\n"
+        if timer:
+            timer.add("protoset load + encode request", time.perf_counter() - started)
+
+        service_name, _, method_name = call_name.rpartition(".")
+        path = f"/{service_name}/{method_name}"
+        metadata = self.build_metadata(cookie, bearer_token)
+        channel = self.channel_pool.get(server, plaintext, metadata)
+        serializer = lambda message: message.SerializeToString()
+        deserializer = response_class.FromString
+        rpc_started = time.perf_counter()
+        try:
+            if method.client_streaming:
+                request_arg = iter(requests)
+            else:
+                request_arg = requests[0] if requests else request_class()
+
+            if method.server_streaming:
+                factory = channel.stream_stream if method.client_streaming else channel.unary_stream
+                rpc = factory(path, request_serializer=serializer, response_deserializer=deserializer)(
+                    request_arg, metadata=metadata, timeout=self.timeout)
+                if handle:
+                    handle.attach(_RpcProcess(rpc))
+                for response in rpc:
+                    on_message(self._format_message(response))
+            else:
+                factory = channel.stream_unary if method.client_streaming else channel.unary_unary
+                rpc = factory(path, request_serializer=serializer, response_deserializer=deserializer).future(
+                    request_arg, metadata=metadata, timeout=self.timeout)
+                if handle:
+                    handle.attach(_RpcProcess(rpc))
+                on_message(self._format_message(rpc.result()))
+            return 0, ""
+        except grpc.RpcError as e:
+            code = e.code() if callable(getattr(e, "code", None)) else grpc.StatusCode.UNKNOWN
+            details = e.details() if callable(getattr(e, "details", None)) else str(e)
+            code_name = "".join(part.capitalize() for part in code.name.split("_"))
+            return GRPCURL_STATUS_EXIT_BASE + code.value[0], f"ERROR:\n  Code: {code_name}\n  Message: {details}\n"
+        except grpc.FutureCancelledError:
+            return None, "Call cancelled."
+        finally:
+            if timer:
+                timer.add("connect + RPC + decode", time.perf_counter() - rpc_started)
+
+    @staticmethod
+    def _split_body(body):
+        # Like grpcurl -d, the body may hold several JSON messages for client-streaming methods.
+        decoder = json.JSONDecoder()
+        texts = []
+        position = 0
+        body = body or ""
+        while True:
+            while position < len(body) and body[position].isspace():
+                position += 1
+            if position >= len(body):
+                return texts
+            _, end = decoder.raw_decode(body, position)
+            texts.append(body[position:end])
+            position = end
+
+    @staticmethod
+    def _format_message(message):
+        return json_format.MessageToJson(message, preserving_proto_field_name=True, indent=2) + "\n"
+
+    def close(self):
+        self.channel_pool.close_all()
@@ -1,80 +1,27 @@
 import json
 import tkinter as tk
 import os
-import subprocess
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk
-from google.protobuf.descriptor import Descriptor
-from google.protobuf import descriptor_pb2
-from environments_page import substitute_env_vars, EnvironmentRepo
-
-class GrpcCaller:
-    """Handles construction and execution of the grpcurl command."""
-    def build_command(self, plaintext, cookie, bearer_token, protoset, server, method, body):
-        command = ["grpcurl"]
-        if plaintext:
-            command.append("-plaintext")
-        if cookie:
-            command.extend(["-H", f"Cookie:s={cookie}"])
-        elif bearer_token:
-            command.extend(["-H", f"authorization: Bearer {bearer_token}"])
-        command.extend(["--protoset", protoset])
-        if body:
-            command.extend(["-d", body])
-        command.append(server)
-        command.append(method)
-        return command
-
-    def execute_call(self, plaintext, cookie, bearer_token, protoset, server, call_name, body):
-        command = self.build_command(plaintext, cookie, bearer_token, protoset, server, call_name, body)
-        try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            stdout, stderr = process.communicate()
-            return process.returncode, stdout, stderr, command
-        except Exception as e:
-            return None, "", f"Error while running grpcurl: {e}", command
-
-class SavedGrpcManager:
-    """Manages persistence of grpcurl call details."""
-    def __init__(self, history_file: str):
-        self.history_file = history_file
-        self.saved_calls = []
-
-    def load_saved_calls(self) -> list:
-        if not os.path.exists(self.history_file):
-            self.saved_calls = []
-        else:
-            try:
-                with open(self.history_file, "r") as f:
-                    data = json.load(f)
-                    self.saved_calls = data if isinstance(data, list) else []
-            except (json.JSONDecodeError, IOError):
-                self.saved_calls = []
-        return self.saved_calls
-
-    def save_call(self):
-        try:
-            with open(self.history_file, "w") as f:
-                json.dump(self.saved_calls, f, indent=4)
-        except IOError as e:
-            raise Exception(f"Error saving history: {e}")
-
-    def append_call(self, call_info):
-        self.saved_calls.append(call_info)
-        self.save_call()
-
-    def update_call(self, index, call_info):
-        if index < 0 or index >= len(self.saved_calls):
-            raise IndexError("Invalid call index")
-        self.saved_calls[index] = call_info
-        self.save_call()
-
-    def get_display_text(self, call_info: dict):
-        return (f"{call_info.get('method', '')}")
+from grpc_caller import GrpcCaller, CallHandle
+from load_test import LoadTestRunner
+from fanout import FanOutRunner, FanOutDialog
+from stream_output import StreamingOutput
+from body_form import BodyForm
+from method_picker import MethodPicker, MethodIndex
+from output_renderer import ChunkedTextRenderer, JsonTreeView, parse_json_messages
+from virtual_list import VirtualListbox
+from saved_call_index import SavedCallIndex
+from response_cache import ResponseCache
+from reflection_cache import ReflectionCache
+from protoset_workspace import is_workspace, protoset_exists
+from protoset_parser import ProtosetParser
+from saved_calls import SavedGrpcManager
+from instrumentation import CallInstrumentation, InstrumentationPanel, export_instrumentation
+from environment_repo import resolve_call_details, EnvironmentRepo
 
 class GrpcUrlView(ttk.Frame):
     """
@@ -143,53 +90,147 @@ class GrpcUrlView(ttk.Frame):
 
         # Method (Call Name)
         ttk.Label(self.input_frame, text="Method:").grid(row=5, column=0, sticky=tk.W, pady=2)
-        self.call_dropdown = ttk.Combobox(self.input_frame, textvariable=self.method_var, width=48, state='readonly')
-        self.call_dropdown.grid(row=5, column=1, sticky=tk.W, padx=5, pady=2)
+        self.call_picker = MethodPicker(self.input_frame, self.method_var, width=48)
+        self.call_picker.grid(row=5, column=1, sticky=tk.W, padx=5, pady=2)
 
         # -plaintext Checkbox
         self.plaintext_checkbox = ttk.Checkbutton(self.input_frame, text="Use -plaintext", variable=self.plaintext_var)
         self.plaintext_checkbox.grid(row=6, column=1, sticky=tk.W, pady=5)
 
+        # Streaming output for server-streaming methods, optionally spooled to a file
+        self.stream_var = tk.BooleanVar(value=False)
+        self.spool_file_var = tk.StringVar()
+        self.stream_checkbox = ttk.Checkbutton(self.input_frame, text="Stream output", variable=self.stream_var)
+        self.stream_checkbox.grid(row=7, column=1, sticky=tk.W, pady=2)
+        ttk.Label(self.input_frame, text="Spool Stream To File:").grid(row=8, column=0, sticky=tk.W, pady=2)
+        self.spool_file_entry = ttk.Entry(self.input_frame, textvariable=self.spool_file_var, width=50)
+        self.spool_file_entry.grid(row=8, column=1, sticky=tk.W, padx=5, pady=2)
+
+        # Invoke methods over pooled gRPC channels instead of spawning grpcurl
+        self.in_process_var = tk.BooleanVar(value=False)
+        self.in_process_checkbox = ttk.Checkbutton(self.input_frame, text="Use in-process engine (no grpcurl)", variable=self.in_process_var)
+        self.in_process_checkbox.grid(row=9, column=1, sticky=tk.W, pady=2)
+
+        # Reuse recent responses of read-only methods (Get*, List*) instead of calling again
+        self.use_cache_var = tk.BooleanVar(value=False)
+        self.use_cache_checkbox = ttk.Checkbutton(self.input_frame, text="Cache responses of read-only methods", variable=self.use_cache_var)
+        self.use_cache_checkbox.grid(row=10, column=1, sticky=tk.W, pady=2)
+
+        # Fetch descriptors from the server itself instead of a local protoset
+        reflection_frame = ttk.Frame(self.input_frame)
+        reflection_frame.grid(row=11, column=1, sticky=tk.W, pady=2)
+        self.use_reflection_var = tk.BooleanVar(value=False)
+        # While reflection is in use the protoset field shows the cached descriptors;
+        # the user's own protoset is kept here so it can be put back and saved.
+        self._reflection_protoset = None
+        self._user_protoset = ""
+        self.use_reflection_checkbox = ttk.Checkbutton(reflection_frame, text="Use server reflection", variable=self.use_reflection_var)
+        self.use_reflection_checkbox.pack(side=tk.LEFT)
+        self.refresh_reflection_button = ttk.Button(reflection_frame, text="Refresh")
+        self.refresh_reflection_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.reflection_status_label = ttk.Label(reflection_frame, text="")
+        self.reflection_status_label.pack(side=tk.LEFT, padx=(10, 0))
+
         # Saved Calls Listbox
         self.saved_call_frame = ttk.Frame(self.content_frame)
         self.saved_call_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        ttk.Label(self.saved_call_frame, text="Saved Calls:").pack(anchor=tk.W)
-        self.saved_call_list_box = tk.Listbox(self.saved_call_frame, height=6)
+        saved_call_header = ttk.Frame(self.saved_call_frame)
+        saved_call_header.pack(fill=tk.X)
+        ttk.Label(saved_call_header, text="Saved Calls:").pack(side=tk.LEFT)
+        self.saved_call_search_var = tk.StringVar()
+        ttk.Entry(saved_call_header, textvariable=self.saved_call_search_var, width=40).pack(side=tk.RIGHT)
+        ttk.Label(saved_call_header, text="Search:").pack(side=tk.RIGHT, padx=(0, 5))
+        self.saved_call_list_box = VirtualListbox(self.saved_call_frame, height=6, get_text=self._get_saved_call_text)
         self.saved_call_list_box.pack(fill=tk.X, pady=5)
+        self._saved_calls = []
+        self._get_display_text = str
+
+        # Load test controls for the selected saved call
+        self.load_test_frame = ttk.Frame(self.saved_call_frame)
+        self.load_test_frame.pack(fill=tk.X)
+        self.load_test_runs_var = tk.StringVar(value="100")
+        self.load_test_seconds_var = tk.StringVar()
+        self.load_test_concurrency_var = tk.StringVar(value="4")
+        ttk.Label(self.load_test_frame, text="Runs:").pack(side=tk.LEFT)
+        ttk.Entry(self.load_test_frame, textvariable=self.load_test_runs_var, width=8).pack(side=tk.LEFT, padx=(2, 10))
+        ttk.Label(self.load_test_frame, text="or Seconds:").pack(side=tk.LEFT)
+        ttk.Entry(self.load_test_frame, textvariable=self.load_test_seconds_var, width=8).pack(side=tk.LEFT, padx=(2, 10))
+        ttk.Label(self.load_test_frame, text="Concurrency:").pack(side=tk.LEFT)
+        ttk.Entry(self.load_test_frame, textvariable=self.load_test_concurrency_var, width=5).pack(side=tk.LEFT, padx=(2, 10))
+        self.load_test_button = ttk.Button(self.load_test_frame, text="Load Test Selected Call")
+        self.load_test_button.pack(side=tk.LEFT)
 
         # Dynamic Body Fields Frame
         self.body_fields_frame = ttk.Frame(self.content_frame)
         self.body_fields_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.body_label = ttk.Label(self.body_fields_frame, text="BODY")
+        self.no_body_label = ttk.Label(self.body_fields_frame, text="(No body fields required for this method)")
+        self.body_form = None
+        # Built forms by (protoset, message type), least recently used first. Switching back
+        # to a method re-attaches its form, with whatever was typed into it.
+        self._body_forms = OrderedDict()
+        self.body_form_cache_size = 8
 
         # Action Buttons
         self.button_frame = ttk.Frame(self.content_frame)
         self.button_frame.pack(fill=tk.X, padx=10, pady=5)
         self.make_call_button = ttk.Button(self.button_frame, text="Make gRPC Call")
         self.make_call_button.pack(side=tk.LEFT, padx=(0, 10))
+        self.bypass_cache_button = ttk.Button(self.button_frame, text="Call (Bypass Cache)")
+        self.bypass_cache_button.pack(side=tk.LEFT, padx=(0, 10))
         self.save_call_button = ttk.Button(self.button_frame, text="Save Call")
         self.save_call_button.pack(side=tk.LEFT, padx=(0, 10))
         self.edit_call_button = ttk.Button(self.button_frame, text="Edit Call")
         self.edit_call_button.pack(side=tk.LEFT)
+        self.fan_out_button = ttk.Button(self.button_frame, text="Fan Out...")
+        self.fan_out_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.cancel_call_button = ttk.Button(self.button_frame, text="Cancel", state=tk.DISABLED)
+        self.cancel_call_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.in_flight_label = ttk.Label(self.button_frame, text="")
+        self.in_flight_label.pack(side=tk.LEFT, padx=(10, 0))
 
         # Output text area
         self.output_frame = ttk.Frame(self.content_frame)
         self.output_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        ttk.Label(self.output_frame, text="Output:").pack(anchor=tk.W)
-        self.output_text = tk.Text(self.output_frame, wrap=tk.WORD, height=15)
+        output_header = ttk.Frame(self.output_frame)
+        output_header.pack(fill=tk.X)
+        ttk.Label(output_header, text="Output:").pack(side=tk.LEFT)
+        self.output_tree_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(output_header, text="JSON tree", variable=self.output_tree_var,
+                        command=self._on_output_mode_change).pack(side=tk.RIGHT)
+        self.output_body = ttk.Frame(self.output_frame)
+        self.output_body.pack(fill=tk.BOTH, expand=True)
+        self.output_text = tk.Text(self.output_body, wrap=tk.WORD, height=15)
         self.output_text.pack(fill=tk.BOTH, expand=True)
+        self.output_tree = JsonTreeView(self.output_body)
+        self.stream_status_label = ttk.Label(self.output_frame, text="")
+        self.stream_status_label.pack(anchor=tk.W)
+        self.streaming_output = StreamingOutput(self.output_text, self.stream_status_label)
+        self.instrumentation_panel = InstrumentationPanel(self.output_frame)
+        self.instrumentation_panel.pack(fill=tk.X)
+        # Large outputs are paged into the widget; the full text stays in the renderer's buffer.
+        self.output_renderer = ChunkedTextRenderer(self.output_text)
+        self._output_json_part = None
+        self._output_tree_loaded = True
 
         # --- Internal event wiring ---
-        self.protoset_var.trace_add("write", lambda *args: self._on_protoset_change())
+        # Typing a path fires a write per keystroke, so wait until it settles before loading it.
+        self.protoset_debounce_ms = 300
+        self._protoset_change_job = None
+        self._loading_call_names = False
+        self._method_before_loading = ""
+        self.protoset_var.trace_add("write", lambda *args: self._schedule_protoset_change())
         self.method_var.trace_add("write", lambda *args: self._on_method_select())
-        self.saved_call_list_box.bind("<<ListboxSelect>>", lambda e: self._on_saved_call_select())
+        self.saved_call_list_box.set_on_select(lambda row: self._on_saved_call_select())
+        self.saved_call_search_var.trace_add("write", lambda *args: self._on_saved_call_search())
 
     # --- New helper methods for Environment drop down ---
     def set_environment_options(self, options):
+        # Called again whenever environments.json changes, so keep the selection if it still exists.
+        current = self.environment_var.get()
         self.environment_drop_down['values'] = options
-        if options:
-            self.environment_var.set(options[0])
-        else:
-            self.environment_var.set("")
+        if current not in options:
+            self.environment_var.set(options[0] if options else "")
 
     def get_selected_environment(self):
         return self.environment_var.get()
@@ -205,28 +246,98 @@ class GrpcUrlView(ttk.Frame):
     def set_on_make_call(self, handler):
         self.make_call_button.config(command=handler)
 
+    def set_on_bypass_cache_call(self, handler):
+        self.bypass_cache_button.config(command=handler)
+
     def set_on_save_call(self, handler):
         self.save_call_button.config(command=handler)
 
     def set_on_edit_call(self, handler):
         self.edit_call_button.config(command=handler)
 
+    def set_on_load_test(self, handler):
+        self.load_test_button.config(command=handler)
+
+    def set_on_reflection_toggle(self, handler):
+        self.use_reflection_checkbox.config(command=handler)
+
+    def set_on_reflection_refresh(self, handler):
+        self.refresh_reflection_button.config(command=handler)
+
+    def set_reflection_status(self, text):
+        self.reflection_status_label.config(text=text)
+
+    def set_reflection_protoset(self, path):
+        """Show the descriptors fetched with reflection in place of the user's protoset."""
+        if not self._using_reflection_protoset():
+            self._user_protoset = self.protoset_var.get()
+        self._reflection_protoset = path
+        self.protoset_var.set(path)
+
+    def restore_protoset(self):
+        """Put back the protoset the user had before reflection, unless they have changed it since."""
+        if self._using_reflection_protoset():
+            self.protoset_var.set(self._user_protoset)
+        self._reflection_protoset = None
+
+    def _using_reflection_protoset(self):
+        return self._reflection_protoset is not None and self.protoset_var.get() == self._reflection_protoset
+
+    def set_on_fan_out(self, handler):
+        self.fan_out_button.config(command=handler)
+
+    def open_fan_out_dialog(self, title):
+        return FanOutDialog(self, title)
+
+    def set_on_export_timings(self, handler):
+        self.instrumentation_panel.set_on_export(handler)
+
+    def take_profile_request(self):
+        return self.instrumentation_panel.take_profile_request()
+
+    def show_timings(self, text):
+        self.instrumentation_panel.show(text)
+
+    def ask_timings_export_path(self):
+        return self.instrumentation_panel.ask_export_path()
+
+    def set_on_cancel_calls(self, handler):
+        self.cancel_call_button.config(command=handler)
+
     def set_on_saved_call_select(self, handler):
         self._external_saved_call_select = handler
 
+    def set_on_load_output_tree(self, handler):
+        self._external_load_output_tree = handler
+
     # Internal handlers that forward events to the Presenter if a callback is registered
+    def _schedule_protoset_change(self):
+        if self._protoset_change_job:
+            self.after_cancel(self._protoset_change_job)
+        self._protoset_change_job = self.after(self.protoset_debounce_ms, self._on_protoset_change)
+
     def _on_protoset_change(self):
+        self._protoset_change_job = None
         if hasattr(self, "_external_protoset_change") and callable(self._external_protoset_change):
             self._external_protoset_change(self.protoset_var.get().strip())
 
     def _on_method_select(self):
+        if self._loading_call_names:
+            return
         if hasattr(self, "_external_method_select") and callable(self._external_method_select):
             self._external_method_select(self.method_var.get().strip(), self.protoset_var.get().strip())
 
+    def set_on_saved_call_search(self, handler):
+        self._external_saved_call_search = handler
+
     def _on_saved_call_select(self):
         if hasattr(self, "_external_saved_call_select") and callable(self._external_saved_call_select):
-            selection = self.saved_call_list_box.curselection()
-            self._external_saved_call_select(selection)
+            selected = self.saved_call_list_box.get_selected()
+            self._external_saved_call_select((selected,) if selected is not None else ())
+
+    def _on_saved_call_search(self):
+        if hasattr(self, "_external_saved_call_search") and callable(self._external_saved_call_search):
+            self._external_saved_call_search(self.saved_call_search_var.get())
 
     # Getter methods for input fields (the Presenter can query these)
     def get_call_details(self):
@@ -236,256 +347,394 @@ class GrpcUrlView(ttk.Frame):
             "bearer_token": self.bearer_token_var.get().strip(),
             "protoset": self.protoset_var.get().strip(),
             "server": self.server_var.get().strip(),
-            "method": self.method_var.get().strip()
+            "method": self.get_selected_method()
         }
 
-    def get_body_data(self):
-        body_dict = {}
-        if hasattr(self, 'dynamic_body_fields'):
-            for field_name, widget_info in self.dynamic_body_fields.items():
-                widget_type = widget_info["widget_type"]
-                widget_ref = widget_info["widget_ref"]
-                # Get the stripped value
-                field_value = widget_ref.get().strip()
-                if field_value:
-                    body_dict[field_name] = field_value
+    def get_call_details_to_save(self):
+        """Like get_call_details, but with the user's protoset rather than the machine-local reflection cache."""
+        details = self.get_call_details()
+        if self._using_reflection_protoset():
+            details["protoset"] = self._user_protoset.strip()
+        return details
+
+    def get_selected_method(self):
+        # While the method list is loading the dropdown only shows "Loading...".
+        method = self._method_before_loading if self._loading_call_names else self.method_var.get()
+        return method.strip()
+
+    def get_load_test_settings(self):
+        return {
+            "runs": self.load_test_runs_var.get().strip(),
+            "seconds": self.load_test_seconds_var.get().strip(),
+            "concurrency": self.load_test_concurrency_var.get().strip()
+        }
 
+    def get_body_data(self):
+        body_dict = self.body_form.get_body() if self.body_form else {}
         return json.dumps(body_dict) if body_dict else ""
 
     # Methods for the Presenter to update the view
-    def set_call_names(self, call_names):
-        self.call_dropdown['values'] = call_names
-        if call_names:
+    def set_call_names(self, call_names, index=None):
+        """Show the methods to pick from. index is a prebuilt MethodIndex over call_names, if any."""
+        # Keep the selected method if the new protoset has it, e.g. when a saved call was loaded.
+        current = self._method_before_loading if self._loading_call_names else self.method_var.get()
+        self._loading_call_names = False
+        self.call_picker.set_names(call_names, index)
+        self.call_picker.set_enabled(True)
+        if current and current in (index if index is not None else call_names):
+            self.method_var.set(current)
+        elif call_names:
             self.method_var.set(call_names[0])
         else:
             self.method_var.set("")
 
-    def build_body_fields(self, fields_with_enums):
-        for widget in self.body_fields_frame.winfo_children():
-            widget.destroy()
-        self.dynamic_body_fields = {}
+    def set_call_names_loading(self):
+        """Show that the method list is being loaded. set_call_names() ends the loading state."""
+        if not self._loading_call_names:
+            self._method_before_loading = self.method_var.get()
+            self._loading_call_names = True
+        self.call_picker.set_names([])
+        self.method_var.set("Loading...")
+        self.call_picker.set_enabled(False)
+
+    def set_recent_methods(self, methods):
+        """Methods to rank first in the picker, most recently used first."""
+        self.call_picker.set_recent(methods)
+
+    def note_method_used(self, method):
+        self.call_picker.note_used(method)
+
+    def build_body_fields(self, fields_with_enums, get_message_fields=None, cache_key=None):
+        """
+        Show the body form for a method's input fields. get_message_fields(type_name)
+        looks up the fields of nested messages when their sections are expanded. Forms
+        with a cache_key are kept after being hidden and reused for the same key.
+        """
+        if self.body_form:
+            self.body_form.grid_remove()
+            if self.body_form not in self._body_forms.values():
+                self.body_form.destroy()
+        self.body_form = None
 
         if not fields_with_enums:
-            ttk.Label(self.body_fields_frame, text="(No body fields required for this method)").grid(row=0, column=0, sticky=tk.W)
+            self.body_label.grid_remove()
+            self.no_body_label.grid(row=0, column=0, sticky=tk.W)
             return
+        self.no_body_label.grid_remove()
+        self.body_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 5), pady=2)
+
+        form = self._body_forms.pop(cache_key, None) if cache_key is not None else None
+        if form is None:
+            form = BodyForm(self.body_fields_frame, fields_with_enums, get_message_fields or (lambda type_name: []))
+        if cache_key is not None:
+            self._body_forms[cache_key] = form
+            while len(self._body_forms) > self.body_form_cache_size:
+                _, evicted = self._body_forms.popitem(last=False)
+                evicted.destroy()
+        self.body_form = form
+        self.body_form.grid(row=1, column=0, sticky=tk.W)
 
-        ttk.Label(self.body_fields_frame, text="BODY").grid(row=0, column=0, sticky=tk.W, padx=(0, 5), pady=2)
+    def populate_body_fields(self, body_data):
+        """Fill the current form with body_data in place, clearing fields it doesn't set."""
+        if not self.body_form:
+            return
+        self.body_form.set_body(body_data or {})
+
+    def display_output(self, text, json_part=None):
+        """
+        Show text, a string or a list of strings shown back to back, paging it in if it is
+        large. json_part is the index of the part holding the response for the JSON tree.
+        """
+        self.streaming_output.stop()
+        self.output_renderer.render(text)
+        # The renderer keeps the only copy of the response. The tree is only parsed and
+        # built, from that copy, when it is actually shown.
+        self._output_json_part = json_part
+        self._output_tree_loaded = False
+        if self.output_tree_var.get():
+            self._load_output_tree()
+
+    def _on_output_mode_change(self):
+        if self.output_tree_var.get():
+            self._load_output_tree()
+            self.output_text.pack_forget()
+            self.output_tree.pack(fill=tk.BOTH, expand=True)
+        else:
+            self.output_tree.pack_forget()
+            self.output_text.pack(fill=tk.BOTH, expand=True)
 
-        for row_index, (field_desc, enum_values) in enumerate(fields_with_enums, start=1):
-            field_name = field_desc.name
-            ttk.Label(self.body_fields_frame, text=f"{field_name}:").grid(row=row_index, column=0, sticky=tk.W, padx=(0, 5), pady=2)
+    def _load_output_tree(self):
+        if self._output_tree_loaded:
+            return
+        self._output_tree_loaded = True
+        json_text = self.output_renderer.read_part(self._output_json_part) if self._output_json_part is not None else None
+        if hasattr(self, "_external_load_output_tree") and callable(self._external_load_output_tree):
+            # A large response takes a while to parse, so the presenter does it off the Tk thread.
+            self.output_tree.show_message("(Parsing response...)")
+            self._external_load_output_tree(json_text)
+        else:
+            self.show_output_tree(parse_json_messages(json_text) if json_text else None)
 
-            if enum_values:
-                combobox = ttk.Combobox(self.body_fields_frame, values=enum_values, width=48, state='readonly')
-                combobox.grid(row=row_index, column=1, sticky=tk.W, pady=2)
-                self.dynamic_body_fields[field_name] = {
-                    "widget_type": "combo",
-                    "widget_ref": combobox
-                }
-            else:
-                entry = ttk.Entry(self.body_fields_frame, width=50)
-                entry.grid(row=row_index, column=1, sticky=tk.W, pady=2)
-                self.dynamic_body_fields[field_name] = {
-                    "widget_type": "entry",
-                    "widget_ref": entry
-                }
+    def show_output_tree(self, value):
+        """Show value, a parsed response, in the JSON tree, or a note if there is none."""
+        if value is None:
+            self.output_tree.show_message("(No JSON response to show)")
+        else:
+            self.output_tree.load(value)
+
+    def start_stream(self, header):
+        self.output_renderer.clear()
+        # Streams are only rendered as text.
+        self._output_json_part = None
+        self._output_tree_loaded = False
+        if self.output_tree_var.get():
+            self.output_tree_var.set(False)
+            self._on_output_mode_change()
+        return self.streaming_output.start(header)
+
+    def push_stream_message(self, stream_id, message):
+        # Safe to call from worker threads.
+        self.streaming_output.push(stream_id, message)
+
+    def finish_stream(self, stream_id, footer=""):
+        self.streaming_output.finish(stream_id, footer)
+
+    def set_calls_in_flight(self, count):
+        if count:
+            self.in_flight_label.config(text=f"Running {count} call(s)...")
+            self.cancel_call_button.config(state=tk.NORMAL)
+        else:
+            self.in_flight_label.config(text="")
+            self.cancel_call_button.config(state=tk.DISABLED)
 
-    def populate_body_fields(self, body_data):
-        if not hasattr(self, 'dynamic_body_fields') or not body_data:
-            return
+    def update_saved_calls_list(self, saved_calls, get_display_text, rows=None):
+        # Only the rows on screen are drawn, so this is cheap however many calls there are.
+        self._saved_calls = saved_calls
+        self._get_display_text = get_display_text
+        self.saved_call_list_box.set_rows(range(len(saved_calls)) if rows is None else rows)
+
+    def add_saved_call(self, saved_calls, index):
+        """Show a newly saved call without redrawing the rest of the list."""
+        self._saved_calls = saved_calls
+        self.saved_call_list_box.insert_row(index)
+
+    def remove_saved_call(self, index):
+        """Hide a saved call that no longer matches the search, without redrawing the rest of the list."""
+        self.saved_call_list_box.remove_row(index)
 
-        for key, value in body_data.items():
-            if key in self.dynamic_body_fields:
-                widget_type = self.dynamic_body_fields[key]["widget_type"]
-                widget_ref = self.dynamic_body_fields[key]["widget_ref"]
-                if widget_type == "combo":
-                    widget_ref.set(value)
-                else:
-                    widget_ref.delete(0, tk.END)
-                    widget_ref.insert(0, value)
-
-    def display_output(self, text):
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert(tk.END, text)
-
-    def update_saved_calls_list(self, saved_calls, get_display_text):
-        self.saved_call_list_box.delete(0, tk.END)
-        for call_info in saved_calls:
-            display_text = get_display_text(call_info)
-            self.saved_call_list_box.insert(tk.END, display_text)
+    def is_saved_call_listed(self, index):
+        return self.saved_call_list_box.has_row(index)
+
+    def refresh_saved_call(self, index):
+        self.saved_call_list_box.refresh_row(index)
+
+    def get_selected_saved_call(self):
+        return self.saved_call_list_box.get_selected()
+
+    def get_saved_call_search(self):
+        return self.saved_call_search_var.get()
+
+    def _get_saved_call_text(self, index):
+        return self._get_display_text(self._saved_calls[index])
 
     def set_input_fields(self, call_info):
         self.port_forward_var.set(call_info.get("port_forward", ""))
         self.cookie_var.set(call_info.get("cookie", ""))
         self.bearer_token_var.set(call_info.get("bearer_token", ""))
+        # A saved call brings its own protoset, so reflection is switched off.
+        self.use_reflection_var.set(False)
+        self._reflection_protoset = None
+        self.set_reflection_status("")
         self.protoset_var.set(call_info.get("protoset", ""))
         self.server_var.set(call_info.get("server", ""))
-        self.method_var.set(call_info.get("method", ""))
-
-class ProtosetParser:
-    """Handles reading a protoset file and extracting call names and request fields."""
-    @staticmethod
-    def get_call_names(protoset_path):
-        call_names = []
-        try:
-            with open(protoset_path, "rb") as f:
-                fds = descriptor_pb2.FileDescriptorSet()
-                fds.ParseFromString(f.read())
-            for file_desc in fds.file:
-                package_prefix = file_desc.package.strip() if file_desc.package else ""
-                for service in file_desc.service:
-                    full_service_name = f"{package_prefix}.{service.name}" if package_prefix else service.name
-                    for method in service.method:
-                        call_names.append(f"{full_service_name}.{method.name}")
-            return call_names
-        except Exception:
-            return []
-
-    @staticmethod
-    def get_method_request_fields(protoset_path, call_name):
-        try:
-            with open(protoset_path, "rb") as f:
-                fds = descriptor_pb2.FileDescriptorSet()
-                fds.ParseFromString(f.read())
-        except Exception:
-            return []
-
-        messages = {}
-        enums = {}
-
-        def add_messages(prefix, message_list, enum_list):
-            for msg in message_list:
-                full_msg_name = f"{prefix}.{msg.name}" if prefix else msg.name
-                messages[full_msg_name] = msg
-                add_messages(full_msg_name, msg.nested_type, msg.enum_type)
-            for en in enum_list:
-                full_enum_name = f"{prefix}.{en.name}" if prefix else en.name
-                enums[full_enum_name] = en
-
-        for file_desc in fds.file:
-            package = file_desc.package.strip() if file_desc.package else ""
-            add_messages(package, file_desc.message_type, file_desc.enum_type)
-
-        parts = call_name.split('.')
-        if len(parts) < 2:
-            return []
-        method_name = parts[-1]
-        service_name = parts[-2]
-        package = ".".join(parts[:-2])
-
-        input_msg = None
-        for file_desc in fds.file:
-            file_package = file_desc.package.strip() if file_desc.package else ""
-            if package and file_package != package:
-                continue
-            for service in file_desc.service:
-                if service.name == service_name:
-                    for method in service.method:
-                        if method.name == method_name:
-                            input_type = method.input_type.lstrip('.')
-                            input_msg = messages.get(input_type)
-                            break
-
-        if not input_msg:
-            return []
-
-        output = []
-        for field in input_msg.field:
-            if field.type == descriptor_pb2.FieldDescriptorProto.TYPE_ENUM:
-                enum_type_name = field.type_name.lstrip('.')
-                enum_descriptor = enums.get(enum_type_name)
-                if enum_descriptor:
-                    possible_values = [v.name for v in enum_descriptor.value]
-                else:
-                    possible_values = []
-                output.append((field, possible_values))
-            else:
-                output.append((field, []))
-
-        return output
+        if self._loading_call_names:
+            self._method_before_loading = call_info.get("method", "")
+        else:
+            self.method_var.set(call_info.get("method", ""))
 
 class GrpcCallPresenter:
     """
     The Presenter in the MVP pattern. It responds to view events,
     calls the model/service classes as needed, and then instructs the view to update.
     """
-    def __init__(self, view: GrpcUrlView, protoset_parser: ProtosetParser, env_model: EnvironmentRepo):
+    def __init__(self, view: GrpcUrlView, protoset_parser: ProtosetParser, env_model: EnvironmentRepo, saved_calls_journal=False, history_store=None, response_cache: ResponseCache = None, reflection_cache: ReflectionCache = None):
         self.view = view
+        self.history_store = history_store
+        self.response_cache = response_cache or ResponseCache()
+        self.reflection_cache = reflection_cache or ReflectionCache()
         self.grpc_caller = GrpcCaller()
-        self.saved_calls_manager = SavedGrpcManager("grpc_calls.json")
+        self.in_process_caller = None  # created on first use, it needs grpcio
+        self.saved_calls_manager = SavedGrpcManager("grpc_calls.json", journal=saved_calls_journal)
         self.protoset_parser = protoset_parser
         self.env_model = env_model
-        self.calls_history = self.saved_calls_manager.load_saved_calls()
+        self.calls_history = []
+        self.saved_calls_loaded = False
+        self.saved_calls_load_time = None
         self.saved_body = None
+        self.protoset_generation = 0  # bumped per protoset change so stale parses are dropped
+        self.body_form_generation = 0  # likewise per method, for body form field lookups
+        self.output_tree_generation = 0  # and per response, for parsing it into the JSON tree
+        self.last_instrumentation = None
+
+        # Calls run on worker threads; results come back through a queue drained on the Tk loop.
+        self.call_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="grpc-call")
+        self.call_results = queue.Queue()
+        self.in_flight_calls = set()
+        # Internal work (loading files, parsing protosets) gets its own worker, so it can't be
+        # starved by streams, load tests or fan-outs holding every call worker.
+        self.task_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grpc-task")
 
         # Register callbacks for various UI events.
         self.view.set_on_protoset_change(self.handle_protoset_change)
         self.view.set_on_method_select(self.handle_method_select)
         self.view.set_on_make_call(self.handle_make_call)
+        self.view.set_on_bypass_cache_call(lambda: self.handle_make_call(bypass_cache=True))
         self.view.set_on_save_call(self.handle_save_call)
         self.view.set_on_edit_call(self.handle_edit_call)
+        self.view.set_on_cancel_calls(self.handle_cancel_calls)
+        self.view.set_on_load_test(self.handle_load_test)
+        self.view.set_on_fan_out(self.handle_fan_out)
+        self.view.set_on_export_timings(self.handle_export_timings)
+        self.view.set_on_reflection_toggle(self.handle_reflection_toggle)
+        self.view.set_on_reflection_refresh(lambda: self.handle_reflection_toggle(refresh=True))
         self.view.set_on_saved_call_select(self.handle_saved_call_select)
+        self.view.set_on_saved_call_search(self.handle_saved_call_search)
+        self.view.set_on_load_output_tree(self.handle_load_output_tree)
 
+        # Saved calls are read and indexed on a worker so they don't delay the first paint.
+        self.saved_call_index = SavedCallIndex()
         self.view.update_saved_calls_list(self.calls_history, self.saved_calls_manager.get_display_text)
+        load_started = time.perf_counter()
+        self.run_background_task(
+            self._load_saved_calls,
+            lambda result, error: self._on_saved_calls_loaded(result, error, load_started)
+        )
 
         # --- NEW: Initialize the environment drop down with the current options ---
         initial_env_names = self.env_model.get_all_environment_names()
         self.refresh_environment_options(initial_env_names)
 
+    def _load_saved_calls(self):
+        # Runs on a worker thread.
+        calls = self.saved_calls_manager.load_saved_calls()
+        index = SavedCallIndex()
+        index.rebuild(calls)
+        return calls, index
+
+    def _on_saved_calls_loaded(self, result, error, load_started):
+        if error:
+            self.view.display_output(f"Error loading saved calls: {error}\n")
+        else:
+            self.calls_history, self.saved_call_index = result
+        self.saved_calls_loaded = True
+        self.saved_calls_load_time = time.perf_counter() - load_started
+        self.handle_saved_call_search(self.view.get_saved_call_search())
+
     # NEW helper to update the drop down options.
     def refresh_environment_options(self, env_names):
         self.view.set_environment_options(env_names)
 
     def handle_protoset_change(self, protoset_path):
-        if not protoset_path or not os.path.exists(protoset_path):
+        self.protoset_generation += 1
+        generation = self.protoset_generation
+        if not protoset_path:
             self.view.set_call_names([])
             return
-        call_names = self.protoset_parser.get_call_names(protoset_path)
-        self.view.set_call_names(call_names)
+        self.view.set_call_names_loading()
+
+        def work():
+            if not protoset_exists(protoset_path):
+                return [], None, []
+            call_names = self.protoset_parser.get_call_names(protoset_path)
+            recent = self.history_store.recent_methods() if self.history_store else []
+            return call_names, MethodIndex(call_names), recent
+
+        def on_done(result, error):
+            # A parse still running when a newer path arrives is simply ignored.
+            if generation != self.protoset_generation:
+                return
+            call_names, index, recent = result if result else ([], None, [])
+            if recent:
+                self.view.set_recent_methods(recent)
+            self.view.set_call_names(call_names, index)
+
+        self.run_background_task(work, on_done)
 
     def handle_method_select(self, call_name, protoset_path):
-        if not call_name or not protoset_path or not os.path.exists(protoset_path):
+        if not call_name or not protoset_path:
             return
-        fields_with_enums = self.protoset_parser.get_method_request_fields(protoset_path, call_name)
-        self.view.build_body_fields(fields_with_enums)
-        if self.saved_body:
-            self.view.populate_body_fields(self.saved_body)
-            self.saved_body = None
 
-    def handle_make_call(self):
-        details = self.view.get_call_details()
-        body = self.view.get_body_data()
+        def on_built():
+            if self.saved_body:
+                self.view.populate_body_fields(self.saved_body)
+                self.saved_body = None
 
-        # Retrieve environment variables from the selected environment
-        selected_env = self.view.get_selected_environment()
-        env_vars = self.env_model.get_environment(selected_env) if selected_env else {}
-
-        # Apply substitution on all details and body using the decoupled utility
-        for key, value in details.items():
-            details[key] = substitute_env_vars(value, env_vars)
-        if body:
-            body = substitute_env_vars(body, env_vars)
-
-        # Check if any unsubstituted placeholders remain
-        unsubstituted_fields = []
-        for key, value in details.items():
-            if "{{" in value or "}}" in value:
-                unsubstituted_fields.append(key)
-        if body and ("{{" in body or "}}" in body):
-            unsubstituted_fields.append("body")
-        if unsubstituted_fields:
-            self.view.display_output(
-                "Error: Unsubstituted environment variables found in fields: " +
-                ", ".join(unsubstituted_fields) +
-                ". Please define the missing variables."
-            )
+        self._load_body_form(protoset_path, call_name, on_built)
+
+    def _load_body_form(self, protoset_path, call_name, on_built):
+        """
+        Look up the method's fields on the task worker, since that may parse the protoset,
+        then build the body form and call on_built(). Only the latest request is shown.
+        """
+        self.body_form_generation += 1
+        generation = self.body_form_generation
+
+        def work():
+            if not protoset_exists(protoset_path):
+                return None
+            fields_with_enums = self.protoset_parser.get_method_request_fields(protoset_path, call_name)
+            return fields_with_enums, self._body_form_key(protoset_path, call_name)
+
+        def on_done(result, error):
+            if generation != self.body_form_generation or error or result is None:
+                return
+            fields_with_enums, cache_key = result
+            self.view.build_body_fields(fields_with_enums, self._message_fields_lookup(protoset_path), cache_key)
+            on_built()
+
+        self.run_background_task(work, on_done)
+
+    def handle_load_output_tree(self, json_text):
+        """Parse a response for the JSON tree on the task worker. Only the latest response is shown."""
+        self.output_tree_generation += 1
+        generation = self.output_tree_generation
+        if not json_text:
+            self.view.show_output_tree(None)
             return
 
-        if not details["protoset"] or not details["server"] or not details["method"]:
-            self.view.display_output("Error: Missing required fields (Protoset, Server, or Call Name).\n")
+        def on_done(value, error):
+            if generation != self.output_tree_generation:
+                return
+            self.view.show_output_tree(None if error else value)
+
+        self.run_background_task(lambda: parse_json_messages(json_text), on_done)
+
+    def _message_fields_lookup(self, protoset_path):
+        # Called on the Tk thread as nested sections are expanded, so it never loads a workspace.
+        return lambda type_name: self.protoset_parser.get_message_fields(protoset_path, type_name, load=False)
+
+    def _body_form_key(self, protoset_path, call_name):
+        # Includes the protoset's mtime so a form is never reused for a rebuilt schema.
+        try:
+            version = self.protoset_parser.get_version(protoset_path)
+        except OSError:
+            return None
+        return (os.path.abspath(protoset_path), version, self.protoset_parser.get_input_type_name(protoset_path, call_name))
+
+    def handle_make_call(self, bypass_cache=False):
+        instrumentation = CallInstrumentation(self.view.get_selected_method(), profile=self.view.take_profile_request())
+        timer = instrumentation.timer
+        with timer.phase("read form"):
+            details = self.view.get_call_details()
+            body = self.view.get_body_data()
+        with timer.phase("environment substitution"):
+            details, body, error = self.resolve_call(details, body)
+        if error:
+            self.view.display_output(error)
             return
+        self.view.note_method_used(self.view.get_selected_method())
 
-        return_code, stdout, stderr, command = self.grpc_caller.execute_call(
+        call_args = (
             self.view.plaintext_var.get(),
             details["cookie"],
             details["bearer_token"],
@@ -494,40 +743,465 @@ class GrpcCallPresenter:
             details["method"],
             body
         )
-        output = f"Executing command: {' '.join(command)}\n\n"
-        if return_code is None or return_code != 0:
-            output += f"Command failed with return code {return_code}.\n"
-            if stderr.strip():
-                output += f"stderr:\n{stderr}\n"
+        try:
+            caller = self.get_caller()
+        except RuntimeError as e:
+            self.view.display_output(f"Error: {e}\n")
+            return
+        if self.view.stream_var.get():
+            self._start_stream_call(caller, call_args, self.view.spool_file_var.get().strip())
+            return
+
+        cache_key = None
+        if self.view.use_cache_var.get() and self.response_cache.ttl_for(details["method"]):
+            with timer.phase("response cache lookup"):
+                cache_key = self.response_cache.make_key(*call_args, self._protoset_version(details["protoset"]),
+                                                         "in-process" if caller is self.in_process_caller else "grpcurl")
+                cached = None if bypass_cache else self.response_cache.get(cache_key)
+            if cached:
+                result, age = cached
+                with timer.phase("render output"):
+                    parts, json_part = self._format_call_result(result)
+                    self.view.display_output(
+                        [f"[Cache hit: response is {age:.1f}s old. Use \"Call (Bypass Cache)\" to refresh.]\n\n"] + parts,
+                        json_part + 1 if json_part is not None else None
+                    )
+                self._show_instrumentation(instrumentation)
+                return
+        instrumentation.mark("queued")
+        self.submit_background(
+            lambda handle: self._execute_and_record(caller, call_args, handle, instrumentation, cache_key),
+            lambda handle, result, error: self._show_call_result(handle, result, error, instrumentation)
+        )
+
+    def _protoset_version(self, protoset_path):
+        try:
+            return self.protoset_parser.get_version(protoset_path)
+        except OSError:
+            return None
+
+    def _execute_and_record(self, caller, call_args, handle, instrumentation, cache_key=None):
+        instrumentation.add_since("wait for a worker", "queued")
+        started_at = time.time()
+        started = time.perf_counter()
+        result = instrumentation.run(caller.execute_call, *call_args, handle=handle, timer=instrumentation.timer)
+        return_code, stdout, stderr, command = result
+        duration = time.perf_counter() - started
+        with instrumentation.timer.phase("record history"):
+            self._record_history(call_args, command, stdout, stderr, return_code, started_at, duration)
+        # Only successful responses are cached, so an error is always retried.
+        if cache_key and return_code == 0 and not handle.cancelled:
+            self.response_cache.put(cache_key, result)
+        instrumentation.mark("worker done")
+        return result
+
+    def _record_history(self, call_args, command, stdout, stderr, return_code, started_at, duration):
+        # Runs on worker threads; a history failure must never lose the call's result.
+        if not self.history_store:
+            return
+        _, _, _, protoset, server, method, body = call_args
+        try:
+            self.history_store.record(method, server, protoset, " ".join(command), body, stdout, stderr,
+                                      return_code, started_at, duration)
+        except Exception:
+            pass
+
+    def resolve_call(self, details, body):
+        """
+        Substitute the selected environment's variables into the call details and body.
+        Returns (details, body, error), where error is a message to show if the call can't be made.
+        """
+        details, body, unsubstituted_fields = resolve_call_details(details, body, self.get_environment_variables())
+        if unsubstituted_fields:
+            return details, body, (
+                "Error: Unsubstituted environment variables found in fields: " +
+                ", ".join(unsubstituted_fields) +
+                ". Please define the missing variables."
+            )
+
+        if not details["protoset"] or not details["server"] or not details["method"]:
+            return details, body, "Error: Missing required fields (Protoset, Server, or Call Name).\n"
+
+        # A workspace is called with the one protoset that defines the method.
+        if is_workspace(details["protoset"]):
+            workspace_path = details["protoset"]
+            workspace, current = self.protoset_parser.peek_workspace(workspace_path)
+            if not current:
+                # Reload on the task worker; meanwhile calls are routed with the last load.
+                self.run_background_task(lambda: self.protoset_parser.get_workspace(workspace_path), lambda result, error: None)
+            if workspace is None:
+                return details, body, f"Error: The protoset workspace {workspace_path} is still loading, try again in a moment.\n"
+            details["protoset"] = workspace.protoset_for(details["method"])
+            if not details["protoset"]:
+                return details, body, f"Error: No protoset in {workspace_path} defines {details['method']}.\n"
+        return details, body, None
+
+    def get_environment_variables(self):
+        """The variables of the selected environment, with nested references expanded."""
+        selected_env = self.view.get_selected_environment()
+        return self.env_model.get_resolved_environment(selected_env) if selected_env else {}
+
+    def handle_reflection_toggle(self, refresh=False):
+        """
+        Point the protoset at the server's descriptors, fetched with reflection and cached
+        on disk, so the method list, body form and calls all use them. Unticking puts the
+        user's protoset back.
+        """
+        if not refresh and not self.view.use_reflection_var.get():
+            self.view.set_reflection_status("")
+            self.view.restore_protoset()
+            return
+        self.view.use_reflection_var.set(True)
+        details, _, unsubstituted = resolve_call_details(self.view.get_call_details(), "", self.get_environment_variables())
+        if {"server", "cookie", "bearer_token"} & set(unsubstituted):
+            self.view.set_reflection_status("Define the server's environment variables first.")
+            return
+        server = details["server"]
+        plaintext = self.view.plaintext_var.get()
+        if details["cookie"]:
+            headers = [f"Cookie:s={details['cookie']}"]
+        elif details["bearer_token"]:
+            headers = [f"authorization: Bearer {details['bearer_token']}"]
         else:
-            output += f"stdout:\n{stdout}\n"
+            headers = []
+        self.view.set_reflection_status(f"Fetching descriptors from {server}..." if refresh else "Loading descriptors...")
+
+        def on_done(protoset_path, error):
+            if not self.view.use_reflection_var.get():
+                return  # unticked while fetching
+            if error:
+                self.view.set_reflection_status(f"Reflection failed: {error}")
+                return
+            self.view.set_reflection_status(f"Using descriptors from {server}")
+            if refresh:
+                self.protoset_parser.descriptor_cache.invalidate(protoset_path)
+                self.protoset_parser.sidecar_cache.invalidate(protoset_path)
+            self.view.set_reflection_protoset(protoset_path)
+
+        self.run_background_task(
+            lambda: self.reflection_cache.get_protoset(server, plaintext, headers, refresh=refresh),
+            on_done
+        )
+
+    def get_caller(self):
+        """The grpcurl caller, or the in-process engine when it is selected in the view."""
+        if not self.view.in_process_var.get():
+            return self.grpc_caller
+        if self.in_process_caller is None:
+            from grpc_engine import InProcessGrpcCaller  # imports grpcio, so only on first use
+            self.in_process_caller = InProcessGrpcCaller(self.protoset_parser)
+        return self.in_process_caller
+
+    def run_background_task(self, work, on_done, poll_ms=20):
+        """
+        Run work() on the task executor and then on_done(result, error) on the Tk loop.
+        For internal work such as loading files: unlike submit_background() it isn't
+        counted as an in-flight call and can't be cancelled.
+        """
+        future = self.task_executor.submit(work)
+        self.view.after(poll_ms, self._poll_background_task, future, on_done, poll_ms)
+        return future
+
+    def _poll_background_task(self, future, on_done, poll_ms):
+        if not future.done():
+            self.view.after(poll_ms, self._poll_background_task, future, on_done, poll_ms)
+            return
+        error = future.exception()
+        on_done(None if error else future.result(), error)
+
+    def submit_background(self, work, on_done):
+        """
+        Run work(handle) on the call executor and then on_done(handle, result, error) on the
+        Tk loop. The handle lets the Cancel button kill any grpcurl process work starts.
+        """
+        handle = CallHandle()
+        self.in_flight_calls.add(handle)
+        self.call_executor.submit(self._run_in_background, handle, work, on_done)
+        self.view.set_calls_in_flight(len(self.in_flight_calls))
+        if len(self.in_flight_calls) == 1:
+            self.view.after(50, self._poll_call_results)
+        return handle
+
+    def _run_in_background(self, handle, work, on_done):
+        # Runs on a worker thread: never touch the view from here.
+        try:
+            result, error = work(handle), None
+        except Exception as e:
+            result, error = None, e
+        self.call_results.put((handle, on_done, result, error))
+
+    def _poll_call_results(self):
+        while True:
+            try:
+                handle, on_done, result, error = self.call_results.get_nowait()
+            except queue.Empty:
+                break
+            self.in_flight_calls.discard(handle)
+            on_done(handle, result, error)
+        self.view.set_calls_in_flight(len(self.in_flight_calls))
+        if self.in_flight_calls:
+            self.view.after(50, self._poll_call_results)
+
+    def _show_call_result(self, handle, result, error, instrumentation):
+        if error:
+            self.view.display_output(f"Error while running grpcurl: {error}\n")
+            return
+        instrumentation.add_since("hand result to the UI", "worker done")
+        # Large outputs finish rendering in idle callbacks; this covers the first page.
+        with instrumentation.timer.phase("render output"):
+            self.view.display_output(*self._format_call_result(result, handle.cancelled))
+        self._show_instrumentation(instrumentation)
+
+    def _show_instrumentation(self, instrumentation):
+        self.last_instrumentation = instrumentation
+        self.view.show_timings(instrumentation.format())
+
+    def handle_export_timings(self):
+        if not self.last_instrumentation:
+            return
+        path = self.view.ask_timings_export_path()
+        if not path:
+            return
+        try:
+            export_instrumentation(self.last_instrumentation, path)
+        except OSError as e:
+            self.view.display_output(f"Error exporting timings: {e}\n")
+
+    @staticmethod
+    def _format_call_result(result, cancelled=False):
+        """
+        The output for a call as (parts, json_part). stdout is a part of its own, so a
+        large response is never copied into one string, and json_part is its index if
+        it should be shown in the JSON tree.
+        """
+        return_code, stdout, stderr, command = result
+        header = f"Executing command: {' '.join(command)}\n\n"
+        if cancelled:
+            return [header + "Call cancelled.\n"], None
+        if return_code is None or return_code != 0:
+            output = header + f"Command failed with return code {return_code}.\n"
             if stderr.strip():
                 output += f"stderr:\n{stderr}\n"
-        self.view.display_output(output)
+            return [output], None
+        footer = "\n"
+        if stderr.strip():
+            footer += f"stderr:\n{stderr}\n"
+        return [header + "stdout:\n", stdout, footer], 1
+
+    def _start_stream_call(self, caller, call_args, spool_path):
+        command = caller.build_command(*call_args)
+        stream_id = self.view.start_stream(f"Executing command: {' '.join(command)}\n\nstdout:\n")
+
+        def work(handle):
+            spool = open(spool_path, "w") if spool_path else None
+            message_count = 0
+            started_at = time.time()
+            started = time.perf_counter()
+            try:
+                def on_message(message):
+                    nonlocal message_count
+                    message_count += 1
+                    if spool:
+                        spool.write(message)
+                    self.view.push_stream_message(stream_id, message)
+                result = caller.stream_call(*call_args, on_message, handle=handle)
+            finally:
+                if spool:
+                    spool.close()
+            return_code, stderr, command = result
+            summary = f"({message_count} streamed messages{f', spooled to {spool_path}' if spool_path else ''})"
+            self._record_history(call_args, command, summary, stderr, return_code, started_at, time.perf_counter() - started)
+            return result
+
+        def on_done(handle, result, error):
+            if error:
+                footer = f"\nError while running grpcurl: {error}\n"
+            elif handle.cancelled:
+                footer = "\nCall cancelled.\n"
+            else:
+                return_code, stderr, _ = result
+                footer = ""
+                if return_code is None or return_code != 0:
+                    footer += f"\nCommand failed with return code {return_code}.\n"
+                if stderr.strip():
+                    footer += f"stderr:\n{stderr}\n"
+            if spool_path:
+                footer += f"Full stream spooled to {spool_path}\n"
+            self.view.finish_stream(stream_id, footer)
+
+        self.submit_background(work, on_done)
+
+    def handle_load_test(self):
+        index = self.view.get_selected_saved_call()
+        if index is None:
+            self.view.display_output("No saved call selected to load test.\n")
+            return
+        call_info = self.calls_history[index]
+        details = {key: call_info.get(key, "") for key in self.view.get_call_details()}
+        details, body, error = self.resolve_call(details, call_info.get("body", ""))
+        if error:
+            self.view.display_output(error)
+            return
+
+        settings = self.view.get_load_test_settings()
+        try:
+            runs = int(settings["runs"]) if settings["runs"] else None
+            seconds = float(settings["seconds"]) if settings["seconds"] else None
+            concurrency = int(settings["concurrency"]) if settings["concurrency"] else 1
+            caller = self.get_caller()
+            runner = LoadTestRunner(
+                caller,
+                (
+                    self.view.plaintext_var.get(),
+                    details["cookie"],
+                    details["bearer_token"],
+                    details["protoset"],
+                    details["server"],
+                    details["method"],
+                    body
+                ),
+                concurrency=concurrency,
+                # A duration takes precedence over the number of runs.
+                iterations=None if seconds else runs,
+                duration=seconds
+            )
+        except (ValueError, RuntimeError) as e:
+            self.view.display_output(f"Error: {e}\n")
+            return
+
+        limit = f"for {seconds:g}s" if seconds else f"{runs} times"
+        header = f"Load test: {details['method']} on {details['server']}, {limit} at concurrency {runner.concurrency}\n\n"
+        self.view.display_output(header + "Running...\n")
+
+        def work(handle):
+            handle.attach(runner)
+            return runner.run()
+
+        def on_done(handle, report, error):
+            if error:
+                self.view.display_output(header + f"Error: {error}\n")
+            else:
+                status = "Cancelled; partial results:\n\n" if handle.cancelled else ""
+                self.view.display_output(header + status + report.format())
+
+        self.submit_background(work, on_done)
+
+    def handle_fan_out(self):
+        details, _, error = self.resolve_call(self.view.get_call_details(), "")
+        if error:
+            self.view.display_output(error)
+            return
+
+        def on_fields(fields_with_enums, error):
+            if error:
+                self.view.display_output(f"Error reading the protoset: {error}\n")
+                return
+            dialog = self.view.open_fan_out_dialog(f"Call {details['method']} on {details['server']} once per row")
+            dialog.set_on_start(lambda: self._start_fan_out(dialog, details, fields_with_enums))
+
+        self.run_background_task(
+            lambda: self.protoset_parser.get_method_request_fields(details["protoset"], details["method"]),
+            on_fields
+        )
+
+    def _start_fan_out(self, dialog, details, fields_with_enums):
+        settings = dialog.get_settings()
+        try:
+            runner = FanOutRunner(
+                self.get_caller(),
+                (
+                    self.view.plaintext_var.get(),
+                    details["cookie"],
+                    details["bearer_token"],
+                    details["protoset"],
+                    details["server"],
+                    details["method"]
+                ),
+                fields_with_enums,
+                settings["input"],
+                settings["output"],
+                workers=int(settings["workers"]) if settings["workers"] else 4,
+                rate=float(settings["rate"]) if settings["rate"] else None,
+                resume=settings["resume"],
+                get_message_fields=self._message_fields_lookup(details["protoset"])
+            )
+        except (ValueError, RuntimeError) as e:
+            dialog.set_progress(f"Error: {e}")
+            return
+
+        def work(handle):
+            handle.attach(runner)
+            return runner.run()
+
+        def on_done(handle, summary, error):
+            dialog.set_running(False)
+            if error:
+                dialog.set_progress(f"Error: {error}")
+            else:
+                dialog.set_progress(("Cancelled: " if handle.cancelled else "Done: ") + summary)
+
+        def show_progress():
+            if runner.poll() is None and dialog.winfo_exists():
+                dialog.set_progress(runner.format_progress())
+                self.view.after(500, show_progress)
+
+        handle = self.submit_background(work, on_done)
+        dialog.set_on_cancel(handle.cancel)
+        dialog.set_running(True)
+        show_progress()
+
+    def handle_cancel_calls(self):
+        for handle in list(self.in_flight_calls):
+            handle.cancel()
+
+    def shutdown(self):
+        self.handle_cancel_calls()
+        self.call_executor.shutdown(wait=False)
+        self.task_executor.shutdown(wait=False)
+        if self.in_process_caller:
+            self.in_process_caller.close()
 
     def handle_save_call(self):
-        details = self.view.get_call_details()
+        if not self.saved_calls_loaded:
+            self.view.display_output("Saved calls are still loading, try again in a moment.\n")
+            return
+        details = self.view.get_call_details_to_save()
         details["body"] = self.view.get_body_data()
         self.saved_calls_manager.append_call(details)
-        self.calls_history = self.saved_calls_manager.load_saved_calls()
-        self.view.update_saved_calls_list(self.calls_history, self.saved_calls_manager.get_display_text)
+        self.calls_history = self.saved_calls_manager.saved_calls
+        index = len(self.calls_history) - 1
+        self.saved_call_index.add(index, details)
+        # Only the new call can change the filtered list, so check it alone.
+        if self.saved_call_index.matches(index, self.view.get_saved_call_search()):
+            self.view.add_saved_call(self.calls_history, index)
 
     def handle_edit_call(self):
-        selection = self.view.saved_call_list_box.curselection()
-        if not selection:
+        index = self.view.get_selected_saved_call()
+        if index is None:
             self.view.display_output("No saved call selected to edit.\n")
             return
-        index = selection[0]
-        details = self.view.get_call_details()
+        details = self.view.get_call_details_to_save()
         details["body"] = self.view.get_body_data()
         try:
             self.saved_calls_manager.update_call(index, details)
-            self.calls_history = self.saved_calls_manager.load_saved_calls()
-            self.view.update_saved_calls_list(self.calls_history, self.saved_calls_manager.get_display_text)
+            self.calls_history = self.saved_calls_manager.saved_calls
+            self.saved_call_index.update(index, details)
+            # The edit may move the call into or out of the current search.
+            matches = self.saved_call_index.matches(index, self.view.get_saved_call_search())
+            if matches and not self.view.is_saved_call_listed(index):
+                self.view.add_saved_call(self.calls_history, index)
+            elif not matches:
+                self.view.remove_saved_call(index)
+            else:
+                self.view.refresh_saved_call(index)
             self.view.display_output(f"Saved call at index {index} updated successfully.\n")
         except Exception as e:
             self.view.display_output(f"Error updating call: {e}\n")
 
+    def handle_saved_call_search(self, query):
+        rows = self.saved_call_index.search(query)
+        self.view.update_saved_calls_list(self.calls_history, self.saved_calls_manager.get_display_text, rows)
+
     def handle_saved_call_select(self, selection):
         if not selection:
             return
@@ -544,13 +1218,14 @@ class GrpcCallPresenter:
             self.saved_body = None
         protoset_path = call_info.get("protoset", "")
         method_name = call_info.get("method", "")
-        if protoset_path and method_name and os.path.exists(protoset_path):
-            fields_with_enums = self.protoset_parser.get_method_request_fields(protoset_path, method_name)
-            self.view.build_body_fields(fields_with_enums)
-            if self.saved_body:
+        if method_name and protoset_path:
+            def on_built():
+                # The form may be a cached one with other values in it, so fill it even when the body is empty.
                 self.view.populate_body_fields(self.saved_body)
                 self.saved_body = None
 
+            self._load_body_form(protoset_path, method_name, on_built)
+
 class MockMainView(tk.Tk):
     """
     Main application window that holds a Notebook with separate pages.
@@ -590,5 +1265,11 @@ if __name__ == "__main__":
         main_view.model,
         on_change_callback=grpc_presenter.refresh_environment_options
     )
+
+    # Kill any grpcurl processes still running when the window is closed.
+    def on_close():
+        grpc_presenter.shutdown()
+        main_view.destroy()
+    main_view.protocol("WM_DELETE_WINDOW", on_close)
     
     main_view.mainloop()
\ No newline at end of file
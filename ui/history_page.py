@@ -0,0 +1,164 @@
+import time
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+from history_store import CallHistoryStore
+
+
+class HistoryView(ttk.Frame):
+    """Paged viewer for the call history, with filters by method, server, failures and age."""
+    def __init__(self, parent):
+        super().__init__(parent)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        self.method_var = tk.StringVar()
+        self.server_var = tk.StringVar()
+        self.minutes_var = tk.StringVar()
+        self.failures_only_var = tk.BooleanVar(value=False)
+        ttk.Label(filter_frame, text="Method:").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.method_var, width=30).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(filter_frame, text="Server:").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.server_var, width=20).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(filter_frame, text="Last minutes:").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.minutes_var, width=6).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Checkbutton(filter_frame, text="Failures only", variable=self.failures_only_var).pack(side=tk.LEFT)
+        self.search_button = ttk.Button(filter_frame, text="Search")
+        self.search_button.pack(side=tk.LEFT, padx=(8, 0))
+
+        columns = ("time", "method", "server", "return_code", "duration")
+        self.history_tree = ttk.Treeview(self, columns=columns, show="headings", height=15)
+        for column, heading, width in (
+            ("time", "Time", 150),
+            ("method", "Method", 300),
+            ("server", "Server", 180),
+            ("return_code", "Return Code", 90),
+            ("duration", "Duration (ms)", 100)
+        ):
+            self.history_tree.heading(column, text=heading)
+            self.history_tree.column(column, width=width, stretch=column == "method")
+        self.history_tree.pack(fill=tk.BOTH, expand=True)
+
+        page_frame = ttk.Frame(self)
+        page_frame.pack(fill=tk.X, pady=5)
+        self.newer_button = ttk.Button(page_frame, text="< Newer")
+        self.newer_button.pack(side=tk.LEFT)
+        self.older_button = ttk.Button(page_frame, text="Older >")
+        self.older_button.pack(side=tk.LEFT, padx=(5, 0))
+        self.page_label = ttk.Label(page_frame, text="")
+        self.page_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        ttk.Label(self, text="Details:").pack(anchor=tk.W)
+        self.detail_text = tk.Text(self, wrap=tk.WORD, height=12)
+        self.detail_text.pack(fill=tk.BOTH, expand=True)
+
+        self.history_tree.bind("<<TreeviewSelect>>", lambda e: self._on_select())
+
+    def set_on_search(self, handler):
+        self.search_button.config(command=handler)
+
+    def set_on_newer(self, handler):
+        self.newer_button.config(command=handler)
+
+    def set_on_older(self, handler):
+        self.older_button.config(command=handler)
+
+    def set_on_select(self, handler):
+        self._external_select = handler
+
+    def _on_select(self):
+        if hasattr(self, "_external_select") and callable(self._external_select):
+            selection = self.history_tree.selection()
+            if selection:
+                self._external_select(int(selection[0]))
+
+    def get_filters(self):
+        return {
+            "method": self.method_var.get().strip(),
+            "server": self.server_var.get().strip(),
+            "minutes": self.minutes_var.get().strip(),
+            "failures_only": self.failures_only_var.get()
+        }
+
+    def show_page(self, rows, page_text):
+        self.history_tree.delete(*self.history_tree.get_children())
+        for row in rows:
+            started = datetime.fromtimestamp(row["started_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            duration = f"{row['duration_ms']:.0f}" if row["duration_ms"] is not None else ""
+            self.history_tree.insert("", tk.END, iid=str(row["id"]), values=(
+                started, row["method"], row["server"], row["return_code"], duration))
+        self.page_label.config(text=page_text)
+
+    def display_details(self, text):
+        self.detail_text.delete("1.0", tk.END)
+        self.detail_text.insert(tk.END, text)
+
+
+class HistoryPresenter:
+    """Pages through the CallHistoryStore for the HistoryView."""
+    def __init__(self, view: HistoryView, store: CallHistoryStore, page_size=50):
+        self.view = view
+        self.store = store
+        self.page_size = page_size
+        self.filters = {}
+        self.page = []
+        self.page_number = 1
+
+        self.view.set_on_search(self.handle_search)
+        self.view.set_on_newer(self.handle_newer)
+        self.view.set_on_older(self.handle_older)
+        self.view.set_on_select(self.handle_select)
+        self.handle_search()
+
+    def handle_search(self):
+        filters = self.view.get_filters()
+        try:
+            since = time.time() - float(filters["minutes"]) * 60 if filters["minutes"] else None
+        except ValueError:
+            self.view.display_details("Last minutes must be a number.\n")
+            return
+        self.filters = {
+            "method": filters["method"] or None,
+            "server": filters["server"] or None,
+            "failures_only": filters["failures_only"],
+            "since": since
+        }
+        self.page_number = 1
+        self._show(self.store.query(**self.filters, limit=self.page_size))
+
+    def handle_older(self):
+        if not self.page:
+            return
+        rows = self.store.query(**self.filters, before_id=self.page[-1]["id"], limit=self.page_size)
+        if rows:
+            self.page_number += 1
+            self._show(rows)
+
+    def handle_newer(self):
+        if not self.page or self.page_number == 1:
+            self.handle_search()
+            return
+        rows = self.store.query(**self.filters, after_id=self.page[0]["id"], limit=self.page_size)
+        if rows:
+            self.page_number -= 1
+            self._show(rows)
+
+    def _show(self, rows):
+        self.page = rows
+        self.view.show_page(rows, f"Page {self.page_number}" if rows else "No matching calls.")
+
+    def handle_select(self, call_id):
+        record = self.store.get(call_id)
+        if not record:
+            return
+        output = f"Executing command: {record['command']}\n\n"
+        output += f"Return code: {record['return_code']}  Duration: {record['duration_ms']:.0f} ms\n\n"
+        if record["body"]:
+            output += f"body:\n{record['body']}\n\n"
+        if record["stdout"]:
+            output += f"stdout:\n{record['stdout']}\n"
+        if record["stderr"]:
+            output += f"stderr:\n{record['stderr']}\n"
+        self.view.display_details(output)
@@ -0,0 +1,169 @@
+import re
+import sqlite3
+import threading
+import time
+
+SUMMARY_COLUMNS = ("id", "started_at", "method", "server", "return_code", "duration_ms")
+
+# Cookie and bearer token header values, as grpcurl and the in-process engine show them.
+_SECRET_HEADER = re.compile(r"(?i)\b(cookie:\s*s=|authorization:\s*bearer\s+)\S+")
+
+
+def redact_command(command):
+    """The command with cookie and bearer token values masked, so credentials aren't kept in the history."""
+    return _SECRET_HEADER.sub(r"\1***", command) if command else command
+
+
+class CallHistoryStore:
+    """
+    Records every executed call in a local SQLite database.
+
+    Lookups by method, server and time are indexed, and results are paged with keyset
+    pagination (WHERE id < ?), so a page costs the same however long the history gets
+    and nothing is ever loaded all at once. Old entries are evicted by age, by total
+    row count and by the size of the database, and stdout and stderr are stored cut
+    to max_output_chars, so one huge response can't push out everything else. Safe to
+    use from worker threads.
+    """
+    def __init__(self, path="call_history.db", max_rows=100000, max_age_days=30, evict_every=100,
+                 max_bytes=512 * 1024 * 1024, max_output_chars=1024 * 1024):
+        self.path = path
+        self.max_rows = max_rows
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.max_output_chars = max_output_chars
+        self.evict_every = evict_every
+        self._records_since_evict = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at REAL NOT NULL,
+                    duration_ms REAL,
+                    method TEXT,
+                    server TEXT,
+                    protoset TEXT,
+                    command TEXT,
+                    body TEXT,
+                    stdout TEXT,
+                    stderr TEXT,
+                    return_code INTEGER
+                )
+            """)
+            self._connection.execute("CREATE INDEX IF NOT EXISTS calls_method_time ON calls (method, started_at)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS calls_server_time ON calls (server, started_at)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS calls_time ON calls (started_at)")
+        self.evict()
+
+    def record(self, method, server, protoset, command, body, stdout, stderr, return_code, started_at, duration):
+        """
+        Store one execution. started_at is a Unix timestamp and duration is in seconds.
+        Cookie and bearer token values are masked in the stored command, and stdout and
+        stderr are cut to max_output_chars.
+        """
+        command = redact_command(command)
+        stdout = self._truncate(stdout)
+        stderr = self._truncate(stderr)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO calls (started_at, duration_ms, method, server, protoset, command, body, stdout, stderr, return_code) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started_at, duration * 1000, method, server, protoset, command, body, stdout, stderr, return_code)
+            )
+            self._records_since_evict += 1
+            evict = self._records_since_evict >= self.evict_every
+        if evict:
+            self.evict()
+        return cursor.lastrowid
+
+    def _truncate(self, text):
+        if not self.max_output_chars or not text or len(text) <= self.max_output_chars:
+            return text
+        return text[:self.max_output_chars] + f"\n[{len(text) - self.max_output_chars} more characters not stored]\n"
+
+    def query(self, method=None, server=None, failures_only=False, since=None, before_id=None, after_id=None, limit=50):
+        """
+        Return one page of call summaries (newest first) as dicts with SUMMARY_COLUMNS.
+        Pass the last id of a page as before_id for the next (older) page, or the first
+        id as after_id for the previous (newer) page.
+        """
+        conditions = []
+        params = []
+        if method:
+            conditions.append("method = ?")
+            params.append(method)
+        if server:
+            conditions.append("server = ?")
+            params.append(server)
+        if failures_only:
+            conditions.append("(return_code IS NULL OR return_code != 0)")
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(since)
+        if before_id is not None:
+            conditions.append("id < ?")
+            params.append(before_id)
+        if after_id is not None:
+            conditions.append("id > ?")
+            params.append(after_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Newer pages are fetched oldest first so the LIMIT keeps the rows next to after_id.
+        order = "ASC" if after_id is not None else "DESC"
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM calls {where} ORDER BY id {order} LIMIT ?"
+        with self._lock:
+            rows = [dict(row) for row in self._connection.execute(sql, (*params, limit))]
+        if after_id is not None:
+            rows.reverse()
+        return rows
+
+    def get(self, call_id):
+        """Return the full record for one call, or None."""
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM calls WHERE id = ?", (call_id,)).fetchone()
+        return dict(row) if row else None
+
+    def recent_methods(self, limit=20):
+        """Return the most recently called distinct methods, newest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT method FROM calls GROUP BY method ORDER BY MAX(id) DESC LIMIT ?", (limit,)).fetchall()
+        return [row["method"] for row in rows]
+
+    def evict(self, batch=100):
+        """
+        Delete entries older than max_age_days, the oldest entries beyond max_rows, and
+        then the oldest entries, batch at a time, until the database holds no more than
+        max_bytes.
+        """
+        with self._lock, self._connection:
+            self._records_since_evict = 0
+            if self.max_age_days:
+                self._connection.execute(
+                    "DELETE FROM calls WHERE started_at < ?", (time.time() - self.max_age_days * 86400,))
+            if self.max_rows:
+                row = self._connection.execute(
+                    "SELECT id FROM calls ORDER BY id DESC LIMIT 1 OFFSET ?", (self.max_rows,)).fetchone()
+                if row:
+                    self._connection.execute("DELETE FROM calls WHERE id <= ?", (row["id"],))
+            if self.max_bytes:
+                while self._used_bytes() > self.max_bytes:
+                    deleted = self._connection.execute(
+                        "DELETE FROM calls WHERE id IN (SELECT id FROM calls ORDER BY id LIMIT ?)", (batch,)).rowcount
+                    if not deleted:
+                        break
+
+    def _used_bytes(self):
+        # Pages in use, not the file size: deleted rows leave free pages that are reused
+        # rather than returned, and counting pages avoids reading every row's text.
+        page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._connection.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = self._connection.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,102 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog
+from phase_timer import PhaseTimer
+
+
+class CallInstrumentation:
+    """
+    Timing breakdown of one call, from substituting variables to rendering the output,
+    and optionally a cProfile capture of the part that runs on the worker thread.
+    """
+    def __init__(self, method, profile=False):
+        self.method = method
+        self.started_at = time.time()
+        self.timer = PhaseTimer()
+        self.profiler = cProfile.Profile() if profile else None
+        self.profile_text = ""
+        self._marks = {}
+
+    def mark(self, name):
+        """Remember when something happened, e.g. when work was queued."""
+        self._marks[name] = time.perf_counter()
+
+    def add_since(self, phase, mark):
+        """Record the time since mark as a phase."""
+        if mark in self._marks:
+            self.timer.add(phase, time.perf_counter() - self._marks[mark])
+
+    def run(self, func, *args, **kwargs):
+        """Call func, under the profiler if profiling was asked for."""
+        if not self.profiler:
+            return func(*args, **kwargs)
+        try:
+            return self.profiler.runcall(func, *args, **kwargs)
+        finally:
+            stream = io.StringIO()
+            pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(30)
+            self.profile_text = stream.getvalue()
+
+    def format(self):
+        text = self.timer.format(f"Timings for {self.method}")
+        if self.profile_text:
+            text += "\ncProfile of the worker thread (top 30 by cumulative time):\n" + self.profile_text
+        return text
+
+    def to_dict(self):
+        return {
+            "method": self.method,
+            "started_at": self.started_at,
+            **self.timer.to_dict(),
+            "profile": self.profile_text
+        }
+
+
+class InstrumentationPanel(ttk.Frame):
+    """Collapsible panel under the output showing the last call's timings."""
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.profile_next_var = tk.BooleanVar(value=False)
+        header = ttk.Frame(self)
+        header.pack(fill=tk.X)
+        self.toggle_button = ttk.Button(header, text="+ Timings", width=0, command=self.toggle)
+        self.toggle_button.pack(side=tk.LEFT)
+        self.export_button = ttk.Button(header, text="Export JSON...", state=tk.DISABLED)
+        self.export_button.pack(side=tk.RIGHT)
+        ttk.Checkbutton(header, text="Profile next call (cProfile)", variable=self.profile_next_var).pack(side=tk.RIGHT, padx=(0, 10))
+        self.text = tk.Text(self, wrap=tk.NONE, height=10)
+        self._expanded = False
+
+    def toggle(self):
+        self._expanded = not self._expanded
+        if self._expanded:
+            self.text.pack(fill=tk.BOTH, expand=True)
+        else:
+            self.text.pack_forget()
+        self.toggle_button.config(text=f"{'-' if self._expanded else '+'} Timings")
+
+    def set_on_export(self, handler):
+        self.export_button.config(command=handler)
+
+    def take_profile_request(self):
+        """True if the next call should be profiled. Profiling is one-shot, so this clears the box."""
+        requested = self.profile_next_var.get()
+        self.profile_next_var.set(False)
+        return requested
+
+    def show(self, text):
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, text)
+        self.export_button.config(state=tk.NORMAL)
+
+    def ask_export_path(self):
+        return filedialog.asksaveasfilename(parent=self, defaultextension=".json", filetypes=[("JSON", "*.json")])
+
+
+def export_instrumentation(instrumentation: CallInstrumentation, path):
+    with open(path, "w") as f:
+        json.dump(instrumentation.to_dict(), f, indent=4)
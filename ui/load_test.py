@@ -0,0 +1,157 @@
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from grpc_caller import CancellableRun
+
+_STATUS_CODE_PATTERN = re.compile(r"Code:\s*(\w+)")
+
+
+def status_of(return_code, stderr):
+    """Name the outcome of a call the way grpcurl reports it, e.g. OK, NotFound or Unavailable."""
+    if return_code == 0:
+        return "OK"
+    match = _STATUS_CODE_PATTERN.search(stderr or "")
+    if match:
+        return match.group(1)
+    return f"exit {return_code}" if return_code is not None else "failed to start"
+
+
+class LoadTestReport:
+    """
+    Summary of a load test: throughput, latency percentiles, errors by status and a
+    latency histogram. worker_errors lists the exceptions that stopped a worker early.
+    """
+    def __init__(self, latencies, statuses: Counter, wall_time, concurrency, worker_errors=()):
+        self.latencies = sorted(latencies)
+        self.statuses = statuses
+        self.wall_time = wall_time
+        self.concurrency = concurrency
+        self.worker_errors = list(worker_errors)
+
+    @property
+    def total(self):
+        return len(self.latencies)
+
+    @property
+    def failures(self):
+        return self.total - self.statuses.get("OK", 0)
+
+    @property
+    def throughput(self):
+        return self.total / self.wall_time if self.wall_time > 0 else 0.0
+
+    def percentile(self, percent):
+        if not self.latencies:
+            return 0.0
+        rank = max(1, int(round(percent / 100.0 * len(self.latencies))))
+        return self.latencies[min(rank, len(self.latencies)) - 1]
+
+    def histogram(self, buckets=10):
+        """Return [(upper bound, count)] over equal-width latency buckets."""
+        if not self.latencies:
+            return []
+        low, high = self.latencies[0], self.latencies[-1]
+        width = (high - low) / buckets or 1e-9
+        counts = [0] * buckets
+        for latency in self.latencies:
+            counts[min(int((latency - low) / width), buckets - 1)] += 1
+        return [(low + width * (i + 1), count) for i, count in enumerate(counts)]
+
+    def format(self):
+        lines = [
+            f"Requests: {self.total} ({self.failures} failed) at concurrency {self.concurrency}",
+            f"Duration: {self.wall_time:.2f}s  Throughput: {self.throughput:.1f} req/s",
+        ]
+        if self.latencies:
+            lines.append(
+                "Latency (ms): "
+                f"p50 {self.percentile(50) * 1000:.1f}  "
+                f"p90 {self.percentile(90) * 1000:.1f}  "
+                f"p99 {self.percentile(99) * 1000:.1f}  "
+                f"max {self.latencies[-1] * 1000:.1f}"
+            )
+        lines.append("")
+        lines.append("Status codes:")
+        for status, count in self.statuses.most_common():
+            lines.append(f"  {status}: {count}")
+        if self.worker_errors:
+            lines.append("")
+            lines.append(f"Worker errors ({len(self.worker_errors)} of {self.concurrency} workers stopped early):")
+            for error in self.worker_errors:
+                lines.append(f"  {type(error).__name__}: {error}")
+        histogram = self.histogram()
+        if histogram:
+            lines.append("")
+            lines.append("Latency histogram (ms):")
+            peak = max(count for _, count in histogram)
+            for upper, count in histogram:
+                bar = "#" * (round(40 * count / peak) if peak else 0)
+                lines.append(f"  <= {upper * 1000:9.1f}  {count:7d}  {bar}")
+        return "\n".join(lines) + "\n"
+
+
+class LoadTestRunner(CancellableRun):
+    """
+    Runs one call repeatedly with a fixed number of concurrent workers, either a set
+    number of times or for a set number of seconds, and collects a LoadTestReport.
+
+    The runner can be attached to a CallHandle: cancelling the handle stops new
+    requests and kills the ones in flight.
+    """
+    def __init__(self, caller, call_args, concurrency=1, iterations=None, duration=None):
+        if not iterations and not duration:
+            raise ValueError("A load test needs a number of runs or a duration.")
+        super().__init__()
+        self.caller = caller
+        self.call_args = call_args
+        self.concurrency = max(1, concurrency)
+        self.iterations = iterations
+        self.duration = duration
+        self._started = 0
+        self._latencies = []
+        self._statuses = Counter()
+
+    def run(self):
+        start = time.perf_counter()
+        deadline = start + self.duration if self.duration else None
+        worker_errors = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="load-test") as executor:
+            futures = [executor.submit(self._worker, deadline) for _ in range(self.concurrency)]
+            for future in futures:
+                # A worker that raised has stopped; the others carry on and the error is reported.
+                try:
+                    future.result()
+                except Exception as e:
+                    worker_errors.append(e)
+        self._done = True
+        return LoadTestReport(self._latencies, self._statuses, time.perf_counter() - start, self.concurrency, worker_errors)
+
+    def _next_request(self, deadline):
+        with self._lock:
+            if self._cancelled:
+                return None
+            if self.iterations and self._started >= self.iterations:
+                return None
+            if deadline and time.perf_counter() >= deadline:
+                return None
+            self._started += 1
+            return self._add_handle()
+
+    def _worker(self, deadline):
+        while True:
+            handle = self._next_request(deadline)
+            if handle is None:
+                return
+            started = time.perf_counter()
+            try:
+                return_code, _, stderr, _ = self.caller.execute_call(*self.call_args, handle=handle)
+            finally:
+                with self._lock:
+                    self._remove_handle(handle)
+            latency = time.perf_counter() - started
+            with self._lock:
+                if handle.cancelled:
+                    continue
+                self._latencies.append(latency)
+                self._statuses[status_of(return_code, stderr)] += 1
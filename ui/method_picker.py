@@ -0,0 +1,230 @@
+import bisect
+import heapq
+import tkinter as tk
+from tkinter import ttk
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class MethodIndex:
+    """
+    Search index over a protoset's method names, built once per protoset.
+
+    Every method is reachable by prefix of its full name, of Service.Method and of the
+    bare method name (bisection over a sorted key list), and by substring through a
+    trigram index, so a keystroke only looks at the names that can match. Words shorter
+    than a trigram only match prefixes. Queries are case-insensitive, and
+    space-separated words must all match.
+    """
+    def __init__(self, call_names):
+        self.names = list(call_names)
+        self._known = set(self.names)
+        self._lowered = [name.lower() for name in self.names]
+        self._prefix_keys = []  # sorted (key, name id)
+        self._trigrams = {}     # trigram -> set of name ids
+        for name_id, lowered in enumerate(self._lowered):
+            parts = lowered.split(".")
+            for start in {0, max(len(parts) - 2, 0), len(parts) - 1}:
+                self._prefix_keys.append((".".join(parts[start:]), name_id))
+            for trigram in _trigrams(lowered):
+                self._trigrams.setdefault(trigram, set()).add(name_id)
+        self._prefix_keys.sort()
+
+    def _prefix_matches(self, prefix):
+        matches = set()
+        position = bisect.bisect_left(self._prefix_keys, (prefix, -1))
+        while position < len(self._prefix_keys) and self._prefix_keys[position][0].startswith(prefix):
+            matches.add(self._prefix_keys[position][1])
+            position += 1
+        return matches
+
+    def _word_matches(self, word):
+        if len(word) < 3:
+            return self._prefix_matches(word)
+        candidates = None
+        for trigram in _trigrams(word):
+            ids = self._trigrams.get(trigram, set())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return set()
+        return {name_id for name_id in candidates if word in self._lowered[name_id]}
+
+    def _score(self, name_id, words):
+        """Lower is better: exact method, method prefix, other prefix, word boundary, anywhere."""
+        lowered = self._lowered[name_id]
+        method = lowered.rsplit(".", 1)[-1]
+        score = 0
+        for word in words:
+            if method == word or lowered == word:
+                continue
+            if method.startswith(word):
+                score += 1
+            elif lowered.startswith(word) or f".{word}" in lowered:
+                score += 2
+            elif f"_{word}" in lowered:
+                score += 3
+            else:
+                score += 4
+        return score
+
+    def search(self, query, limit=100, recent=()):
+        """
+        Return up to limit method names matching query, best first. Methods in recent
+        (most recently used first) rank ahead of equally good matches and are listed
+        first when the query is empty.
+        """
+        recent_rank = {name: rank for rank, name in enumerate(recent)}
+        words = query.lower().split()
+        if not words:
+            known = [name for name in recent if name in self._known]
+            rest = (name for name in self.names if name not in recent_rank)
+            return (known + [name for _, name in zip(range(limit), rest)])[:limit]
+
+        matches = None
+        for word in words:
+            ids = self._word_matches(word)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        def rank(name_id):
+            name = self.names[name_id]
+            score = self._score(name_id, words)
+            if name in recent_rank:
+                score -= 2
+            return score, recent_rank.get(name, len(recent_rank)), len(name), name
+
+        return [self.names[name_id] for name_id in heapq.nsmallest(limit, matches, key=rank)]
+
+    def __contains__(self, name):
+        return name in self._known
+
+
+class MethodPicker(ttk.Frame):
+    """
+    Type-ahead replacement for a readonly method Combobox.
+
+    variable holds the chosen method and is only written when a method is picked
+    (Enter, click, or leaving the entry on a match), so handlers traced on it aren't
+    fired per keystroke. Typing filters a popup list through a MethodIndex; Up/Down
+    move through it and Escape puts the chosen method back.
+    """
+    def __init__(self, parent, variable, width=48, height=12, max_recent=20):
+        super().__init__(parent)
+        self.variable = variable
+        self.height = height
+        self.max_recent = max_recent
+        self.index = MethodIndex([])
+        self.recent = []
+        self.query_var = tk.StringVar()
+        self._showing_choice = False
+
+        self.entry = ttk.Entry(self, textvariable=self.query_var, width=width)
+        self.entry.pack(fill=tk.X)
+        self.popup = tk.Toplevel(self)
+        self.popup.withdraw()
+        self.popup.overrideredirect(True)
+        self.listbox = tk.Listbox(self.popup, height=height, exportselection=False, activestyle=tk.NONE)
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+
+        self.variable.trace_add("write", lambda *args: self._show_choice())
+        self.query_var.trace_add("write", lambda *args: self._on_query_change())
+        self.entry.bind("<FocusIn>", lambda e: self._on_focus_in())
+        self.entry.bind("<FocusOut>", lambda e: self.after(100, self._on_focus_out))
+        self.entry.bind("<Down>", lambda e: self._move(1))
+        self.entry.bind("<Up>", lambda e: self._move(-1))
+        self.entry.bind("<Return>", lambda e: self._pick_active())
+        self.entry.bind("<Escape>", lambda e: self._revert())
+        self.listbox.bind("<ButtonRelease-1>", lambda e: self._pick_active())
+        self.listbox.bind("<FocusOut>", lambda e: self.after(100, self._on_focus_out))
+
+    def set_names(self, call_names, index=None):
+        """Replace the method list. Pass a prebuilt MethodIndex to avoid building it here."""
+        self.index = index if index is not None else MethodIndex(call_names)
+
+    def set_recent(self, methods):
+        self.recent = list(dict.fromkeys(methods))[:self.max_recent]
+
+    def note_used(self, method):
+        self.recent = [method] + [name for name in self.recent if name != method][:self.max_recent - 1]
+
+    def set_enabled(self, enabled):
+        self.entry.config(state=tk.NORMAL if enabled else tk.DISABLED)
+        if not enabled:
+            self._hide_popup()
+
+    def _show_choice(self):
+        self._showing_choice = True
+        self.query_var.set(self.variable.get())
+        self._showing_choice = False
+
+    def _on_focus_in(self):
+        self.entry.select_range(0, tk.END)
+        self._filter("")
+
+    def _on_focus_out(self):
+        if self.focus_get() in (self.entry, self.listbox):
+            return
+        query = self.query_var.get().strip()
+        if query != self.variable.get() and query in self.index:
+            self._pick(query)
+        else:
+            self._revert()
+
+    def _on_query_change(self):
+        if not self._showing_choice and str(self.entry.cget("state")) != tk.DISABLED:
+            self._filter(self.query_var.get())
+
+    def _filter(self, query):
+        matches = self.index.search(query, recent=self.recent)
+        self.listbox.delete(0, tk.END)
+        if not matches:
+            self._hide_popup()
+            return
+        self.listbox.insert(tk.END, *matches)
+        self.listbox.config(height=min(self.height, len(matches)))
+        self.listbox.selection_set(0)
+        self.listbox.activate(0)
+        self.popup.geometry(f"{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}"
+                            f"+{self.entry.winfo_rootx()}+{self.entry.winfo_rooty() + self.entry.winfo_height()}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def _move(self, step):
+        if not self.popup.winfo_viewable():
+            self._filter(self.query_var.get())
+            return "break"
+        size = self.listbox.size()
+        if size:
+            current = self.listbox.curselection()
+            position = min(max((current[0] if current else -1) + step, 0), size - 1)
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(position)
+            self.listbox.activate(position)
+            self.listbox.see(position)
+        return "break"
+
+    def _pick_active(self):
+        selection = self.listbox.curselection()
+        if self.popup.winfo_viewable() and selection:
+            self._pick(self.listbox.get(selection[0]))
+        return "break"
+
+    def _pick(self, method):
+        self._hide_popup()
+        self.note_used(method)
+        if method == self.variable.get():
+            self._show_choice()
+        else:
+            self.variable.set(method)
+        self.entry.icursor(tk.END)
+
+    def _revert(self):
+        self._hide_popup()
+        self._show_choice()
+        return "break"
+
+    def _hide_popup(self):
+        self.popup.withdraw()
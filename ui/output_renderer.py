@@ -0,0 +1,220 @@
+import codecs
+import json
+import tempfile
+import tkinter as tk
+from tkinter import ttk
+
+
+def _format_size(chars):
+    if chars < 1024 * 1024:
+        return f"{chars / 1024:.0f} KB"
+    return f"{chars / (1024 * 1024):.1f} MB"
+
+
+def parse_json_messages(text):
+    """
+    Parse grpcurl output, which is one JSON message or several back to back.
+    Returns the message, a list of the messages if there are several, or None if text isn't JSON.
+    """
+    decoder = json.JSONDecoder()
+    messages = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        try:
+            message, position = decoder.raw_decode(text, position)
+        except json.JSONDecodeError:
+            return None
+        messages.append(message)
+        while position < len(text) and text[position].isspace():
+            position += 1
+    if not messages:
+        return None
+    return messages[0] if len(messages) == 1 else messages
+
+
+class ChunkedTextRenderer:
+    """
+    Renders text into a Text widget a page at a time, so a huge response never blocks Tk.
+
+    The first page is inserted straight away and the rest on idle callbacks, up to
+    max_auto_chars. Past that a "Show more" link appends the next batch on request. The
+    full text is kept outside the widget: in memory, or spilled to a temporary file when
+    it is longer than spill_chars. The text can be given as a list of parts, which are
+    spilled one by one rather than joined first, and read back individually with
+    read_part(), e.g. to parse the response in it.
+    """
+    def __init__(self, text_widget: tk.Text, chunk_chars=64 * 1024, max_auto_chars=1024 * 1024, spill_chars=4 * 1024 * 1024):
+        self.text_widget = text_widget
+        self.chunk_chars = chunk_chars
+        self.max_auto_chars = max_auto_chars
+        self.spill_chars = spill_chars
+        self._generation = 0
+        self._text = None
+        self._spill_file = None
+        self._decoder = None
+        self._length = 0
+        self._spans = []  # (start, end) of each part, in characters or, once spilled, bytes
+        self._rendered = 0
+        self._batch_limit = 0
+        self.text_widget.tag_configure("show_more", foreground="blue", underline=True)
+        self.text_widget.tag_bind("show_more", "<Button-1>", lambda e: self.show_more())
+        self.text_widget.tag_bind("show_more", "<Enter>", lambda e: self.text_widget.config(cursor="hand2"))
+        self.text_widget.tag_bind("show_more", "<Leave>", lambda e: self.text_widget.config(cursor=""))
+
+    def render(self, text):
+        """Replace the widget's contents with text, a string or a list of strings shown back to back."""
+        self.clear()
+        parts = [text] if isinstance(text, str) else list(text)
+        self._length = sum(len(part) for part in parts)
+        if self._length > self.spill_chars:
+            self._spill_file = tempfile.TemporaryFile()
+            for part in parts:
+                start = self._spill_file.tell()
+                # Encoded a chunk at a time, so a huge part isn't copied whole.
+                for offset in range(0, len(part), self.chunk_chars):
+                    self._spill_file.write(part[offset:offset + self.chunk_chars].encode("utf-8"))
+                self._spans.append((start, self._spill_file.tell()))
+            self._spill_file.seek(0)
+            self._decoder = codecs.getincrementaldecoder("utf-8")()
+        else:
+            start = 0
+            for part in parts:
+                self._spans.append((start, start + len(part)))
+                start += len(part)
+            self._text = "".join(parts)
+        self._batch_limit = self.max_auto_chars
+        self._render_next(self._generation)
+
+    def read_part(self, index):
+        """The text of one part given to the last render(), or None if there is no such part."""
+        if not 0 <= index < len(self._spans):
+            return None
+        start, end = self._spans[index]
+        if self._spill_file is None:
+            return self._text[start:end]
+        # Leave the file where rendering will carry on reading.
+        position = self._spill_file.tell()
+        try:
+            self._spill_file.seek(start)
+            return self._spill_file.read(end - start).decode("utf-8")
+        finally:
+            self._spill_file.seek(position)
+
+    def show_more(self):
+        """Append the next batch of max_auto_chars after the user asked for it."""
+        self._remove_link()
+        self._batch_limit = self._rendered + self.max_auto_chars
+        self._render_next(self._generation)
+
+    def clear(self):
+        """Stop rendering, empty the widget and release the buffered text."""
+        self._generation += 1
+        self._text = None
+        if self._spill_file:
+            self._spill_file.close()
+            self._spill_file = None
+        self._length = self._rendered = 0
+        self._spans = []
+        self.text_widget.delete("1.0", tk.END)
+
+    def _read(self, size):
+        if self._spill_file is None:
+            chunk = self._text[self._rendered:self._rendered + size]
+        else:
+            # Characters and UTF-8 bytes differ, so read bytes and let the decoder keep
+            # any character split across chunks for the next read.
+            data = self._spill_file.read(size)
+            chunk = self._decoder.decode(data, final=not data)
+        return chunk
+
+    def _render_next(self, generation):
+        if generation != self._generation or self._rendered >= self._length:
+            return
+        if self._rendered >= self._batch_limit:
+            self._insert_link()
+            return
+        chunk = self._read(self.chunk_chars)
+        if not chunk:
+            return
+        self.text_widget.insert(tk.END, chunk)
+        self._rendered += len(chunk)
+        self.text_widget.after_idle(self._render_next, generation)
+
+    def _insert_link(self):
+        self.text_widget.insert(
+            tk.END,
+            f"\n[Show more: {_format_size(self._rendered)} of {_format_size(self._length)} shown]\n",
+            "show_more"
+        )
+
+    def _remove_link(self):
+        ranges = self.text_widget.tag_ranges("show_more")
+        if ranges:
+            self.text_widget.delete(ranges[0], ranges[-1])
+
+
+class JsonTreeView(ttk.Frame):
+    """
+    Collapsible tree of a JSON value. A node's children are only created when it is
+    first expanded, at most page_size at a time, so even huge responses load instantly.
+    """
+    def __init__(self, parent, page_size=200):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._pending = {}  # node id -> (container, first child index) not yet expanded
+        self.tree = ttk.Treeview(self, columns=("value",), height=15)
+        self.tree.heading("#0", text="Key")
+        self.tree.heading("value", text="Value")
+        self.tree.column("#0", width=250, stretch=False)
+        self.tree.column("value", width=500)
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind("<<TreeviewOpen>>", lambda e: self._on_open())
+
+    def load(self, value):
+        self.clear()
+        if isinstance(value, (dict, list)):
+            self._insert_page("", value, 0)
+        else:
+            self.tree.insert("", tk.END, text="(value)", values=(json.dumps(value),))
+
+    def show_message(self, message):
+        self.clear()
+        self.tree.insert("", tk.END, text=message)
+
+    def clear(self):
+        self._pending.clear()
+        self.tree.delete(*self.tree.get_children())
+
+    def _insert_page(self, parent, container, start):
+        items = list(container.items()) if isinstance(container, dict) else list(enumerate(container))
+        end = start + self.page_size
+        for key, value in items[start:end]:
+            if isinstance(value, dict):
+                summary = f"{{{len(value)} fields}}"
+            elif isinstance(value, list):
+                summary = f"[{len(value)} items]"
+            else:
+                summary = json.dumps(value)
+            node = self.tree.insert(parent, tk.END, text=f"[{key}]" if isinstance(key, int) else key, values=(summary,))
+            if isinstance(value, (dict, list)) and value:
+                self._add_placeholder(node, value, 0)
+        if end < len(items):
+            more = self.tree.insert(parent, tk.END, text=f"... {len(items) - end} more", values=("",))
+            self._add_placeholder(more, container, end)
+
+    def _add_placeholder(self, node, container, start):
+        # A dummy child gives the node an expand arrow until it is really opened.
+        self.tree.insert(node, tk.END, text="")
+        self._pending[node] = (container, start)
+
+    def _on_open(self):
+        node = self.tree.focus()
+        if node not in self._pending:
+            return
+        container, start = self._pending.pop(node)
+        self.tree.delete(*self.tree.get_children(node))
+        self._insert_page(node, container, start)
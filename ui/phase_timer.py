@@ -0,0 +1,45 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """Records how long each named phase of some work took, e.g. for --profile-startup."""
+    def __init__(self):
+        self.phases = []  # (name, seconds) in the order they finished
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        # Phases may finish on worker threads.
+        with self._lock:
+            self.phases.append((name, seconds))
+
+    def total(self):
+        with self._lock:
+            return sum(seconds for _, seconds in self.phases)
+
+    def to_dict(self):
+        with self._lock:
+            phases = list(self.phases)
+        return {
+            "phases": [{"name": name, "ms": round(seconds * 1000, 3)} for name, seconds in phases],
+            "total_ms": round(sum(seconds for _, seconds in phases) * 1000, 3)
+        }
+
+    def format(self, title="Phase timings"):
+        with self._lock:
+            phases = list(self.phases)
+        width = max([len(name) for name, _ in phases] + [5])
+        lines = [f"{title}:"]
+        for name, seconds in phases:
+            lines.append(f"  {name:<{width}}  {seconds * 1000:9.1f} ms")
+        lines.append(f"  {'total':<{width}}  {sum(seconds for _, seconds in phases) * 1000:9.1f} ms")
+        return "\n".join(lines) + "\n"
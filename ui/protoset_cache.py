@@ -0,0 +1,75 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+def parse_descriptor_set(data: bytes):
+    """Parse the raw bytes of a protoset into a FileDescriptorSet."""
+    from google.protobuf import descriptor_pb2  # deferred: importing protobuf is slow
+    fds = descriptor_pb2.FileDescriptorSet()
+    fds.ParseFromString(data)
+    return fds
+
+
+class DescriptorSetCache:
+    """
+    Keeps parsed protosets in memory so each file is only parsed once per change on disk.
+
+    Entries are keyed by path and validated against the file's mtime and size, so an
+    edited protoset is re-parsed on the next lookup. The least recently used entries
+    are evicted once either the entry count or the memory cap is exceeded. The memory
+    cap is measured in serialized protoset bytes, which is a good proxy for the size
+    of the parsed objects.
+    """
+    def __init__(self, max_entries=8, max_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, value)
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+
+    def get(self, path, loader=parse_descriptor_set):
+        """
+        Return the cached value for the protoset at path, calling loader(bytes) to
+        build it if the file is new or has changed since it was last loaded.
+        Raises OSError if the file cannot be read.
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        with open(key, "rb") as f:
+            value = loader(f.read())
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, value)
+            self._total_bytes += stat.st_size
+            self._evict()
+        return value
+
+    def invalidate(self, path=None):
+        """Drop a single protoset from the cache, or everything if no path is given."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            else:
+                self._discard(os.path.abspath(path))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._total_bytes -= entry[1]
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds the memory cap.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._total_bytes -= size
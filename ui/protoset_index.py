@@ -0,0 +1,127 @@
+import threading
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+
+class ProtosetIndex:
+    """
+    Symbol index built once per parsed FileDescriptorSet.
+
+    Maps every method's full name (package.Service.Method) to its input and output
+    message descriptors, and every fully qualified type name to its message or enum
+    descriptor, so lookups no longer scan the whole schema. Field lists for a message
+    (including the enum values of its enum fields) are only expanded when asked for.
+    """
+    def __init__(self, fds: descriptor_pb2.FileDescriptorSet):
+        self.fds = fds
+        self.call_names = []
+        self.methods = {}   # call name -> (MethodDescriptorProto, input DescriptorProto, output DescriptorProto)
+        self.messages = {}  # type name -> DescriptorProto
+        self.enums = {}     # type name -> EnumDescriptorProto
+        self._fields_cache = {}
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._build()
+
+    def _build(self):
+        for file_desc in self.fds.file:
+            package = file_desc.package.strip() if file_desc.package else ""
+            self._add_types(package, file_desc.message_type, file_desc.enum_type)
+
+        for file_desc in self.fds.file:
+            package = file_desc.package.strip() if file_desc.package else ""
+            for service in file_desc.service:
+                full_service_name = f"{package}.{service.name}" if package else service.name
+                for method in service.method:
+                    call_name = f"{full_service_name}.{method.name}"
+                    self.call_names.append(call_name)
+                    self.methods[call_name] = (
+                        method,
+                        self.messages.get(method.input_type.lstrip('.')),
+                        self.messages.get(method.output_type.lstrip('.'))
+                    )
+
+    def _add_types(self, prefix, message_list, enum_list):
+        # Iterative so deeply nested schemas can't hit the recursion limit.
+        pending = [(prefix, message_list, enum_list)]
+        while pending:
+            prefix, message_list, enum_list = pending.pop()
+            for msg in message_list:
+                full_msg_name = f"{prefix}.{msg.name}" if prefix else msg.name
+                self.messages[full_msg_name] = msg
+                pending.append((full_msg_name, msg.nested_type, msg.enum_type))
+            for en in enum_list:
+                full_enum_name = f"{prefix}.{en.name}" if prefix else en.name
+                self.enums[full_enum_name] = en
+
+    def get_method(self, call_name):
+        """Return (method, input message, output message) or None if the method is unknown."""
+        return self.methods.get(call_name)
+
+    def get_input_type(self, call_name):
+        method = self.methods.get(call_name)
+        return method[1] if method else None
+
+    def get_output_type(self, call_name):
+        method = self.methods.get(call_name)
+        return method[2] if method else None
+
+    def get_input_type_name(self, call_name):
+        method = self.methods.get(call_name)
+        return method[0].input_type.lstrip('.') if method else ""
+
+    def get_message_fields(self, type_name):
+        """
+        Return [(FieldDescriptorProto, enum_values)] for the message type_name.
+        The result is computed on first request and cached.
+        """
+        type_name = type_name.lstrip('.')
+        fields = self._fields_cache.get(type_name)
+        if fields is not None:
+            return fields
+        message = self.messages.get(type_name)
+        if message is None:
+            return []
+        fields = []
+        for field in message.field:
+            if field.type == descriptor_pb2.FieldDescriptorProto.TYPE_ENUM:
+                enum_descriptor = self.enums.get(field.type_name.lstrip('.'))
+                possible_values = [v.name for v in enum_descriptor.value] if enum_descriptor else []
+                fields.append((field, possible_values))
+            else:
+                fields.append((field, []))
+        self._fields_cache[type_name] = fields
+        return fields
+
+    def get_method_request_fields(self, call_name):
+        return self.get_message_fields(self.get_input_type_name(call_name))
+
+    def get_pool(self) -> descriptor_pool.DescriptorPool:
+        """Build (once) a descriptor pool holding every file in the set, dependencies first."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = self._build_pool()
+        return self._pool
+
+    def _build_pool(self):
+        files = {file_desc.name: file_desc for file_desc in self.fds.file}
+        pool = descriptor_pool.DescriptorPool()
+        added = set()
+        for name in files:
+            # Iterative depth-first walk so deep import chains can't hit the recursion limit.
+            stack = [(name, False)]
+            while stack:
+                current, deps_done = stack.pop()
+                if current in added or current not in files:
+                    continue
+                if deps_done:
+                    pool.Add(files[current])
+                    added.add(current)
+                else:
+                    stack.append((current, True))
+                    stack.extend((dep, False) for dep in files[current].dependency)
+        return pool
+
+    def get_message_class(self, type_name):
+        """Return a generated message class for type_name, for encoding and decoding requests."""
+        descriptor = self.get_pool().FindMessageTypeByName(type_name.lstrip('.'))
+        return message_factory.GetMessageClass(descriptor)
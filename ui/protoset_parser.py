@@ -0,0 +1,121 @@
+import os
+import threading
+from collections import OrderedDict
+from protoset_cache import DescriptorSetCache, parse_descriptor_set
+from protoset_sidecar import SidecarCache
+from protoset_workspace import ProtosetWorkspace, is_workspace, workspace_signature
+
+
+class ProtosetParser:
+    """Handles reading a protoset file and extracting call names and request fields."""
+    def __init__(self, descriptor_cache: DescriptorSetCache = None, sidecar_cache: SidecarCache = None):
+        # Shared by every lookup so a protoset is only parsed and indexed once per change on disk.
+        self.descriptor_cache = descriptor_cache or DescriptorSetCache()
+        # Method names and fields are read from a precompiled index instead, when possible.
+        self.sidecar_cache = sidecar_cache or SidecarCache()
+        # Directories or lists of protosets, merged; only the last few are kept.
+        self.max_workspaces = 2
+        self._workspaces = OrderedDict()
+        self._workspaces_lock = threading.Lock()
+        # Held while loading, so concurrent lookups wait for one load instead of starting their own.
+        self._workspace_load_lock = threading.Lock()
+
+    def get_workspace(self, path):
+        """
+        The merged ProtosetWorkspace for a directory or os.pathsep-separated list of
+        protosets, loading it if needed. Loading starts worker processes, so this
+        should be called off the Tk thread.
+        """
+        workspace, current = self.peek_workspace(path)
+        if current:
+            return workspace
+        with self._workspace_load_lock:
+            workspace, current = self.peek_workspace(path)
+            if current:
+                return workspace
+            workspace = ProtosetWorkspace(path)
+            with self._workspaces_lock:
+                self._workspaces[path] = workspace
+                while len(self._workspaces) > self.max_workspaces:
+                    self._workspaces.popitem(last=False)
+        return workspace
+
+    def peek_workspace(self, path):
+        """
+        The last workspace loaded for path, without loading anything, and whether its
+        protosets are unchanged since. Returns (None, False) if it was never loaded.
+        """
+        signature = workspace_signature(path)
+        with self._workspaces_lock:
+            workspace = self._workspaces.get(path)
+            if workspace is None:
+                return None, False
+            self._workspaces.move_to_end(path)
+            return workspace, workspace.signature == signature
+
+    def get_index(self, protoset_path):
+        if is_workspace(protoset_path):
+            return self.get_workspace(protoset_path).index
+        # protobuf is only imported once a protoset is actually opened, to keep startup fast.
+        from protoset_index import ProtosetIndex
+        return self.descriptor_cache.get(protoset_path, lambda data: ProtosetIndex(parse_descriptor_set(data)))
+
+    def get_lookup_index(self, protoset_path, load=True):
+        """
+        The sidecar index of the protoset, falling back to the fully parsed one if it
+        can't be used. With load=False a workspace is never loaded: the last loaded one
+        is used, and LookupError is raised if there is none.
+        """
+        if is_workspace(protoset_path):
+            if load:
+                return self.get_workspace(protoset_path).index
+            workspace, _ = self.peek_workspace(protoset_path)
+            if workspace is None:
+                raise LookupError(f"The protoset workspace {protoset_path} isn't loaded yet.")
+            return workspace.index
+        try:
+            return self.sidecar_cache.get(protoset_path, self.get_index)
+        except (OSError, ValueError):
+            return self.get_index(protoset_path)
+
+    def route_protoset(self, protoset_path, call_name):
+        """The protoset file to call call_name with: protoset_path itself, or the workspace protoset defining it."""
+        if not is_workspace(protoset_path):
+            return protoset_path
+        return self.get_workspace(protoset_path).protoset_for(call_name)
+
+    def get_version(self, protoset_path):
+        """Something that changes whenever the protoset (or any protoset of a workspace) does."""
+        if is_workspace(protoset_path):
+            return workspace_signature(protoset_path)
+        return os.stat(protoset_path).st_mtime_ns
+
+    def load_descriptor_set(self, protoset_path):
+        return self.get_index(protoset_path).fds
+
+    def get_call_names(self, protoset_path):
+        try:
+            return list(self.get_lookup_index(protoset_path).call_names)
+        except Exception:
+            return []
+
+    def get_method_request_fields(self, protoset_path, call_name):
+        try:
+            index = self.get_lookup_index(protoset_path)
+        except Exception:
+            return []
+        return index.get_method_request_fields(call_name)
+
+    def get_input_type_name(self, protoset_path, call_name):
+        try:
+            index = self.get_lookup_index(protoset_path)
+        except Exception:
+            return ""
+        return index.get_input_type_name(call_name)
+
+    def get_message_fields(self, protoset_path, type_name, load=True):
+        try:
+            index = self.get_lookup_index(protoset_path, load)
+        except Exception:
+            return []
+        return index.get_message_fields(type_name)
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict, namedtuple
+
+# Precompiled sidecar index of a protoset, so the method list and body form can be
+# filled in without parsing the whole FileDescriptorSet.
+#
+# Layout (little endian):
+#   header       magic, version, protoset sha256/size/mtime, then the offsets below
+#   blobs        call names in declaration order ("\n" separated), type names and
+#                per-message field lists as JSON
+#   method table (name offset, name length, input type offset, input type length),
+#                sorted by method name
+#   type table   (name offset, name length, fields offset, fields length), sorted
+#                by message name
+#
+# Offsets are from the start of the file. Both tables are searched by bisection
+# directly in the memory map.
+MAGIC = b"GPSIDX\x00\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sI32sqqQQIQIQ")
+_ENTRY = struct.Struct("<QIQI")
+
+# Stand-in for FieldDescriptorProto with the attributes the body form and fan-out read.
+IndexedField = namedtuple("IndexedField", ["name", "number", "type", "label", "type_name"])
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def write_sidecar(path, index, sha256, size, mtime_ns):
+    """Write the sidecar for a ProtosetIndex to path, replacing any existing file atomically."""
+    blobs = bytearray()
+
+    def add_blob(data):
+        offset = _HEADER.size + len(blobs)
+        blobs.extend(data)
+        return offset, len(data)
+
+    names_offset, names_length = add_blob("\n".join(index.call_names).encode("utf-8"))
+
+    methods = []
+    for call_name in index.call_names:
+        name = add_blob(call_name.encode("utf-8"))
+        input_type = add_blob(index.get_input_type_name(call_name).encode("utf-8"))
+        methods.append((call_name.encode("utf-8"), name + input_type))
+
+    types = []
+    for type_name in index.messages:
+        fields = [
+            [field.name, field.number, field.type, field.label, field.type_name, enum_values]
+            for field, enum_values in index.get_message_fields(type_name)
+        ]
+        name = add_blob(type_name.encode("utf-8"))
+        value = add_blob(json.dumps(fields, separators=(",", ":")).encode("utf-8"))
+        types.append((type_name.encode("utf-8"), name + value))
+
+    method_table = _HEADER.size + len(blobs)
+    type_table = method_table + _ENTRY.size * len(methods)
+    header = _HEADER.pack(MAGIC, VERSION, sha256, size, mtime_ns, names_offset, names_length,
+                          len(methods), method_table, len(types), type_table)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(blobs)
+        for _, entry in sorted(methods):
+            f.write(_ENTRY.pack(*entry))
+        for _, entry in sorted(types):
+            f.write(_ENTRY.pack(*entry))
+    os.replace(temp_path, path)
+
+
+class SidecarIndex:
+    """A memory-mapped sidecar. Lookups only touch the pages they need."""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.sha256, self.protoset_size, self.protoset_mtime_ns,
+             self._names_offset, self._names_length, self._method_count, self._method_table,
+             self._type_count, self._type_table) = _HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{path} is not a protoset index")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a protoset index of version {VERSION}")
+        self._fields_cache = {}
+
+    def close(self):
+        self._map.close()
+
+    def matches_stat(self, stat):
+        return stat.st_size == self.protoset_size and stat.st_mtime_ns == self.protoset_mtime_ns
+
+    def _find(self, table, count, name):
+        key = name.encode("utf-8")
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            name_offset, name_length, value_offset, value_length = _ENTRY.unpack_from(self._map, table + middle * _ENTRY.size)
+            current = self._map[name_offset:name_offset + name_length]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return self._map[value_offset:value_offset + value_length]
+        return None
+
+    @property
+    def call_names(self):
+        names = self._map[self._names_offset:self._names_offset + self._names_length].decode("utf-8")
+        return names.split("\n") if names else []
+
+    def get_input_type_name(self, call_name):
+        input_type = self._find(self._method_table, self._method_count, call_name)
+        return input_type.decode("utf-8").lstrip(".") if input_type is not None else ""
+
+    def get_message_fields(self, type_name):
+        """Return [(IndexedField, enum_values)] for the message type_name, like ProtosetIndex does."""
+        type_name = type_name.lstrip(".")
+        fields = self._fields_cache.get(type_name)
+        if fields is not None:
+            return fields
+        blob = self._find(self._type_table, self._type_count, type_name)
+        if blob is None:
+            return []
+        fields = [(IndexedField(*values[:5]), values[5]) for values in json.loads(blob)]
+        self._fields_cache[type_name] = fields
+        return fields
+
+    def get_method_request_fields(self, call_name):
+        return self.get_message_fields(self.get_input_type_name(call_name))
+
+
+class SidecarCache:
+    """
+    Opens the sidecar index of each protoset, building it on first use.
+
+    Sidecars live in cache_dir, named after the protoset's absolute path. A sidecar is
+    trusted while the protoset's size and mtime match the ones recorded in it; if they
+    differ, the protoset is hashed and the sidecar is rebuilt only if the hash changed
+    too. Builds hold a lock for their protoset only, so lookups of other protosets
+    aren't held up. Opened sidecars are kept mapped, least recently used first out;
+    dropped ones are unmapped once nothing is reading them any more.
+    """
+    def __init__(self, cache_dir="protoset_index_cache", max_open=8):
+        self.cache_dir = cache_dir
+        self.max_open = max_open
+        self._open = OrderedDict()  # protoset path -> SidecarIndex
+        self._path_locks = {}       # protoset path -> lock held while opening or building its sidecar
+        self._lock = threading.Lock()
+
+    def sidecar_path(self, protoset_path):
+        key = hashlib.sha256(os.path.abspath(protoset_path).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, key + ".idx")
+
+    def get(self, protoset_path, build_index):
+        """
+        Return the SidecarIndex for protoset_path. build_index(path) must return a
+        ProtosetIndex; it is only called when the sidecar is missing or out of date.
+        Raises OSError if the protoset cannot be read.
+        """
+        key = os.path.abspath(protoset_path)
+        stat = os.stat(key)
+        sidecar = self._get_open(key, stat)
+        if sidecar:
+            return sidecar
+        with self._lock:
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+        with path_lock:
+            # Another thread may have opened or built it while this one waited.
+            sidecar = self._get_open(key, stat)
+            if sidecar:
+                return sidecar
+            path = self.sidecar_path(key)
+            sidecar = self._load(path, key, stat)
+            if sidecar is None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                write_sidecar(path, build_index(key), file_sha256(key), stat.st_size, stat.st_mtime_ns)
+                sidecar = SidecarIndex(path)
+            with self._lock:
+                self._open[key] = sidecar
+                self._open.move_to_end(key)
+                # Evicted sidecars aren't closed here: another thread may still be reading
+                # one, and its memory map is closed when the last reference goes.
+                while len(self._open) > self.max_open:
+                    self._open.popitem(last=False)
+            return sidecar
+
+    def _get_open(self, key, stat):
+        with self._lock:
+            sidecar = self._open.get(key)
+            if sidecar and sidecar.matches_stat(stat):
+                self._open.move_to_end(key)
+                return sidecar
+        return None
+
+    def _load(self, path, protoset_path, stat):
+        """Open an existing sidecar if it still describes the protoset, otherwise return None."""
+        try:
+            sidecar = SidecarIndex(path)
+        except (OSError, ValueError):
+            return None
+        if sidecar.matches_stat(stat):
+            return sidecar
+        # Touched but maybe not changed, e.g. after a checkout: compare contents.
+        if sidecar.sha256 == file_sha256(protoset_path):
+            sidecar.close()
+            with open(path, "r+b") as f:
+                header = bytearray(f.read(_HEADER.size))
+                struct.pack_into("<qq", header, 8 + 4 + 32, stat.st_size, stat.st_mtime_ns)
+                f.seek(0)
+                f.write(header)
+            return SidecarIndex(path)
+        sidecar.close()
+        return None
+
+    def invalidate(self, protoset_path=None):
+        """Forget a single protoset's sidecar, or all of them if no path is given."""
+        with self._lock:
+            if protoset_path is None:
+                self._open.clear()
+            else:
+                self._open.pop(os.path.abspath(protoset_path), None)
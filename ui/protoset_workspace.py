@@ -0,0 +1,163 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+PROTOSET_EXTENSIONS = (".protoset", ".pb", ".desc")
+
+
+def is_workspace(path):
+    """True if path names several protosets: a directory, or paths separated by os.pathsep."""
+    return bool(path) and (os.pathsep in path or os.path.isdir(path))
+
+
+def list_protosets(path):
+    """The protoset files of a workspace path, in a stable order."""
+    paths = []
+    for part in path.split(os.pathsep):
+        part = part.strip()
+        if not part:
+            continue
+        if os.path.isdir(part):
+            paths.extend(
+                os.path.join(part, name) for name in sorted(os.listdir(part))
+                if name.endswith(PROTOSET_EXTENSIONS) and os.path.isfile(os.path.join(part, name))
+            )
+        else:
+            paths.append(part)
+    return list(dict.fromkeys(os.path.abspath(p) for p in paths))
+
+
+def protoset_exists(path):
+    if is_workspace(path):
+        return any(os.path.exists(p) for p in list_protosets(path))
+    return bool(path) and os.path.exists(path)
+
+
+def workspace_signature(path):
+    """(path, mtime_ns, size) of every protoset in the workspace, to tell when it needs reloading."""
+    signature = []
+    for protoset_path in list_protosets(path):
+        try:
+            stat = os.stat(protoset_path)
+        except OSError:
+            continue
+        signature.append((protoset_path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def read_protoset(path):
+    """
+    Parse one protoset and split it into its files. Runs in a worker process.
+    Returns (path, [(file name, sha256, serialized FileDescriptorProto, call names it defines)]).
+    """
+    from google.protobuf import descriptor_pb2  # deferred: importing protobuf is slow
+    fds = descriptor_pb2.FileDescriptorSet()
+    with open(path, "rb") as f:
+        fds.ParseFromString(f.read())
+    files = []
+    for file_desc in fds.file:
+        data = file_desc.SerializeToString(deterministic=True)
+        package = file_desc.package.strip() if file_desc.package else ""
+        call_names = [
+            f"{package}.{service.name}.{method.name}" if package else f"{service.name}.{method.name}"
+            for service in file_desc.service for method in service.method
+        ]
+        files.append((file_desc.name, hashlib.sha256(data).hexdigest(), data, call_names))
+    return path, files
+
+
+class ProtosetWorkspace:
+    """
+    Several protosets (e.g. one per team) loaded as one schema.
+
+    The protosets are parsed in parallel in worker processes, which hand back each of
+    their files serialized with its hash. Each protoset's files are deduplicated as it
+    arrives, so files shared between protosets, such as google/protobuf/*.proto, are
+    only kept once per (name, hash) and memory grows with the number of distinct files
+    rather than the number of protosets. The distinct files are merged into one
+    ProtosetIndex, and each method remembers the protoset that defines it so grpcurl
+    can be given that file.
+
+    If two protosets contain different files under the same name, the one earlier in
+    the list wins and the clash is listed in conflicts.
+    """
+    def __init__(self, path, max_workers=None):
+        self.path = path
+        self.protoset_paths = list_protosets(path)
+        self.signature = workspace_signature(path)
+        self.method_sources = {}  # call name -> protoset path
+        self.conflicts = []       # (file name, protoset path) whose copy was dropped
+        self.errors = []          # (protoset path, message) for protosets that couldn't be read
+        self.file_count = 0
+        self.index = self._load(max_workers)
+
+    @property
+    def call_names(self):
+        return self.index.call_names
+
+    def _read_protosets(self, max_workers):
+        """Yield (rank, path, files) for each protoset as soon as it has been read."""
+        if len(self.protoset_paths) < 2:
+            for rank, path in enumerate(self.protoset_paths):
+                try:
+                    yield (rank, *read_protoset(path))
+                except Exception as e:
+                    self.errors.append((path, str(e)))
+            return
+        # spawn rather than fork: the app has Tk and worker threads running.
+        context = multiprocessing.get_context("spawn")
+        workers = min(len(self.protoset_paths), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = {executor.submit(read_protoset, path): (rank, path) for rank, path in enumerate(self.protoset_paths)}
+            for future in as_completed(futures):
+                # Forget the future once read, so its result can be freed after deduplication.
+                rank, path = futures.pop(future)
+                try:
+                    yield (rank, *future.result())
+                except Exception as e:
+                    self.errors.append((path, str(e)))
+
+    def _load(self, max_workers):
+        from google.protobuf import descriptor_pb2
+        from protoset_index import ProtosetIndex
+
+        # Protosets finish in any order, so ties are settled by their position in the
+        # list: the earliest protoset defining a method or file wins, as if read in order.
+        kept = {}            # file name -> (rank, position, sha256, serialized file)
+        method_ranks = {}    # call name -> rank of the protoset it is routed to
+        dropped = []         # (rank, file name, protoset path)
+        for rank, protoset_path, files in self._read_protosets(max_workers):
+            self.file_count += len(files)
+            for position, (name, sha256, data, call_names) in enumerate(files):
+                for call_name in call_names:
+                    if rank < method_ranks.get(call_name, len(self.protoset_paths)):
+                        method_ranks[call_name] = rank
+                        self.method_sources[call_name] = protoset_path
+                current = kept.get(name)
+                if current is None or (rank < current[0] and sha256 != current[2]):
+                    if current is not None:
+                        dropped.append((current[0], name, self.protoset_paths[current[0]]))
+                    kept[name] = (rank, position, sha256, data)
+                elif sha256 != current[2]:
+                    dropped.append((rank, name, protoset_path))
+            del files  # only the distinct copies in kept stay in memory
+        self.conflicts = [(name, path) for _, name, path in sorted(dropped)]
+
+        merged = descriptor_pb2.FileDescriptorSet()
+        for name in sorted(kept, key=lambda name: kept[name][:2]):
+            merged.file.add().ParseFromString(kept.pop(name)[3])
+        return ProtosetIndex(merged)
+
+    def protoset_for(self, call_name):
+        """The protoset that defines call_name, or None if no protoset in the workspace does."""
+        return self.method_sources.get(call_name)
+
+    def describe(self):
+        text = (f"{len(self.protoset_paths)} protosets, {len(self.index.fds.file)} distinct files "
+                f"of {self.file_count}, {len(self.method_sources)} methods")
+        if self.conflicts:
+            text += f", {len(self.conflicts)} conflicting file copies ignored"
+        if self.errors:
+            text += f", {len(self.errors)} unreadable protosets"
+        return text
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+
+# Services every reflection server lists that aren't part of the API.
+_REFLECTION_SERVICES = ("grpc.reflection.v1alpha.ServerReflection", "grpc.reflection.v1.ServerReflection")
+
+
+def run_command(command):
+    """Run a command and return (return code, stdout, stderr)."""
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    return process.returncode, process.stdout, process.stderr
+
+
+class ReflectionError(Exception):
+    pass
+
+
+class ReflectionCache:
+    """
+    Fetches a server's descriptors once with grpcurl's server reflection (`list`, then
+    `describe` with -protoset-out) and keeps them as a protoset file in cache_dir, so
+    the method list, body form and calls work without a local protoset.
+
+    A server's protoset is reused until it is older than ttl seconds or a refresh is
+    asked for. The command runner is pluggable: runner(command) returns (return code,
+    stdout, stderr), so a stand-in server or recorded output can be used in tests.
+    """
+    def __init__(self, cache_dir="reflection_cache", ttl=3600, runner=run_command):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.runner = runner
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _paths(self, server, plaintext):
+        key = hashlib.sha256(f"{server}|{bool(plaintext)}".encode("utf-8")).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, key)
+        return base + ".protoset", base + ".json"
+
+    def _lock_for(self, paths):
+        with self._locks_lock:
+            return self._locks.setdefault(paths[0], threading.Lock())
+
+    def get_cached(self, server, plaintext):
+        """Return the cached protoset path for server if it is still fresh, otherwise None."""
+        protoset_path, meta_path = self._paths(server, plaintext)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not os.path.exists(protoset_path) or time.time() - meta.get("fetched_at", 0) > self.ttl:
+            return None
+        return protoset_path
+
+    def get_protoset(self, server, plaintext, headers=(), refresh=False):
+        """
+        Return the path of a protoset describing every service on server, fetching it
+        with reflection if it isn't cached, has expired, or refresh is set. headers are
+        grpcurl -H values, e.g. for servers that require auth for reflection.
+        Raises ReflectionError if the server can't be reflected.
+        """
+        if not server:
+            raise ReflectionError("A server address is needed to use reflection.")
+        paths = self._paths(server, plaintext)
+        with self._lock_for(paths):
+            if not refresh:
+                cached = self.get_cached(server, plaintext)
+                if cached:
+                    return cached
+            return self._fetch(server, plaintext, headers, *paths)
+
+    def _base_command(self, plaintext, headers):
+        command = ["grpcurl"]
+        if plaintext:
+            command.append("-plaintext")
+        for header in headers:
+            command.extend(["-H", header])
+        return command
+
+    def _fetch(self, server, plaintext, headers, protoset_path, meta_path):
+        return_code, stdout, stderr = self.runner(self._base_command(plaintext, headers) + [server, "list"])
+        if return_code != 0:
+            raise ReflectionError(f"Listing services on {server} failed:\n{stderr.strip()}")
+        services = [line.strip() for line in stdout.splitlines()
+                    if line.strip() and line.strip() not in _REFLECTION_SERVICES]
+        if not services:
+            raise ReflectionError(f"{server} doesn't list any services.")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = protoset_path + ".tmp"
+        command = self._base_command(plaintext, headers) + ["-protoset-out", temp_path, server, "describe"] + services
+        return_code, _, stderr = self.runner(command)
+        if return_code != 0 or not os.path.exists(temp_path):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise ReflectionError(f"Fetching descriptors from {server} failed:\n{stderr.strip()}")
+        os.replace(temp_path, protoset_path)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({"server": server, "plaintext": bool(plaintext), "fetched_at": time.time(), "services": services}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+        return protoset_path
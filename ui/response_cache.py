@@ -0,0 +1,74 @@
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL_RULES = {"Get*": 30, "List*": 30}
+
+
+class ResponseCache:
+    """
+    Opt-in cache of successful responses for idempotent (read-only) methods.
+
+    Entries are keyed on the fully substituted call: server, method, body, transport
+    and auth, plus the protoset (its path and version, e.g. mtime) and the engine that
+    made the call, so switching either never returns a response from the other. Only methods that match a TTL rule are cached. A rule's pattern is
+    matched against the full method name if it contains a dot (e.g.
+    "climate.ClimatePublic.*"), otherwise against the bare method name (e.g. "Get*").
+    The first matching rule wins. The least recently used entries are evicted beyond
+    max_entries.
+    """
+    def __init__(self, ttl_rules=None, max_entries=256):
+        self.ttl_rules = dict(DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored at, expires at, result)
+        self._lock = threading.Lock()
+
+    def ttl_for(self, method):
+        """Seconds to keep responses of method for, or None if it shouldn't be cached."""
+        method_name = method.rsplit(".", 1)[-1]
+        for pattern, ttl in self.ttl_rules.items():
+            if fnmatch.fnmatchcase(method if "." in pattern else method_name, pattern):
+                return ttl
+        return None
+
+    @staticmethod
+    def make_key(plaintext, cookie, bearer_token, protoset, server, method, body, protoset_version=None, engine="grpcurl"):
+        """The key for a call, taking the same arguments as execute_call, then the protoset's version and the engine name."""
+        return (server, method, body or "", bool(plaintext), cookie or "", bearer_token or "",
+                protoset or "", protoset_version, engine)
+
+    def get(self, key):
+        """Return (result, age in seconds) for a live entry, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, expires_at, result = entry
+            if now >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result, now - stored_at
+
+    def put(self, key, result):
+        """Store result if the key's method is cacheable. Returns True if it was stored."""
+        ttl = self.ttl_for(key[1])
+        if not ttl:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, now + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,111 @@
+import bisect
+import json
+import re
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text):
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+def _body_values(body):
+    """Yield every scalar value in a saved call's JSON body."""
+    try:
+        pending = [json.loads(body)] if body else []
+    except (json.JSONDecodeError, TypeError):
+        pending = [body]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+        elif value is not None:
+            yield value
+
+
+class SavedCallIndex:
+    """
+    In-memory inverted index over saved calls, searchable by method, server, protoset
+    and body field values.
+
+    Every query word must prefix-match some word of a call for the call to match, so
+    "clim get" finds climate.ClimatePublic.GetClimateDevices. Calls are identified by
+    their index in the saved calls list, and add() and update() only touch that call's
+    postings, so keeping the index current costs O(words in the call).
+    """
+    def __init__(self):
+        self._postings = {}      # token -> set of call indices
+        self._call_tokens = {}   # call index -> set of tokens
+        self._sorted_tokens = []
+
+    def rebuild(self, saved_calls):
+        self._postings = {}
+        self._call_tokens = {}
+        for index, call_info in enumerate(saved_calls):
+            self._add_tokens(index, self._tokens_for(call_info))
+        self._sorted_tokens = sorted(self._postings)
+
+    def add(self, index, call_info):
+        tokens = self._tokens_for(call_info)
+        for token in tokens:
+            if token not in self._postings:
+                bisect.insort(self._sorted_tokens, token)
+        self._add_tokens(index, tokens)
+
+    def update(self, index, call_info):
+        for token in self._call_tokens.pop(index, set()):
+            postings = self._postings[token]
+            postings.discard(index)
+            if not postings:
+                del self._postings[token]
+                del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+        self.add(index, call_info)
+
+    def search(self, query):
+        """Return the sorted indices of the calls matching every word of query, or all calls if it's empty."""
+        words = _tokenize(query)
+        if not words:
+            return sorted(self._call_tokens)
+        # Match the rarest-looking (longest) word first to keep intersections small.
+        matches = None
+        for word in sorted(set(words), key=len, reverse=True):
+            low = bisect.bisect_left(self._sorted_tokens, word)
+            high = bisect.bisect_left(self._sorted_tokens, word + "\uffff", low)
+            if matches is not None and high - low > len(matches):
+                # Cheaper to check the few remaining candidates than to union a wide prefix.
+                matches = {index for index in matches
+                           if any(token.startswith(word) for token in self._call_tokens[index])}
+            else:
+                word_matches = set()
+                for token in self._sorted_tokens[low:high]:
+                    word_matches |= self._postings[token]
+                matches = word_matches if matches is None else matches & word_matches
+            if not matches:
+                return []
+        return sorted(matches)
+
+    def matches(self, index, query):
+        """Whether the call at index matches query, checked against that call's words only."""
+        tokens = self._call_tokens.get(index)
+        if tokens is None:
+            return False
+        return all(any(token.startswith(word) for token in tokens) for word in set(_tokenize(query)))
+
+    def _add_tokens(self, index, tokens):
+        self._call_tokens[index] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(index)
+
+    @staticmethod
+    def _tokens_for(call_info):
+        tokens = set()
+        for key in ("method", "server", "protoset"):
+            tokens.update(_tokenize(call_info.get(key, "")))
+        for value in _body_values(call_info.get("body", "")):
+            tokens.update(_tokenize(value))
+        # Split camelCase method names so "climate devices" finds GetClimateDevices.
+        method = call_info.get("method", "")
+        tokens.update(_tokenize(re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", method)))
+        return tokens
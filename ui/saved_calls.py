@@ -0,0 +1,278 @@
+import contextlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+
+# The fields of a saved call besides its body, in the order the grpcurl page shows them.
+CALL_DETAIL_KEYS = ("port_forward", "cookie", "bearer_token", "protoset", "server", "method")
+
+logger = logging.getLogger(__name__)
+
+
+def try_lock_file(path, wait=False):
+    """
+    Open path and take an exclusive lock on it. Returns the open file, which holds the
+    lock until it is closed or the process exits, or None if another process holds the
+    lock. With wait=True it waits for the lock instead.
+    """
+    f = open(path, "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if wait else msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+class SavedGrpcManager:
+    """
+    Manages persistence of grpcurl call details.
+
+    The in-memory saved_calls list is authoritative; callers don't need to reload after
+    a change. In journal mode every append or edit is written as a single JSON line to
+    a journal next to the history file instead of rewriting the whole file. Once the
+    journal grows past compact_after records it is folded back into the history file
+    on a background thread. The history file is always replaced atomically, so a crash
+    can't leave it half written.
+
+    Journal records name the call they change by its "id" rather than its position, so
+    calls appended by two app instances at once are both kept. Calls saved before ids
+    existed are given one from their position in the history file. Appending to the
+    journal, moving it aside and finishing a compaction all happen under a second lock
+    file, which readers hold too, so a reader never sees records half way between files.
+
+    Only the process holding the lock file next to the history file (normally the
+    first app started) folds journals into it. Other readers, such as the batch
+    runner, use read_saved_calls(), which never writes or deletes anything.
+    """
+    def __init__(self, history_file: str, journal=False, compact_after=500):
+        self.history_file = history_file
+        self.journal = journal
+        self.journal_file = history_file + ".journal"
+        self.rotating_file = self.journal_file + ".rotating"
+        self.compacting_file = history_file + ".journal.compacting"
+        self.lock_file = history_file + ".lock"
+        self.journal_lock_file = self.journal_file + ".lock"
+        self.compact_after = compact_after
+        self.saved_calls = []
+        self._journal_records = 0
+        self._compacting = False
+        self._lock = threading.Lock()
+        self._owner_lock = None  # the open lock file once ownership was checked, False if not the owner
+
+    @contextlib.contextmanager
+    def _journal_lock(self):
+        """Hold the journal lock file, or nothing if it can't be opened, e.g. in a read-only directory."""
+        try:
+            lock = try_lock_file(self.journal_lock_file, wait=True)
+        except OSError:
+            lock = None
+        try:
+            yield
+        finally:
+            if lock:
+                lock.close()
+
+    def read_saved_calls(self) -> list:
+        """Read the history file and replay any journals over it, without changing any file."""
+        with self._journal_lock():
+            saved_calls = self._read_history()
+            positions = self._positions(saved_calls)
+            # Replay whatever was journaled but not yet compacted, including a compaction
+            # or rotation interrupted part way. Replaying a record the history file already
+            # contains just writes the same call again.
+            for path in (self.compacting_file, self.rotating_file, self.journal_file):
+                self._replay(path, saved_calls, positions)
+        self.saved_calls = saved_calls
+        return self.saved_calls
+
+    def load_saved_calls(self) -> list:
+        """Read the saved calls and, if this process owns the journal, fold it into the history file."""
+        if not self.owns_journal():
+            return self.read_saved_calls()
+        with self._lock:
+            pending = any(os.path.exists(path) for path in (self.journal_file, self.rotating_file, self.compacting_file))
+            if pending and not self._compacting:
+                self._rotate_journal()
+                self._compacting = True
+            else:
+                pending = False
+            self.read_saved_calls()
+        if pending:
+            self._compact()
+        return self.saved_calls
+
+    def owns_journal(self):
+        """True if this process holds the lock file, and so may compact the journal."""
+        if self._owner_lock is None:
+            try:
+                self._owner_lock = try_lock_file(self.lock_file) or False
+            except OSError:
+                self._owner_lock = False
+        return bool(self._owner_lock)
+
+    def _rotate_journal(self):
+        # Called with self._lock held. The journal is moved aside under the journal lock,
+        # so no other process is part way through appending to it, and then added to the
+        # compacting file. A compacting file left by a failed compaction still holds
+        # records the history file lacks, so it is appended to rather than replaced, and
+        # a rotating file left by a crash is folded in before the journal is moved.
+        while True:
+            with self._journal_lock():
+                if not os.path.exists(self.rotating_file):
+                    if not os.path.exists(self.journal_file):
+                        return
+                    os.replace(self.journal_file, self.rotating_file)
+                if not os.path.exists(self.compacting_file):
+                    os.replace(self.rotating_file, self.compacting_file)
+                    continue
+                with open(self.rotating_file, "r") as src, open(self.compacting_file, "a") as dst:
+                    shutil.copyfileobj(src, dst)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.rotating_file)
+
+    def _read_history(self, strict=False):
+        # strict raises instead of treating an unreadable file as empty, for compaction,
+        # which must never write an unreadable history over with just the journal.
+        if not os.path.exists(self.history_file):
+            return []
+        try:
+            with open(self.history_file, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            if strict:
+                raise
+            return []
+        if not isinstance(data, list):
+            if strict:
+                raise ValueError(f"{self.history_file} doesn't hold a list of calls")
+            return []
+        for position, call_info in enumerate(data):
+            if isinstance(call_info, dict):
+                call_info.setdefault("id", self._position_id(position))
+        return data
+
+    @staticmethod
+    def _position_id(position):
+        # The same in every process, since the history file only ever grows at the end.
+        return f"h{position}"
+
+    @staticmethod
+    def _positions(saved_calls):
+        return {call_info.get("id"): position for position, call_info in enumerate(saved_calls) if isinstance(call_info, dict)}
+
+    def _replay(self, path, saved_calls, positions):
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    call_info = record["call"]
+                    if "id" in record:
+                        call_id = record["id"]
+                    else:
+                        # Written before records had ids: {"index": position, "call": ...}.
+                        index = record["index"]
+                        call_id = saved_calls[index].get("id") if 0 <= index < len(saved_calls) else self._position_id(index)
+                    call_info["id"] = call_id
+                except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                    continue  # e.g. the last line of a write cut short by a crash
+                position = positions.get(call_id)
+                if position is None:
+                    # An update whose append hasn't been seen is kept as a new call rather than lost.
+                    positions[call_id] = len(saved_calls)
+                    saved_calls.append(call_info)
+                else:
+                    saved_calls[position] = call_info
+
+    def save_call(self):
+        self._write_history(self.saved_calls)
+
+    def _write_history(self, saved_calls):
+        if not self.journal:
+            # Without a journal the file keeps its original format: ids are only needed
+            # to match journal records.
+            saved_calls = [
+                {key: value for key, value in call_info.items() if key != "id"} if isinstance(call_info, dict) else call_info
+                for call_info in saved_calls
+            ]
+        temp_file = self.history_file + ".tmp"
+        try:
+            with open(temp_file, "w") as f:
+                json.dump(saved_calls, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.history_file)
+        except IOError as e:
+            raise Exception(f"Error saving history: {e}")
+
+    def _write_record(self, op, call_info):
+        with self._lock:
+            try:
+                with self._journal_lock(), open(self.journal_file, "a") as f:
+                    f.write(json.dumps({"op": op, "id": call_info["id"], "call": call_info}) + "\n")
+            except IOError as e:
+                raise Exception(f"Error saving history: {e}")
+            self._journal_records += 1
+            if self._journal_records < self.compact_after or self._compacting or not self.owns_journal():
+                return
+            try:
+                self._rotate_journal()
+            except OSError:
+                logger.exception("Moving %s aside for compaction failed; retrying on the next record", self.journal_file)
+                return
+            self._journal_records = 0
+            self._compacting = True
+        threading.Thread(target=self._compact, daemon=True).start()
+
+    def _compact(self):
+        # Folds exactly what is on disk, the history file plus the rotated journal, so
+        # records written by another process are kept too. The new history file replaces
+        # the old one and the compacting file goes in one step under the journal lock, so
+        # readers see the records in one place or the other, never in neither.
+        try:
+            saved_calls = self._read_history(strict=True)
+            self._replay(self.compacting_file, saved_calls, self._positions(saved_calls))
+            with self._journal_lock():
+                self._write_history(saved_calls)
+                os.remove(self.compacting_file)
+        except Exception:
+            logger.exception("Compacting %s failed; its records are replayed from %s until the next compaction",
+                             self.history_file, self.compacting_file)
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def append_call(self, call_info):
+        call_info = dict(call_info, id=uuid.uuid4().hex)
+        self.saved_calls.append(call_info)
+        if self.journal:
+            self._write_record("append", call_info)
+        else:
+            self.save_call()
+
+    def update_call(self, index, call_info):
+        if index < 0 or index >= len(self.saved_calls):
+            raise IndexError("Invalid call index")
+        call_id = self.saved_calls[index].get("id") or self._position_id(index)
+        call_info = dict(call_info, id=call_id)
+        self.saved_calls[index] = call_info
+        if self.journal:
+            self._write_record("update", call_info)
+        else:
+            self.save_call()
+
+    def get_display_text(self, call_info: dict):
+        server = call_info.get('server', '')
+        return (f"{call_info.get('method', '')}  ({server})" if server else f"{call_info.get('method', '')}")
@@ -0,0 +1,115 @@
+import queue
+import time
+import tkinter as tk
+from collections import deque
+
+
+class StreamingOutput:
+    """
+    Appends streamed response messages to a Text widget without blocking the Tk loop.
+
+    Messages may be pushed from any thread. They are queued and written to the widget in
+    batches during idle-time flushes. Only the newest max_messages stay in the widget,
+    so memory stays flat however long the stream runs. The live message rate is shown
+    in status_label.
+    """
+    def __init__(self, text_widget: tk.Text, status_label, max_messages=1000, flush_interval_ms=100):
+        self.text_widget = text_widget
+        self.status_label = status_label
+        self.max_messages = max_messages
+        self.flush_interval_ms = flush_interval_ms
+        self._pending = queue.Queue()
+        self._line_counts = deque()  # lines used in the widget by each displayed message
+        self._stream_id = 0
+        self._active = False
+        self._flush_scheduled = False
+        self._header_lines = 0
+        self._total = 0
+        self._started_at = 0.0
+        self._rate_window = (0.0, 0)  # (time, total) at the last rate sample
+        self._rate = 0.0
+
+    def start(self, header):
+        """Clear the widget and begin a new stream. Returns the id to pass to push()."""
+        self._stream_id += 1
+        self._pending = queue.Queue()
+        self._line_counts.clear()
+        self._total = 0
+        self._started_at = time.monotonic()
+        self._rate_window = (self._started_at, 0)
+        self._rate = 0.0
+        self.text_widget.delete("1.0", tk.END)
+        self.text_widget.insert(tk.END, header)
+        self._header_lines = int(self.text_widget.index("end-1c").split(".")[0]) - 1
+        self._active = True
+        if not self._flush_scheduled:
+            self._schedule_flush()
+        return self._stream_id
+
+    def push(self, stream_id, message):
+        """Queue a message from any thread. Messages for a superseded stream are dropped."""
+        if stream_id == self._stream_id:
+            self._pending.put(message)
+
+    def finish(self, stream_id, footer=""):
+        """Flush what is left of the stream and append the footer."""
+        if stream_id != self._stream_id or not self._active:
+            return
+        self._flush(final=True)
+        self._active = False
+        if footer:
+            self.text_widget.insert(tk.END, footer)
+        elapsed = max(time.monotonic() - self._started_at, 1e-6)
+        self.status_label.config(text=f"{self._total} messages in {elapsed:.1f}s ({self._total / elapsed:.0f} msg/s)")
+
+    def stop(self):
+        """Abandon the current stream, e.g. because the widget is being reused for other output."""
+        self._stream_id += 1
+        self._active = False
+
+    def _schedule_flush(self):
+        self._flush_scheduled = True
+        self.text_widget.after(self.flush_interval_ms, self.text_widget.after_idle, self._flush)
+
+    def _flush(self, final=False):
+        if not final:
+            self._flush_scheduled = False
+        if not self._active:
+            return
+        # Drain everything that arrived since the last flush but only render what fits in
+        # the ring buffer, so a producer faster than Tk can't grow the queue without bound.
+        batch = deque(maxlen=self.max_messages)
+        received = 0
+        while True:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+            received += 1
+        if received:
+            self._total += received
+            self._append(batch)
+        self._update_rate()
+        if not final:
+            self._schedule_flush()
+
+    def _append(self, batch):
+        self.text_widget.insert(tk.END, "".join(batch))
+        for message in batch:
+            self._line_counts.append(message.count("\n"))
+        # Trim the oldest messages, keeping the header at the top of the widget.
+        dropped_lines = 0
+        while len(self._line_counts) > self.max_messages:
+            dropped_lines += self._line_counts.popleft()
+        if dropped_lines:
+            first = self._header_lines + 1
+            self.text_widget.delete(f"{first}.0", f"{first + dropped_lines}.0")
+        self.text_widget.see(tk.END)
+
+    def _update_rate(self):
+        now = time.monotonic()
+        last_time, last_total = self._rate_window
+        if now - last_time >= 1.0:
+            self._rate = (self._total - last_total) / (now - last_time)
+            self._rate_window = (now, self._total)
+        self.status_label.config(text=f"{self._total} messages ({self._rate:.0f} msg/s)")
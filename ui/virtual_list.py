@@ -0,0 +1,143 @@
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualListbox(ttk.Frame):
+    """
+    A Listbox that only ever holds the rows currently on screen.
+
+    Rows are identified by ids (e.g. indices into the saved calls list) and their text
+    is fetched with get_text(row_id) only when a row scrolls into view, so setting or
+    filtering tens of thousands of rows costs as much as drawing one screenful.
+    """
+    def __init__(self, parent, height=6, get_text=str):
+        super().__init__(parent)
+        self.height = height
+        self.get_text = get_text
+        self.rows = []
+        self.offset = 0
+        self.selected_row = None
+        self._on_select = None
+
+        self.listbox = tk.Listbox(self, height=height, exportselection=False, activestyle=tk.NONE)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox.bind("<<ListboxSelect>>", lambda e: self._on_listbox_select())
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(1))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+
+    def set_on_select(self, handler):
+        self._on_select = handler
+
+    def set_rows(self, rows):
+        """Replace the rows to show, keeping the selection if it is still among them."""
+        self.rows = list(rows)
+        if self.selected_row is not None and self.selected_row not in set(self.rows):
+            self.selected_row = None
+        self.offset = max(0, min(self.offset, len(self.rows) - self.height))
+        self._render()
+
+    def insert_row(self, row_id):
+        """Add one row in id order, redrawing only if it lands on screen."""
+        position = bisect.bisect_left(self.rows, row_id)
+        self.rows.insert(position, row_id)
+        if position < self.offset + self.height:
+            self._render()
+        else:
+            self.scrollbar.set(self.offset / len(self.rows), min(self.offset + self.height, len(self.rows)) / len(self.rows))
+
+    def remove_row(self, row_id):
+        """Drop one row, redrawing only if the rows on screen change."""
+        position = bisect.bisect_left(self.rows, row_id)
+        if position == len(self.rows) or self.rows[position] != row_id:
+            return
+        del self.rows[position]
+        if row_id == self.selected_row:
+            self.selected_row = None
+        if position < self.offset + self.height or self.offset > max(0, len(self.rows) - self.height):
+            self.offset = max(0, min(self.offset, len(self.rows) - self.height))
+            self._render()
+        elif self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), min(self.offset + self.height, len(self.rows)) / len(self.rows))
+
+    def has_row(self, row_id):
+        position = bisect.bisect_left(self.rows, row_id)
+        return position < len(self.rows) and self.rows[position] == row_id
+
+    def refresh_row(self, row_id):
+        """Redraw a single row if it is on screen, e.g. after its text changed."""
+        visible = self.rows[self.offset:self.offset + self.height]
+        if row_id in visible:
+            position = visible.index(row_id)
+            self.listbox.delete(position)
+            self.listbox.insert(position, self.get_text(row_id))
+            if row_id == self.selected_row:
+                self.listbox.selection_set(position)
+
+    def get_selected(self):
+        return self.selected_row
+
+    def select(self, row_id):
+        self.selected_row = row_id
+        if row_id in self.rows:
+            self.see(self.rows.index(row_id))
+        self._render()
+
+    def see(self, position):
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.height:
+            self.offset = position - self.height + 1
+        self._render()
+
+    def scroll(self, rows):
+        self.offset = max(0, min(self.offset + rows, len(self.rows) - self.height))
+        self._render()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = max(0, min(int(float(amount) * len(self.rows)), len(self.rows) - self.height))
+            self._render()
+        elif action == "scroll":
+            self.scroll(int(amount) * (self.height if unit == "pages" else 1))
+
+    def _render(self):
+        visible = self.rows[self.offset:self.offset + self.height]
+        self.listbox.delete(0, tk.END)
+        for row_id in visible:
+            self.listbox.insert(tk.END, self.get_text(row_id))
+        if self.selected_row in visible:
+            self.listbox.selection_set(visible.index(self.selected_row))
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), (self.offset + len(visible)) / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_listbox_select(self):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        self.selected_row = self.rows[self.offset + selection[0]]
+        if self._on_select:
+            self._on_select(self.selected_row)
+
+    def _move_selection(self, step):
+        if not self.rows:
+            return "break"
+        if self.selected_row in self.rows:
+            position = self.rows.index(self.selected_row) + step
+        else:
+            position = self.offset
+        position = max(0, min(position, len(self.rows) - 1))
+        self.selected_row = self.rows[position]
+        self.see(position)
+        if self._on_select:
+            self._on_select(self.selected_row)
+        return "break"